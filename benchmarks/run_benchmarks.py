@@ -0,0 +1,287 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), "src")
+sys.path.insert(0, SRC_DIR)
+
+from stub_server import StubServer
+from synthetic_trees import SCENARIOS, generate
+
+console = Console()
+app = typer.Typer()
+
+# Inputs passed to `sumsnap summary` for each scenario, relative to the generated tree.
+# PDFs are only summarized when given directly, so that scenario summarizes one text PDF and one scanned PDF.
+SUMMARY_TARGETS = {
+    "pdfs": [os.path.join("docs", "report_0.pdf"), os.path.join("docs", "scan_0.pdf")],
+}
+SUMMARY_ARGS = {
+    "images": ["--include-images"],
+    "pdfs": ["--include-images"],
+}
+# Passed as --exclude, which also covers relative-path excludes of folders and files on the command line
+SUMMARY_EXCLUDE = {
+    "deep-gitignore": [os.path.join("src", "d1_0"), os.path.join("src", "d1_1", "level_2.py")],
+}
+
+def use_isolated_config(config_dir: str):
+    """Point sumsnap's config (and with it the response cache) at a scratch directory before anything reads it."""
+    from pathlib import Path
+    import config
+
+    config.CONFIG_DIR_PATH = Path(config_dir)
+    config.CONFIG_FILE_PATH = config.CONFIG_DIR_PATH / "config.ini"
+    config.init_config()
+
+def tree_size(paths: List[str]) -> int:
+    total = 0
+    for file_path in paths:
+        try:
+            total += os.path.getsize(file_path)
+        except OSError:
+            pass
+    return total
+
+def make_result(scenario: str, benchmark: str, files: int, size: int, wall: float, **extra: Any) -> Dict[str, Any]:
+    result = {
+        "scenario": scenario,
+        "benchmark": benchmark,
+        "files": files,
+        "bytes": size,
+        "wall_seconds": round(wall, 4),
+        "files_per_second": round(files / wall, 2) if wall > 0 else 0.0,
+        "mb_per_second": round(size / 1024 / 1024 / wall, 3) if wall > 0 else 0.0,
+    }
+    result.update(extra)
+    return result
+
+def bench_scan(scenario: str, tree: str) -> tuple[Dict[str, Any], List[str]]:
+    """Time the project walk, gitignore matching and file classification."""
+    from summary_command import scan_project_files
+
+    start = time.perf_counter()
+    text_file_paths, image_file_paths = scan_project_files(tree, [])
+    wall = time.perf_counter() - start
+    file_paths = text_file_paths + image_file_paths
+    return make_result(scenario, "scan", len(file_paths), tree_size(file_paths), wall), text_file_paths
+
+def bench_chunk(scenario: str, tree: str, text_file_paths: List[str], model: str) -> Optional[Dict[str, Any]]:
+    """Time chunking of all scanned text files, read into one '# FILE:' document as the summary command does."""
+    from chunking import chunk_text, get_chunk_token_budget
+    from summary_command import read_text_file
+
+    if not text_file_paths:
+        return None
+    sections = []
+    for file_path in text_file_paths:
+        try:
+            content = read_text_file(file_path)
+        except Exception:
+            continue
+        sections.append(f"# FILE: {os.path.relpath(file_path, tree)}\n\n{content}\n\n")
+    text = "".join(sections)
+    start = time.perf_counter()
+    chunks = chunk_text(text, get_chunk_token_budget(model))
+    wall = time.perf_counter() - start
+    return make_result(scenario, "chunk", len(sections), len(text.encode("utf-8")), wall, chunks=len(chunks))
+
+def bench_summary(scenario: str, tree: str, stub: StubServer, concurrency: int, extra_args: List[str]) -> Dict[str, Any]:
+    """Run the full summary command against the stub server, with the response cache disabled."""
+    import metrics
+    import summary_command
+    from main import app as sumsnap_app
+
+    targets = [os.path.join(tree, target) for target in SUMMARY_TARGETS.get(scenario, ["."])]
+    command = typer.main.get_command(sumsnap_app)
+    summary_command.set_run_console(Console(file=io.StringIO(), width=120))
+
+    stub.stats.reset()
+    totals = {"requests": 0, "cache_hits": 0, "prompt_tokens": 0, "completion_tokens": 0, "retries": 0}
+    files = 0
+    size = 0
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        for target in targets:
+            if os.path.isdir(target):
+                text_file_paths, image_file_paths = summary_command.scan_project_files(target, SUMMARY_EXCLUDE.get(scenario, []))
+                file_paths = text_file_paths + (image_file_paths if "--include-images" in SUMMARY_ARGS.get(scenario, []) else [])
+            else:
+                file_paths = [target]
+            files += len(file_paths)
+            size += tree_size(file_paths)
+            args = ["summary", target, "--no-cache", "--concurrency", str(concurrency)] + SUMMARY_ARGS.get(scenario, []) + extra_args
+            if scenario in SUMMARY_EXCLUDE:
+                args += ["--exclude", ",".join(SUMMARY_EXCLUDE[scenario])]
+            try:
+                exit_code = command.main(args=args, standalone_mode=False)
+            except Exception as e:
+                status = f"error: {type(e).__name__}: {e}"
+                break
+            if exit_code:
+                status = f"exit code {exit_code}"
+            report = metrics.get_report()
+            for key in totals:
+                totals[key] += report[key]
+    finally:
+        summary_command.set_run_console(None)
+    wall = time.perf_counter() - start
+
+    stub_stats = stub.stats.snapshot()
+    return make_result(
+        scenario, "summary", files, size, wall,
+        status=status,
+        requests=totals["requests"],
+        retries=totals["retries"],
+        prompt_tokens=totals["prompt_tokens"],
+        completion_tokens=totals["completion_tokens"],
+        server_requests=stub_stats["requests"],
+        server_failures=stub_stats["failures"],
+        server_rate_limited=stub_stats["rate_limited"],
+        server_payload_bytes=stub_stats["payload_bytes"],
+    )
+
+def print_results(results: List[Dict[str, Any]]):
+    table = Table(title="sumsnap benchmarks", title_justify="left")
+    for column in ("Scenario", "Benchmark", "Files", "MB", "Wall (s)", "Files/s", "MB/s", "Requests", "Tokens", "Failures", "Status"):
+        table.add_column(column, justify="left" if column in ("Scenario", "Benchmark", "Status") else "right")
+    for result in results:
+        is_summary = result["benchmark"] == "summary"
+        table.add_row(
+            result["scenario"],
+            result["benchmark"],
+            str(result["files"]),
+            f"{result['bytes'] / 1024 / 1024:.2f}",
+            f"{result['wall_seconds']:.3f}",
+            f"{result['files_per_second']:.1f}",
+            f"{result['mb_per_second']:.2f}",
+            str(result["requests"]) if is_summary else "-",
+            str(result["prompt_tokens"] + result["completion_tokens"]) if is_summary else "-",
+            str(result["server_failures"]) if is_summary else "-",
+            "ok" if result.get("status", "ok") == "ok" else "[red]failed[/red]",
+        )
+    console.print(table)
+    for result in results:
+        if result.get("status", "ok") != "ok":
+            console.print(f"[yellow]{result['scenario']}/{result['benchmark']}: {result['status']}[/yellow]")
+
+def find_regressions(results: List[Dict[str, Any]], baseline_path: str, max_slowdown: float, min_seconds: float) -> List[str]:
+    """Compare wall times against a previous --json report. Timings below min_seconds are too noisy to compare."""
+    try:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Failed to read baseline {baseline_path}: {e}")
+    previous = {(r["scenario"], r["benchmark"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get((result["scenario"], result["benchmark"]))
+        if not old or max(old["wall_seconds"], result["wall_seconds"]) < min_seconds:
+            continue
+        if result["wall_seconds"] > old["wall_seconds"] * max_slowdown:
+            regressions.append(
+                f"{result['scenario']}/{result['benchmark']}: {old['wall_seconds']:.3f}s -> {result['wall_seconds']:.3f}s"
+            )
+        elif result["benchmark"] == "summary" and result["requests"] > old["requests"]:
+            regressions.append(f"{result['scenario']}/summary: {old['requests']} -> {result['requests']} requests")
+    return regressions
+
+@app.command()
+def run(
+    scenarios: Optional[List[str]] = typer.Option(
+        None, "--scenario", "-s", help=f"Scenario to run (repeatable). Available: {', '.join(SCENARIOS)}. Default: all."
+    ),
+    scale: float = typer.Option(1.0, "--scale", help="Multiply the size of every synthetic tree by this factor."),
+    latency: float = typer.Option(0.05, "--latency", help="Seconds the stub server waits before each response."),
+    jitter: float = typer.Option(0.0, "--jitter", help="Extra random latency of up to this many seconds per response."),
+    failure_rate: float = typer.Option(0.0, "--failure-rate", help="Share of stub responses that fail (0-1)."),
+    failure_status: int = typer.Option(500, "--failure-status", help="HTTP status of injected failures, e.g. 429 or 500."),
+    rate_limit_rpm: float = typer.Option(0.0, "--rate-limit-rpm", help="Make the stub answer requests beyond this many per minute with 429."),
+    concurrency: int = typer.Option(4, "--concurrency", min=1, help="Concurrency passed to the summary command."),
+    requests_per_minute: int = typer.Option(0, "--requests-per-minute", min=0, help="Request budget passed to the summary command (0 means no limit)."),
+    model: str = typer.Option("gpt-4o", "--model", help="Model name sent to the stub; it decides the chunk size."),
+    skip_summary: bool = typer.Option(False, "--skip-summary", help="Only run the scan and chunk benchmarks."),
+    work_dir: Optional[str] = typer.Option(None, "--work-dir", help="Generate trees here and keep them (default: a temporary directory)."),
+    json_output: Optional[str] = typer.Option(None, "--json", help="Write the results as JSON to this file."),
+    baseline: Optional[str] = typer.Option(None, "--baseline", help="A previous --json report to compare against."),
+    max_slowdown: float = typer.Option(1.25, "--max-slowdown", help="Fail if a benchmark is this many times slower than the baseline."),
+    min_seconds: float = typer.Option(0.05, "--min-seconds", help="Ignore baseline comparisons of timings below this many seconds."),
+):
+    """Generate synthetic project trees and benchmark scanning, chunking and summarization against a local stub server."""
+    selected = scenarios or list(SCENARIOS)
+    unknown = [name for name in selected if name not in SCENARIOS]
+    if unknown:
+        console.print(f"[bold red]Unknown scenario(s): {', '.join(unknown)}. Available: {', '.join(SCENARIOS)}[/bold red]")
+        raise typer.Exit(code=1)
+
+    with tempfile.TemporaryDirectory(prefix="sumsnap-bench-") as temp_dir:
+        trees_dir = work_dir or os.path.join(temp_dir, "trees")
+        use_isolated_config(os.path.join(temp_dir, "config"))
+        import config
+
+        results: List[Dict[str, Any]] = []
+        with StubServer(
+            latency=latency, jitter=jitter, failure_rate=failure_rate, failure_status=failure_status, rate_limit_rpm=rate_limit_rpm
+        ) as stub:
+            config.set_config("AI_API_KEY", "benchmark")
+            config.set_config("AI_API_ENDPOINT", stub.base_url)
+            config.set_config("AI_MODEL", model)
+
+            for scenario in selected:
+                tree = os.path.join(trees_dir, scenario)
+                if not os.path.isdir(tree):
+                    with console.status(f"[cyan]Generating {scenario} tree..."):
+                        generate(scenario, trees_dir, scale)
+                with console.status(f"[cyan]Benchmarking {scenario}..."):
+                    scan_result, text_file_paths = bench_scan(scenario, tree)
+                    results.append(scan_result)
+                    chunk_result = bench_chunk(scenario, tree, text_file_paths, model)
+                    if chunk_result:
+                        results.append(chunk_result)
+                    if not skip_summary:
+                        results.append(bench_summary(scenario, tree, stub, concurrency, ["--requests-per-minute", str(requests_per_minute)]))
+
+    print_results(results)
+
+    if json_output:
+        report = {
+            "settings": {
+                "scale": scale, "latency": latency, "jitter": jitter, "failure_rate": failure_rate,
+                "failure_status": failure_status, "rate_limit_rpm": rate_limit_rpm, "concurrency": concurrency,
+                "requests_per_minute": requests_per_minute, "model": model,
+            },
+            "results": results,
+        }
+        try:
+            with open(json_output, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            console.print(f"[bold red]Failed to write {json_output}: {e}[/bold red]")
+            raise typer.Exit(code=1)
+        console.print(f"[green]Results saved to {json_output}[/green]")
+
+    if baseline:
+        try:
+            regressions = find_regressions(results, baseline, max_slowdown, min_seconds)
+        except RuntimeError as e:
+            console.print(f"[bold red]{e}[/bold red]")
+            raise typer.Exit(code=1)
+        if regressions:
+            console.print("[bold red]Regressions against the baseline:[/bold red]")
+            for regression in regressions:
+                console.print(f"- {regression}")
+            raise typer.Exit(code=1)
+        console.print("[green]No regressions against the baseline.[/green]")
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,100 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN_PATH = os.path.join(os.path.dirname(BENCHMARKS_DIR), "src", "main.py")
+
+# Commands that never summarize anything and should start almost as fast as the interpreter itself
+COMMANDS = [
+    ["version"],
+    ["--help"],
+    ["summary", "--help"],
+    ["config-set", "--help"],
+    ["config-set", "benchmark_key", "1"],
+]
+
+console = Console()
+app = typer.Typer()
+
+def time_command(args: List[str], runs: int, env: dict) -> List[float]:
+    """Run a command `runs` times and return the wall times in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        timings.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"'{' '.join(args)}' failed: {result.stderr.decode(errors='replace').strip()}")
+    return timings
+
+def slowest_imports(args: List[str], env: dict, count: int) -> List[tuple[int, str]]:
+    """Return the `count` top-level imports with the highest cumulative import time, in microseconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args[1:], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    imports = []
+    for line in result.stderr.decode(errors="replace").splitlines():
+        parts = line.replace("import time:", "", 1).split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        # Nested imports are indented below the module that imported them
+        if parts[2].startswith("  "):
+            continue
+        imports.append((int(parts[1]), parts[2].strip()))
+    return sorted(imports, reverse=True)[:count]
+
+@app.command()
+def run(
+    runs: int = typer.Option(10, "--runs", min=1, help="Number of runs per command."),
+    max_ms: Optional[float] = typer.Option(None, "--max-ms", help="Fail if the median time of a command, minus the interpreter's own startup, exceeds this many milliseconds."),
+    show_imports: bool = typer.Option(False, "--imports", help="Also list the slowest top-level imports of `sumsnap version`."),
+):
+    """Measure how long sumsnap takes to start for commands that don't summarize anything."""
+    with tempfile.TemporaryDirectory(prefix="sumsnap-startup-") as config_home:
+        # Keep the benchmark away from the real config file
+        env = dict(os.environ, XDG_CONFIG_HOME=config_home, APPDATA=config_home, HOME=config_home)
+
+        baseline = statistics.median(time_command([sys.executable, "-c", "pass"], runs, env))
+        table = Table(title=f"sumsnap startup time ({runs} runs, interpreter startup {baseline:.0f} ms)", title_justify="left")
+        table.add_column("Command")
+        table.add_column("Min (ms)", justify="right")
+        table.add_column("Median (ms)", justify="right")
+        table.add_column("Over interpreter (ms)", justify="right")
+
+        too_slow = []
+        for command in COMMANDS:
+            try:
+                timings = time_command([sys.executable, MAIN_PATH] + command, runs, env)
+            except RuntimeError as e:
+                console.print(f"[bold red]{e}[/bold red]")
+                raise typer.Exit(code=1)
+            median = statistics.median(timings)
+            overhead = median - baseline
+            table.add_row(f"sumsnap {' '.join(command)}", f"{min(timings):.0f}", f"{median:.0f}", f"{overhead:.0f}")
+            if max_ms is not None and overhead > max_ms:
+                too_slow.append(f"sumsnap {' '.join(command)}: {overhead:.0f} ms")
+        console.print(table)
+
+        if show_imports:
+            import_table = Table(title="Slowest imports of `sumsnap version`", title_justify="left")
+            import_table.add_column("Module")
+            import_table.add_column("Cumulative (ms)", justify="right")
+            for cumulative, name in slowest_imports([sys.executable, MAIN_PATH, "version"], env, 10):
+                import_table.add_row(name, f"{cumulative / 1000:.1f}")
+            console.print(import_table)
+
+    if too_slow:
+        console.print(f"[bold red]Slower than {max_ms:.0f} ms over interpreter startup:[/bold red]")
+        for line in too_slow:
+            console.print(f"- {line}")
+        raise typer.Exit(code=1)
+
+if __name__ == "__main__":
+    app()
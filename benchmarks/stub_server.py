@@ -0,0 +1,260 @@
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+CHARS_PER_TOKEN = 4
+
+class StubStats:
+    """Counters for everything the stub server received and answered."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.failures = 0
+            self.rate_limited = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.payload_bytes = 0
+            self.images = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "rate_limited": self.rate_limited,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "payload_bytes": self.payload_bytes,
+                "images": self.images,
+            }
+
+def _message_text(messages: list) -> tuple[str, int]:
+    """Return the concatenated text of all messages and the number of attached images."""
+    texts = []
+    images = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            texts.append(content)
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "text":
+                    texts.append(part.get("text", ""))
+                elif part.get("type") == "image_url":
+                    images += 1
+    return "\n".join(texts), images
+
+def _make_handler(server: "StubServer"):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_chunk(self, data: bytes):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            raw_body = self.rfile.read(length)
+            try:
+                body = json.loads(raw_body)
+            except ValueError:
+                self._send_json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+                return
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+                return
+
+            text, images = _message_text(body.get("messages", []))
+            with server.stats.lock:
+                server.stats.requests += 1
+                server.stats.payload_bytes += len(raw_body)
+                request_number = server.stats.requests
+
+            latency = server.latency + (server.rng.uniform(0, server.jitter) if server.jitter else 0.0)
+            if latency > 0:
+                time.sleep(latency)
+
+            retry_after = server.take_rate_limit_slot()
+            if retry_after is not None:
+                with server.stats.lock:
+                    server.stats.failures += 1
+                    server.stats.rate_limited += 1
+                self._send_json(
+                    429,
+                    {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                    {"Retry-After": str(math.ceil(retry_after)), "retry-after-ms": str(int(retry_after * 1000))}
+                )
+                return
+
+            if server.failure_rate and server.rng.random() < server.failure_rate:
+                with server.stats.lock:
+                    server.stats.failures += 1
+                headers = {"Retry-After": str(server.retry_after)} if server.failure_status == 429 else None
+                self._send_json(
+                    server.failure_status,
+                    {"error": {"message": "Injected failure", "type": "server_error", "code": server.failure_status}},
+                    headers
+                )
+                return
+
+            prompt_tokens = (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN + images * 85
+            content = f"Summary #{request_number} of {len(text)} characters and {images} image(s). " + "Lorem ipsum dolor sit amet. " * server.response_sentences
+            completion_tokens = (len(content) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+            with server.stats.lock:
+                server.stats.prompt_tokens += prompt_tokens
+                server.stats.completion_tokens += completion_tokens
+                server.stats.images += images
+
+            model = body.get("model", "stub")
+            if body.get("stream"):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for start in range(0, len(content), 40):
+                    delta = {
+                        "id": f"chatcmpl-{request_number}", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "delta": {"content": content[start:start + 40]}, "finish_reason": None}],
+                    }
+                    self._send_chunk(f"data: {json.dumps(delta)}\n\n".encode("utf-8"))
+                self._send_chunk(b"data: [DONE]\n\n")
+                self._send_chunk(b"")
+                return
+
+            self._send_json(200, {
+                "id": f"chatcmpl-{request_number}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+            })
+
+    return Handler
+
+class StubServer:
+    """
+    A local OpenAI-compatible chat completions server for benchmarks.
+    Responses are delayed by latency (plus up to jitter seconds), and failure_rate of the requests
+    are answered with failure_status (a 429 carries a Retry-After header). With rate_limit_rpm set,
+    requests beyond that many per minute (enforced per second, as providers do) get a 429 telling
+    the client when the next request will be accepted.
+    Use it as a context manager; base_url is the value to configure as API_ENDPOINT.
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 500,
+        retry_after: int = 1,
+        response_sentences: int = 4,
+        rate_limit_rpm: float = 0.0,
+        seed: int = 0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.retry_after = retry_after
+        self.response_sentences = response_sentences
+        self.rate_limit_rpm = rate_limit_rpm
+        self._rate_lock = threading.Lock()
+        self._rate_level = max(1.0, rate_limit_rpm / 60)
+        self._rate_updated = time.monotonic()
+        self.rng = random.Random(seed)
+        self.stats = StubStats()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    def take_rate_limit_slot(self) -> Optional[float]:
+        """Admit a request under rate_limit_rpm, or return the seconds until one would be admitted."""
+        if not self.rate_limit_rpm:
+            return None
+        rate = self.rate_limit_rpm / 60
+        with self._rate_lock:
+            now = time.monotonic()
+            self._rate_level = min(max(1.0, rate), self._rate_level + (now - self._rate_updated) * rate)
+            self._rate_updated = now
+            if self._rate_level >= 1:
+                self._rate_level -= 1
+                return None
+            return (1 - self._rate_level) / rate
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve in the current thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stub chat completions server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds to wait before answering each request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency of up to this many seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with an error.")
+    parser.add_argument("--failure-status", type=int, default=500, help="HTTP status of injected failures, e.g. 429 or 500.")
+    parser.add_argument("--rate-limit-rpm", type=float, default=0.0, help="Answer requests beyond this many per minute with 429.")
+    args = parser.parse_args()
+
+    stub = StubServer(
+        args.port, args.latency, args.jitter, args.failure_rate, args.failure_status, rate_limit_rpm=args.rate_limit_rpm
+    )
+    print(f"Stub server listening on {stub.base_url}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(stub.stats.snapshot()))
@@ -0,0 +1,129 @@
+import os
+import random
+import shutil
+from typing import Callable, Dict
+
+WORDS = (
+    "data value result config client server request response file path chunk summary index cache token "
+    "model image page stream buffer count total error retry limit queue worker thread pool state"
+).split()
+
+def _write(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(content)
+
+def _python_source(rng: random.Random, target_bytes: int) -> str:
+    """Generate plausible-looking Python source of roughly target_bytes."""
+    parts = [f'"""Module for {rng.choice(WORDS)} {rng.choice(WORDS)} handling."""\n\nimport os\nimport json\n\n']
+    size = len(parts[0])
+    while size < target_bytes:
+        name = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{rng.randrange(1000)}"
+        args = ", ".join(rng.sample(WORDS, 3))
+        body = "".join(
+            f"    {rng.choice(WORDS)} = {rng.choice(WORDS)}({rng.choice(WORDS)}, {rng.randrange(100)})\n"
+            for _ in range(rng.randint(2, 8))
+        )
+        function = f"def {name}({args}):\n    \"\"\"Return the {rng.choice(WORDS)} for the {rng.choice(WORDS)}.\"\"\"\n{body}    return {rng.choice(WORDS)}\n\n"
+        parts.append(function)
+        size += len(function)
+    return "".join(parts)
+
+def many_small_files(root: str, rng: random.Random, scale: float = 1.0):
+    """Thousands of small source files spread over a shallow package layout."""
+    count = max(10, int(3000 * scale))
+    for i in range(count):
+        path = os.path.join(root, f"pkg{i // 250}", f"sub{i // 25 % 10}", f"module_{i}.py")
+        _write(path, _python_source(rng, rng.randint(200, 3000)))
+
+def deep_gitignore_tree(root: str, rng: random.Random, scale: float = 1.0):
+    """A deep directory hierarchy with a .gitignore at every level, including negations and ignored build folders."""
+    depth = max(2, int(7 * min(scale, 1.5)))
+    fan_out = 3
+
+    def build(directory: str, level: int):
+        _write(os.path.join(directory, ".gitignore"), f"*.log\nbuild/\n/tmp_{level}/\n!keep.log\n*.generated.{level}.py\n")
+        _write(os.path.join(directory, f"level_{level}.py"), _python_source(rng, 600))
+        _write(os.path.join(directory, "debug.log"), "ignored log line\n" * 50)
+        _write(os.path.join(directory, "keep.log"), "kept log line\n" * 5)
+        _write(os.path.join(directory, f"code.generated.{level}.py"), _python_source(rng, 400))
+        _write(os.path.join(directory, "build", "artifact.py"), _python_source(rng, 400))
+        _write(os.path.join(directory, f"tmp_{level}", "scratch.txt"), "scratch\n")
+        if level < depth:
+            for branch in range(fan_out):
+                build(os.path.join(directory, f"d{level}_{branch}"), level + 1)
+
+    _write(os.path.join(root, ".gitignore"), "node_modules/\n*.pyc\n")
+    _write(os.path.join(root, "node_modules", "dep", "index.js"), "module.exports = {};\n" * 100)
+    build(os.path.join(root, "src"), 1)
+
+def huge_files(root: str, rng: random.Random, scale: float = 1.0):
+    """A few very large files: a long multi-line source file, a huge log-like text file and a single-line minified bundle."""
+    _write(os.path.join(root, "big_module.py"), _python_source(rng, int(8 * 1024 * 1024 * scale)))
+    line_count = int(200000 * scale)
+    lines = [f"2024-01-01T00:00:{i % 60:02d} {rng.choice(WORDS)} {rng.choice(WORDS)} {i} {rng.random():.6f}\n" for i in range(line_count)]
+    _write(os.path.join(root, "records.txt"), "".join(lines))
+    statements = [f"var {rng.choice(WORDS)}{i}=function(a,b){{return a+b*{i}}};" for i in range(int(60000 * scale))]
+    _write(os.path.join(root, "bundle.min.js"), "".join(statements))
+
+def image_heavy_tree(root: str, rng: random.Random, scale: float = 1.0):
+    """A folder of images in several formats and sizes, with some exact duplicates."""
+    from PIL import Image
+
+    count = max(4, int(40 * scale))
+    formats = [("png", "PNG"), ("jpg", "JPEG"), ("gif", "GIF"), ("bmp", "BMP"), ("webp", "WEBP")]
+    _write(os.path.join(root, "notes.txt"), "Screenshots and diagrams.\n")
+    previous_path = None
+    for i in range(count):
+        extension, pil_format = formats[i % len(formats)]
+        path = os.path.join(root, "assets", f"image_{i}.{extension}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if previous_path and i % 10 == 9:
+            shutil.copyfile(previous_path, os.path.join(root, "assets", f"copy_of_{os.path.basename(previous_path)}"))
+            continue
+        # Every fourth image is larger than the default downscaling edge
+        width, height = (3200, 2400) if i % 4 == 0 else (rng.randint(200, 1200), rng.randint(200, 900))
+        img = Image.effect_noise((width // 4, height // 4), rng.randint(20, 80)).resize((width, height)).convert("RGB")
+        img.save(path, format=pil_format)
+        previous_path = path
+
+def pdf_heavy_tree(root: str, rng: random.Random, scale: float = 1.0):
+    """PDFs with a text layer, plus PDFs whose pages are only images, as produced by scanners."""
+    import io
+    import fitz
+    from PIL import Image
+
+    count = max(1, int(4 * scale))
+    os.makedirs(os.path.join(root, "docs"), exist_ok=True)
+    for i in range(count):
+        doc = fitz.open()
+        for page_number in range(30):
+            page = doc.new_page()
+            text = " ".join(rng.choice(WORDS) for _ in range(400))
+            page.insert_textbox(fitz.Rect(50, 50, 550, 800), f"Page {page_number + 1}. {text}", fontsize=9)
+        doc.save(os.path.join(root, "docs", f"report_{i}.pdf"))
+        doc.close()
+
+        scanned = fitz.open()
+        for page_number in range(6):
+            img = Image.effect_noise((400, 560), 60).resize((1240, 1754)).convert("RGB")
+            buf = io.BytesIO()
+            img.save(buf, format="JPEG", quality=70)
+            page = scanned.new_page()
+            page.insert_image(page.rect, stream=buf.getvalue())
+        scanned.save(os.path.join(root, "docs", f"scan_{i}.pdf"))
+        scanned.close()
+
+SCENARIOS: Dict[str, Callable[[str, random.Random, float], None]] = {
+    "many-small": many_small_files,
+    "deep-gitignore": deep_gitignore_tree,
+    "huge-files": huge_files,
+    "images": image_heavy_tree,
+    "pdfs": pdf_heavy_tree,
+}
+
+def generate(scenario: str, root: str, scale: float = 1.0, seed: int = 0) -> str:
+    """Generate the synthetic tree for a scenario under root and return its path."""
+    path = os.path.join(root, scenario)
+    SCENARIOS[scenario](path, random.Random(seed), scale)
+    return path
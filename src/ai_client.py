@@ -0,0 +1,74 @@
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+import config
+
+# openai takes most of a second to import, so it is only imported once a client is needed
+if TYPE_CHECKING:
+    import openai
+
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_REQUEST_TIMEOUT = 600.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+KEEPALIVE_EXPIRY = 30.0
+
+_clients: Dict[Tuple[str, str], "openai.OpenAI"] = {}
+_http_clients: Dict[Tuple[str, str], Any] = {}
+_clients_lock = threading.Lock()
+
+def get_client(api_key: str, api_endpoint: str) -> "openai.OpenAI":
+    """
+    Return the shared OpenAI client for this endpoint/key pair, creating it on first use.
+    The client keeps a pool of keep-alive connections so repeated requests skip the TCP/TLS handshake.
+    """
+    client_key = (api_endpoint, api_key)
+    with _clients_lock:
+        client = _clients.get(client_key)
+        if client is None:
+            import openai
+            # Use the same Limits class the SDK's bundled HTTP client was built against
+            limits_class = type(openai.DEFAULT_CONNECTION_LIMITS)
+            max_connections = config.resolve_int_setting(None, "MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+            http_client = openai.DefaultHttpxClient(
+                limits=limits_class(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                ),
+                timeout=openai.Timeout(
+                    config.resolve_float_setting("REQUEST_TIMEOUT", DEFAULT_REQUEST_TIMEOUT, minimum=1.0),
+                    connect=config.resolve_float_setting("CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT, minimum=1.0)
+                )
+            )
+            # Retries are left to the scheduler, which also paces and throttles requests across threads
+            client = openai.OpenAI(api_key=api_key, base_url=api_endpoint, http_client=http_client, max_retries=0)
+            _clients[client_key] = client
+            _http_clients[client_key] = http_client
+        return client
+
+def warm_up_client(api_key: str, api_endpoint: str) -> threading.Thread:
+    """
+    Create the client and open a pooled connection to the endpoint in a background thread, so the first
+    real request doesn't pay for importing the SDK or the handshake. Failures are ignored; the request
+    will simply create the client and connect itself.
+    """
+    def _warm_up():
+        try:
+            client = get_client(api_key, api_endpoint)
+            _http_clients[(api_endpoint, api_key)].head(str(client.base_url))
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=_warm_up, daemon=True)
+    thread.start()
+    return thread
+
+def close_clients():
+    """Close all pooled clients and their connections."""
+    with _clients_lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _clients.clear()
+        _http_clients.clear()
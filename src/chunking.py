@@ -0,0 +1,152 @@
+import re
+from typing import Iterable, Iterator, List, Optional
+import config
+
+CHARS_PER_TOKEN = 4
+DEFAULT_CONTEXT_TOKENS = 8192
+DEFAULT_CHUNK_TOKENS = 2000
+MAX_CHUNK_TOKENS = 32000
+# Share of the context window used for chunk text; the rest is left for the prompt, images and the response
+CHUNK_CONTEXT_SHARE = 0.5
+
+# Context window sizes by model name prefix. The longest matching prefix wins.
+MODEL_CONTEXT_TOKENS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-5": 400000,
+    "o1": 200000,
+    "o3": 200000,
+    "o4": 200000,
+    "claude": 200000,
+    "gemini": 1048576,
+    "llama": 8192,
+    "llama-3.1": 128000,
+    "llama-3.2": 128000,
+    "llama-3.3": 128000,
+    "mistral": 32768,
+    "mixtral": 32768,
+    "qwen": 32768,
+    "deepseek": 65536,
+}
+
+SECTION_HEADER_PATTERN = re.compile(r"^(?=# (?:FILE|IMAGE|PDF): )", re.MULTILINE)
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in text (about four characters per token for code and English)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def get_context_tokens(model: str) -> int:
+    """Look up the context window size of a model, ignoring any provider prefix like 'openai/'."""
+    name = model.lower().rsplit("/", 1)[-1]
+    best_match = ""
+    for prefix in MODEL_CONTEXT_TOKENS:
+        if name.startswith(prefix) and len(prefix) > len(best_match):
+            best_match = prefix
+    return MODEL_CONTEXT_TOKENS[best_match] if best_match else DEFAULT_CONTEXT_TOKENS
+
+def get_chunk_token_budget(model: Optional[str]) -> int:
+    """
+    Return the number of tokens of content to pack into a single request for a model.
+    The CHUNK_TOKENS config value overrides the value derived from the model's context window.
+    """
+    configured = config.get_config("CHUNK_TOKENS")
+    if configured:
+        try:
+            return max(100, int(configured))
+        except ValueError:
+            pass
+    if not model:
+        return DEFAULT_CHUNK_TOKENS
+    return max(DEFAULT_CHUNK_TOKENS // 2, min(MAX_CHUNK_TOKENS, int(get_context_tokens(model) * CHUNK_CONTEXT_SHARE)))
+
+def _split_long_line(line: str, max_tokens: int) -> List[str]:
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    return [line[i:i + max_chars] for i in range(0, len(line), max_chars)]
+
+def _pack_lines(lines: List[str], max_tokens: int) -> List[str]:
+    """Pack lines into pieces of at most max_tokens, hard-splitting lines that are too long on their own."""
+    pieces = []
+    current: List[str] = []
+    current_tokens = 0
+    for line in lines:
+        parts = _split_long_line(line, max_tokens) if estimate_tokens(line) > max_tokens else [line]
+        for part in parts:
+            part_tokens = estimate_tokens(part) + 1
+            if current and current_tokens + part_tokens > max_tokens:
+                pieces.append("\n".join(current))
+                current = []
+                current_tokens = 0
+            current.append(part)
+            current_tokens += part_tokens
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+def _split_oversized_section(section: str, max_tokens: int) -> List[str]:
+    """Split a section that doesn't fit into one chunk, repeating its '# FILE:' header on every piece."""
+    lines = section.splitlines()
+    header = lines[0] if lines and SECTION_HEADER_PATTERN.match(lines[0]) else None
+    if header is None:
+        return _pack_lines(lines, max_tokens)
+    body_lines = lines[1:]
+    while body_lines and not body_lines[0].strip():
+        body_lines.pop(0)
+    continuation_header = f"{header} (continued)"
+    pieces = _pack_lines(body_lines, max(1, max_tokens - estimate_tokens(continuation_header) - 1))
+    if not pieces:
+        return [header]
+    return [f"{header}\n{pieces[0]}"] + [f"{continuation_header}\n{piece}" for piece in pieces[1:]]
+
+def iter_chunks(sections: Iterable[str], max_tokens: int = DEFAULT_CHUNK_TOKENS) -> Iterator[str]:
+    """
+    Pack a stream of text sections into chunks of at most max_tokens estimated tokens,
+    yielding each chunk as soon as it is full.
+    Sections are packed whole where possible, so small files share a chunk and aren't cut in half.
+    Oversized sections are split by lines, and single lines that exceed the budget are split hard.
+    """
+    current: List[str] = []
+    current_tokens = 0
+
+    def take_current() -> str:
+        nonlocal current, current_tokens
+        chunk = "".join(current).strip("\n")
+        current = []
+        current_tokens = 0
+        return chunk
+
+    for section in sections:
+        if not section.strip():
+            continue
+        section_tokens = estimate_tokens(section)
+        if current_tokens + section_tokens <= max_tokens:
+            current.append(section)
+            current_tokens += section_tokens
+            continue
+        chunk = take_current()
+        if chunk.strip():
+            yield chunk
+        if section_tokens <= max_tokens:
+            current.append(section)
+            current_tokens = section_tokens
+            continue
+        pieces = _split_oversized_section(section.strip("\n"), max_tokens)
+        for piece in pieces[:-1]:
+            if piece.strip():
+                yield piece
+        # Keep the last piece open so the following small files can share its chunk
+        current = [pieces[-1] + "\n\n"]
+        current_tokens = estimate_tokens(current[0])
+    chunk = take_current()
+    if chunk.strip():
+        yield chunk
+
+def chunk_text(text: str, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens estimated tokens.
+    '# FILE:' sections are packed whole where possible; see iter_chunks.
+    """
+    return list(iter_chunks(SECTION_HEADER_PATTERN.split(text), max_tokens))
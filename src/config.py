@@ -1,10 +1,18 @@
 import configparser
+import os
+import threading
 from pathlib import Path
+from typing import Dict, Optional
 import typer
 
 APP_NAME = "sumsnap"
 CONFIG_DIR_PATH = Path(typer.get_app_dir(APP_NAME))
 CONFIG_FILE_PATH = CONFIG_DIR_PATH / "config.ini"
+# Any key can be overridden with a SUMSNAP_<KEY> environment variable; AI_* keys also with the plain key name
+ENV_PREFIX = "SUMSNAP_"
+
+_snapshot: Optional[Dict[str, str]] = None
+_snapshot_lock = threading.Lock()
 
 def init_config() -> int:
     """Initialize the config file and directory."""
@@ -31,12 +39,58 @@ def set_config(key: str, value: str) -> int:
             config.write(f)
     except OSError:
         return 3  # WRITE_ERROR
+    reload_config()
     return 0  # SUCCESS
 
+def load_config() -> Dict[str, str]:
+    """Return the values of the config file, parsed once per process."""
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None:
+            config = configparser.ConfigParser()
+            if CONFIG_FILE_PATH.exists():
+                config.read(CONFIG_FILE_PATH)
+            _snapshot = dict(config["General"]) if config.has_section("General") else {}
+        return _snapshot
+
+def reload_config():
+    """Discard the parsed config so the next lookup reads the config file again."""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
 def get_config(key: str) -> str | None:
-    """Get a config value from the config file."""
-    config = configparser.ConfigParser()
-    if CONFIG_FILE_PATH.exists():
-        config.read(CONFIG_FILE_PATH)
-        return config.get("General", key, fallback=None)
-    return None
\ No newline at end of file
+    """Get a config value from the environment or, if it isn't set there, from the config file."""
+    key = key.upper()
+    env_value = os.environ.get(f"{ENV_PREFIX}{key}")
+    if not env_value and key.startswith("AI_"):
+        env_value = os.environ.get(key)
+    if env_value:
+        return env_value
+    # configparser stores keys in lower case
+    return load_config().get(key.lower())
+
+def _warn_invalid_value(key: str, configured: str):
+    from rich.console import Console
+    Console(stderr=True).print(f"[yellow]Warning: Ignoring invalid {key} value '{configured}' in config.[/yellow]")
+
+def resolve_int_setting(value: Optional[int], key: str, default: int, minimum: int = 1) -> int:
+    """Resolve an integer setting from the CLI option, the config file or the default."""
+    if value is None:
+        configured = get_config(key)
+        try:
+            value = int(configured) if configured else default
+        except ValueError:
+            _warn_invalid_value(key, configured)
+            value = default
+    return max(minimum, value)
+
+def resolve_float_setting(key: str, default: float, minimum: float = 0.0) -> float:
+    """Resolve a float setting from the config file or the default."""
+    configured = get_config(key)
+    try:
+        value = float(configured) if configured else default
+    except ValueError:
+        _warn_invalid_value(key, configured)
+        value = default
+    return max(minimum, value)
\ No newline at end of file
@@ -24,4 +24,17 @@ def set_api_key(api_key: str = typer.Argument(..., help="Your AI API key")):
 def set_ai_model(model: str = typer.Argument(..., help="Your AI model")):
     """Set the AI model."""
     set_config("AI_MODEL", model)
-    print("AI model updated.")
\ No newline at end of file
+    print("AI model updated.")
+
+def set_concurrency(concurrency: int = typer.Argument(..., min=1, help="Maximum number of parallel summarization requests")):
+    """Set the default number of parallel summarization requests."""
+    set_config("CONCURRENCY", str(concurrency))
+    print("Concurrency updated.")
+
+def config_set(
+    key: str = typer.Argument(..., help="Config key, e.g. MAX_CONNECTIONS, REQUEST_TIMEOUT or CONNECT_TIMEOUT"),
+    value: str = typer.Argument(..., help="Value to store")
+):
+    """Set any config value."""
+    set_config(key.upper(), value)
+    print(f"{key.upper()} updated.")
\ No newline at end of file
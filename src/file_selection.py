@@ -0,0 +1,227 @@
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from chunking import CHARS_PER_TOKEN
+
+# Files that describe the project as a whole: name, dependencies, how it is built and run
+MANIFEST_NAMES = {
+    "pyproject.toml", "setup.py", "setup.cfg", "requirements.txt", "pipfile", "package.json", "tsconfig.json",
+    "cargo.toml", "go.mod", "pom.xml", "build.gradle", "build.gradle.kts", "settings.gradle", "gemfile",
+    "composer.json", "cmakelists.txt", "makefile", "dockerfile", "docker-compose.yml", "docker-compose.yaml",
+    "mix.exs", "pubspec.yaml", "project.clj", "deno.json",
+}
+ENTRY_POINT_STEMS = {"main", "__main__", "app", "cli", "index", "server", "manage", "lib", "mod", "program", "application"}
+LOCKFILE_NAMES = {
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "pipfile.lock", "cargo.lock", "composer.lock",
+    "gemfile.lock", "go.sum", "uv.lock", "pdm.lock", "bun.lockb", "flake.lock", "mix.lock", "pubspec.lock",
+}
+LOW_VALUE_DIRS = {
+    "fixtures", "fixture", "testdata", "test_data", "__snapshots__", "snapshots", "mocks", "__mocks__",
+    "vendor", "third_party", "thirdparty", "dist", "build", "generated", "migrations", "examples", "samples",
+}
+TEST_DIRS = {"test", "tests", "spec", "specs", "__tests__", "e2e"}
+SOURCE_EXTENSIONS = {
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".go", ".rs", ".java", ".kt", ".scala", ".c", ".h", ".cpp", ".hpp", ".cc",
+    ".cs", ".rb", ".php", ".swift", ".m", ".ex", ".exs", ".erl", ".hs", ".clj", ".lua", ".dart", ".sh", ".vue", ".svelte",
+}
+DOC_EXTENSIONS = {".md", ".rst", ".adoc", ".txt"}
+DATA_EXTENSIONS = {".json", ".csv", ".tsv", ".xml", ".svg", ".yaml", ".yml", ".sql", ".lock", ".map", ".snap", ".ndjson"}
+GENERATED_SUFFIXES = (".min.js", ".min.css", ".map", "_pb2.py", "_pb2_grpc.py", ".pb.go", ".g.dart", ".designer.cs")
+
+# Banners that code generators put in a comment near the top of a file: @generated, Go's
+# "Code generated ... DO NOT EDIT.", protoc's header and .NET's <auto-generated> tag.
+# Only checked in code and data files, where the comment marker can't be ordinary prose.
+GENERATED_MARKER_PATTERN = re.compile(
+    r"^\s*(?://|#|/\*+|\*|<!--|--|;|%)\s*(?:"
+    r".*@generated\b|"
+    r"code generated .* do not edit\.|"
+    r"generated by the protocol buffer compiler\.\s+do not edit!|"
+    r"<auto-generated\b)",
+    re.IGNORECASE
+)
+GENERATED_MARKER_LINES = 10
+# Content sampled from the start of a file for the minified and encoded checks
+SAMPLE_CHARS = 16384
+MINIFIED_MAX_LINE_CHARS = 1000
+MINIFIED_AVERAGE_LINE_CHARS = 300
+# Long lines of prose (soft-wrapped Markdown, plain text) are full of spaces; minified code is not
+MINIFIED_MAX_WHITESPACE_SHARE = 0.08
+# Base64 and other encoded blobs use most of their alphabet evenly; source code stays well below this
+ENCODED_MIN_ENTROPY_BITS = 5.2
+# Duplicates smaller than this aren't worth replacing with a stub
+MIN_DUPLICATE_CHARS = 256
+
+# A file is only truncated if at least this much of it fits; smaller remainders are left for other files
+MIN_TRUNCATED_TOKENS = 200
+# Files scoring below this (lockfiles, fixtures, generated code) are only included whole, never truncated
+MIN_TRUNCATED_SCORE = 0.0
+# No single file may take more than this share of the budget, so one large module can't crowd out the rest
+MAX_FILE_BUDGET_SHARE = 0.25
+
+def estimate_file_tokens(file_path: str) -> int:
+    """Estimate the tokens of a text file from its size, without reading it."""
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        return 0
+    return (size + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def score_file(relative_path: str, tokens: int) -> float:
+    """
+    Rank a project file by how much it tells about the project: manifests and entry points first,
+    then top-level source, docs and tests; lockfiles, fixtures, generated and vendored files last.
+    Deeper and larger files score lower.
+    """
+    parts = relative_path.lower().split("/")
+    name = parts[-1]
+    directories = parts[:-1]
+    stem, extension = os.path.splitext(name)
+    score = 10.0
+
+    if name in LOCKFILE_NAMES:
+        score -= 12
+    elif name in MANIFEST_NAMES:
+        score += 8
+    elif stem in ENTRY_POINT_STEMS and extension in SOURCE_EXTENSIONS:
+        score += 6
+
+    if name.endswith(GENERATED_SUFFIXES) or ".generated." in name:
+        score -= 10
+    if any(directory in LOW_VALUE_DIRS for directory in directories):
+        score -= 8
+    if any(directory in TEST_DIRS for directory in directories) or stem.startswith("test_") or stem.endswith(("_test", ".test", ".spec")):
+        score -= 3
+
+    if extension in SOURCE_EXTENSIONS:
+        score += 2
+    elif extension in DOC_EXTENSIONS:
+        score += 1
+    elif extension in DATA_EXTENSIONS:
+        score -= 3
+
+    score -= 1.5 * len(directories)
+    if tokens > 1000:
+        score -= math.log2(tokens / 1000)
+    return score
+
+def select_files(
+    project_path: str,
+    files: List[Tuple[str, str]],
+    token_budget: int,
+    image_tokens: int
+) -> Dict[str, Any]:
+    """
+    Pick the project files that fit into token_budget, most valuable first. files are (kind, path) pairs
+    in walk order, where kind is "text" or "image"; each image costs image_tokens.
+    Files that don't fit whole are skipped in favor of smaller ones, and files over the per-file cap are
+    truncated; whatever budget is left then goes to the best truncated or skipped files. Files scoring
+    below MIN_TRUNCATED_SCORE are never truncated.
+    Returns a dict with "limits" (selected path -> max tokens, or None to include it whole),
+    "truncated" and "dropped" ((relative path, estimated tokens) lists), "selected_tokens" and "total_tokens".
+    """
+    file_cap = max(MIN_TRUNCATED_TOKENS, int(token_budget * MAX_FILE_BUDGET_SHARE))
+    candidates = []
+    for index, (kind, file_path) in enumerate(files):
+        relative_path = os.path.relpath(file_path, project_path).replace(os.sep, "/")
+        tokens = image_tokens if kind == "image" else estimate_file_tokens(file_path)
+        # Images are described, not read, so they rank like a mid-sized doc file
+        score = score_file(relative_path, tokens) - (2 if kind == "image" else 0)
+        candidates.append((score, index, kind, file_path, relative_path, tokens))
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+
+    limits: Dict[str, Optional[int]] = {}
+    truncated: List[Tuple[str, int]] = []
+    skipped = []
+    remaining = token_budget
+    for candidate in candidates:
+        score, _, kind, file_path, relative_path, tokens = candidate
+        if tokens <= min(remaining, file_cap):
+            limits[file_path] = None
+            remaining -= tokens
+        elif kind == "text" and score >= MIN_TRUNCATED_SCORE and tokens > file_cap and remaining >= MIN_TRUNCATED_TOKENS:
+            kept = min(file_cap, remaining)
+            limits[file_path] = kept
+            truncated.append((relative_path, tokens))
+            remaining -= kept
+        else:
+            skipped.append(candidate)
+
+    # Spend what's left on the most valuable text files that were cut short or didn't fit
+    for candidate in candidates:
+        if remaining < MIN_TRUNCATED_TOKENS:
+            break
+        score, _, kind, file_path, relative_path, tokens = candidate
+        if kind != "text" or score < MIN_TRUNCATED_SCORE or (file_path in limits and limits[file_path] is None):
+            continue
+        current = limits.get(file_path) or 0
+        extra = min(tokens - current, remaining)
+        if file_path not in limits:
+            truncated.append((relative_path, tokens))
+            skipped.remove(candidate)
+        if current + extra >= tokens:
+            limits[file_path] = None
+            truncated.remove((relative_path, tokens))
+        else:
+            limits[file_path] = current + extra
+        remaining -= extra
+
+    total_tokens = sum(candidate[5] for candidate in candidates)
+    return {
+        "limits": limits,
+        "truncated": truncated,
+        "dropped": [(candidate[4], candidate[5]) for candidate in skipped],
+        "selected_tokens": token_budget - remaining,
+        "total_tokens": total_tokens,
+    }
+
+def truncate_to_tokens(content: str, max_tokens: int) -> str:
+    """Cut content to about max_tokens at a line boundary and mark the cut."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(content) <= max_chars:
+        return content
+    cut = content.rfind("\n", 0, max_chars)
+    if cut < max_chars // 2:
+        cut = max_chars
+    omitted_tokens = (len(content) - cut + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return f"{content[:cut]}\n[... {omitted_tokens} more tokens omitted to stay within the token budget ...]\n"
+
+def _entropy_bits(text: str) -> float:
+    """Shannon entropy of text in bits per character."""
+    counts = Counter(text)
+    total = len(text)
+    return -sum(count / total * math.log2(count / total) for count in counts.values())
+
+def detect_generated_content(file_name: str, content: str) -> Optional[str]:
+    """
+    Return why a text file shouldn't be summarized as-is ("source map", "minified", "generated" or
+    "encoded data"), or None for ordinary files. Uses the file name, a generated-code marker in the
+    first comment lines, and the line lengths, whitespace and character entropy of the start of the file.
+    """
+    lower_name = file_name.lower()
+    if lower_name.endswith(".map"):
+        return "source map"
+    if lower_name.endswith((".min.js", ".min.css", ".min.mjs")):
+        return "minified"
+    if lower_name.endswith(GENERATED_SUFFIXES) or ".generated." in lower_name:
+        return "generated"
+
+    sample = content[:SAMPLE_CHARS]
+    lines = sample.splitlines()
+    is_prose = os.path.splitext(lower_name)[1] in DOC_EXTENSIONS
+    if not is_prose and any(GENERATED_MARKER_PATTERN.match(line) for line in lines[:GENERATED_MARKER_LINES]):
+        return "generated"
+    if len(sample) < MINIFIED_MAX_LINE_CHARS:
+        return None
+    longest_line = max((len(line) for line in lines), default=0)
+    if longest_line < MINIFIED_MAX_LINE_CHARS and len(sample) / max(1, len(lines)) < MINIFIED_AVERAGE_LINE_CHARS:
+        return None
+    if _entropy_bits(sample) >= ENCODED_MIN_ENTROPY_BITS:
+        return "encoded data"
+    whitespace = sum(1 for char in sample if char.isspace())
+    return "minified" if whitespace / len(sample) < MINIFIED_MAX_WHITESPACE_SHARE else None
+
+def describe_omitted_file(reason: str, content: str) -> str:
+    """One-line stand-in for a file whose content is left out of the summary."""
+    return f"[{reason[0].upper()}{reason[1:]} file of {len(content) // 1024 + 1} KB, content omitted]"
@@ -0,0 +1,84 @@
+import codecs
+from typing import Optional
+
+HEADER_SIZE = 4096
+
+# (magic bytes, offset, MIME type) for the image formats vision models accept
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", 0, "image/png"),
+    (b"\xff\xd8\xff", 0, "image/jpeg"),
+    (b"GIF87a", 0, "image/gif"),
+    (b"GIF89a", 0, "image/gif"),
+    (b"WEBP", 8, "image/webp"),
+    (b"BM", 0, "image/bmp"),
+    (b"II*\x00", 0, "image/tiff"),
+    (b"MM\x00*", 0, "image/tiff"),
+    (b"\x00\x00\x01\x00", 0, "image/x-icon"),
+]
+
+# Headers of common binary formats that would otherwise pass the text check
+BINARY_SIGNATURES = (
+    b"PK\x03\x04", b"\x1f\x8b", b"\x7fELF", b"MZ", b"\xca\xfe\xba\xbe", b"\xcf\xfa\xed\xfe",
+    b"7z\xbc\xaf\x27\x1c", b"Rar!", b"SQLite format 3\x00", b"\x00asm", b"OggS", b"fLaC", b"ID3",
+)
+
+PDF_SIGNATURE = b"%PDF-"
+
+def read_header(file_path: str, size: int = HEADER_SIZE) -> bytes:
+    """Read the first bytes of a file."""
+    with open(file_path, "rb") as f:
+        return f.read(size)
+
+def detect_image_mime_type(header: bytes) -> Optional[str]:
+    """Return the image MIME type for a file header, or None if it isn't a supported image."""
+    for signature, offset, mime_type in IMAGE_SIGNATURES:
+        if header[offset:offset + len(signature)] == signature:
+            if mime_type == "image/webp" and not header.startswith(b"RIFF"):
+                continue
+            # "BM" alone is too common at the start of text files; require the zeroed reserved fields
+            if mime_type == "image/bmp" and header[6:10] != b"\x00\x00\x00\x00":
+                continue
+            return mime_type
+    return None
+
+def detect_text_encoding(header: bytes) -> Optional[str]:
+    """
+    Return the encoding to read a file with if its header looks like text, or None for binary data.
+    UTF-8 (and BOM-marked UTF-16) is detected exactly; other mostly-printable 8-bit data is read as latin-1.
+    """
+    if header.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if header.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    if b"\x00" in header or header.startswith(BINARY_SIGNATURES):
+        return None
+    try:
+        # The header may end in the middle of a multi-byte character
+        codecs.getincrementaldecoder("utf-8")().decode(header, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    control_bytes = sum(1 for byte in header if byte < 32 and byte not in (9, 10, 12, 13, 27))
+    return "latin-1" if control_bytes <= len(header) * 0.05 else None
+
+def classify_header(header: bytes) -> Optional[tuple[str, str]]:
+    """
+    Classify a file from its header.
+    Returns ("image", mime_type), ("pdf", "application/pdf"), ("text", encoding), or None for other binary files.
+    """
+    if header.startswith(PDF_SIGNATURE):
+        return "pdf", "application/pdf"
+    mime_type = detect_image_mime_type(header)
+    if mime_type:
+        return "image", mime_type
+    encoding = detect_text_encoding(header)
+    if encoding:
+        return "text", encoding
+    return None
+
+def classify_file(file_path: str) -> Optional[tuple[str, str]]:
+    """Classify a file by reading its header once. Returns None for unreadable or unsupported binary files."""
+    try:
+        return classify_header(read_header(file_path))
+    except OSError:
+        return None
@@ -0,0 +1,108 @@
+import base64
+import contextvars
+import hashlib
+import io
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import config
+from response_cache import load_cache_entry, save_cache_entry
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+DEFAULT_IMAGE_MAX_EDGE = 1568
+DEFAULT_IMAGE_QUALITY = 85
+# Images at or below this size in an accepted format are sent as is
+SMALL_IMAGE_BYTES = 256 * 1024
+# Formats vision APIs accept directly; everything else is re-encoded
+ACCEPTED_MIME_TYPES = ("image/png", "image/jpeg", "image/gif", "image/webp")
+IMAGE_CACHE_NAMESPACE = "images"
+# Prepared images kept in memory; older ones are reloaded from the disk cache when needed again
+MAX_PREPARED_IMAGES = 256
+
+# (max edge, quality) for this run; context-local so runs served side by side by `sumsnap serve` keep their own
+_settings: contextvars.ContextVar[tuple[int, int]] = contextvars.ContextVar(
+    "image_settings", default=(DEFAULT_IMAGE_MAX_EDGE, DEFAULT_IMAGE_QUALITY)
+)
+_prepared: Dict[str, Dict[str, str]] = {}
+_prepared_lock = threading.Lock()
+
+def set_image_settings(max_edge: Optional[int] = None):
+    """
+    Configure image preparation for this run from the CLI option, the config file or the defaults.
+    A max edge of 0 disables resizing.
+    """
+    max_edge = config.resolve_int_setting(max_edge, "IMAGE_MAX_EDGE", DEFAULT_IMAGE_MAX_EDGE, minimum=0)
+    quality = min(95, config.resolve_int_setting(None, "IMAGE_QUALITY", DEFAULT_IMAGE_QUALITY, minimum=30))
+    _settings.set((max_edge, quality))
+
+def _has_alpha(img: "Image.Image") -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+
+def prepare_pil_image(img: "Image.Image", max_edge: Optional[int] = None, quality: Optional[int] = None) -> tuple[bytes, str]:
+    """Downscale an image so its longest edge is at most max_edge, and encode it as JPEG (or PNG if it has transparency)."""
+    from PIL import Image
+    max_edge = _settings.get()[0] if max_edge is None else max_edge
+    quality = _settings.get()[1] if quality is None else quality
+    if max_edge and max(img.size) > max_edge:
+        img = img.copy()
+        img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    if _has_alpha(img):
+        img.save(buf, format="PNG", optimize=True)
+        return buf.getvalue(), "image/png"
+    img.convert("RGB").save(buf, format="JPEG", quality=quality, optimize=True)
+    return buf.getvalue(), "image/jpeg"
+
+def prepare_image_bytes(data: bytes, mime_type: str, max_edge: int, quality: int) -> tuple[bytes, str]:
+    """
+    Shrink an image for upload. Small images in accepted formats and animated images are kept as is,
+    and the original is kept whenever re-encoding wouldn't make it smaller.
+    """
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as img:
+        needs_resize = bool(max_edge) and max(img.size) > max_edge
+        accepted = mime_type in ACCEPTED_MIME_TYPES
+        if getattr(img, "is_animated", False) and accepted:
+            return data, mime_type
+        if not needs_resize and accepted and len(data) <= SMALL_IMAGE_BYTES:
+            return data, mime_type
+        img.load()
+        prepared_data, prepared_mime_type = prepare_pil_image(img, max_edge, quality)
+    if accepted and not needs_resize and len(prepared_data) >= len(data):
+        return data, mime_type
+    return prepared_data, prepared_mime_type
+
+def prepare_image(image_path: str, name: str, mime_type: str) -> Dict[str, Any]:
+    """
+    Load, shrink and base64-encode an image for a request.
+    Returns {'path', 'base64', 'mime_type', 'sha256'}, where sha256 identifies the original file content.
+    Prepared images are reused within the run and cached on disk between runs.
+    """
+    with open(image_path, "rb") as f:
+        data = f.read()
+    content_hash = hashlib.sha256(data).hexdigest()
+    max_edge, quality = _settings.get()
+    prepared_key = hashlib.sha256(f"{content_hash}\0{max_edge}\0{quality}".encode("ascii")).hexdigest()
+
+    with _prepared_lock:
+        prepared = _prepared.get(prepared_key)
+    if prepared is None:
+        entry = load_cache_entry(prepared_key, IMAGE_CACHE_NAMESPACE)
+        if entry and isinstance(entry.get("base64"), str) and isinstance(entry.get("mime_type"), str):
+            prepared = {"base64": entry["base64"], "mime_type": entry["mime_type"]}
+        else:
+            prepared_data, prepared_mime_type = prepare_image_bytes(data, mime_type, max_edge, quality)
+            prepared = {"base64": base64.b64encode(prepared_data).decode("utf-8"), "mime_type": prepared_mime_type}
+            save_cache_entry(prepared_key, prepared, IMAGE_CACHE_NAMESPACE)
+        with _prepared_lock:
+            _prepared[prepared_key] = prepared
+            while len(_prepared) > MAX_PREPARED_IMAGES:
+                del _prepared[next(iter(_prepared))]
+
+    return {
+        "path": name,
+        "base64": prepared["base64"],
+        "mime_type": prepared["mime_type"],
+        "sha256": content_hash,
+    }
@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List
+
+STORE_DIR_NAME = ".sumsnap"
+STORE_FILE_NAME = "summaries.json"
+STORE_VERSION = 1
+
+def get_store_path(project_path: str) -> str:
+    """Return the path of the project-local summary store."""
+    return os.path.join(project_path, STORE_DIR_NAME, STORE_FILE_NAME)
+
+def settings_fingerprint(model: str, detailed: bool, skeleton: bool = False, omit_generated: bool = False) -> str:
+    """Fingerprint of the settings that affect per-file summaries; a change invalidates the whole store."""
+    # Stores written without skeleton mode, and with every file sent as-is, keep their fingerprint
+    settings = f"{STORE_VERSION}\0{model}\0{detailed}" + ("\0skeleton" if skeleton else "") + ("\0omit-generated" if omit_generated else "")
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+def load_summary_store(project_path: str, fingerprint: str) -> Dict[str, Any]:
+    """
+    Load the summary store for a project. Returns an empty store if it doesn't exist,
+    can't be parsed, or was produced with different settings.
+    """
+    empty_store = {"version": STORE_VERSION, "settings": fingerprint, "files": {}, "directories": {}}
+    try:
+        with open(get_store_path(project_path), "r", encoding="utf-8") as f:
+            store = json.load(f)
+    except (OSError, ValueError):
+        return empty_store
+    if not isinstance(store, dict) or store.get("version") != STORE_VERSION or store.get("settings") != fingerprint:
+        return empty_store
+    store.setdefault("files", {})
+    store.setdefault("directories", {})
+    return store
+
+def save_summary_store(project_path: str, store: Dict[str, Any]):
+    """Atomically write the summary store into the project directory."""
+    store_path = get_store_path(project_path)
+    tmp_path = f"{store_path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(store_path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(store, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, store_path)
+    except OSError as e:
+        raise RuntimeError(f"Failed to save summary store: {e}")
+
+def hash_file(file_path: str) -> str:
+    """Return the SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_summaries(summaries: List[str]) -> str:
+    """Return a hash identifying an ordered list of summaries, used to detect changed reduce inputs."""
+    digest = hashlib.sha256()
+    for summary_text in summaries:
+        digest.update(summary_text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def group_key(relative_path: str) -> str:
+    """Group a project-relative path by its top-level directory ('.' for files in the project root)."""
+    parts = relative_path.replace(os.sep, "/").split("/")
+    return parts[0] if len(parts) > 1 else "."
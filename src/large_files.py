@@ -0,0 +1,143 @@
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+from chunking import CHARS_PER_TOKEN
+
+SAMPLE_STRATEGIES = ("full", "head", "head-tail", "stratified")
+DEFAULT_SAMPLE_TOKENS = 50000
+# Windows spread across the file by the stratified strategy (fewer if the budget is small)
+STRATIFIED_WINDOWS = 8
+MIN_WINDOW_TOKENS = 500
+# Text is decoded and handed to the chunker in blocks of about this size, ending at a line break;
+# smaller than a chunk, so blocks are packed into chunks rather than split
+BLOCK_BYTES = 16 * 1024
+# A window that ends in the middle of a line is extended to its end, unless the line is longer than this
+MAX_LINE_EXTENSION_BYTES = 64 * 1024
+# Files above this many estimated tokens get a hint to use --sample when read in full
+LARGE_FILE_TOKENS = 1_000_000
+
+@contextmanager
+def _mapped(file_path: str) -> Iterator[Optional[mmap.mmap]]:
+    """Memory-map a file read-only. Yields None for an empty file, which can't be mapped."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            # Pages are read once, front to back within each window
+            if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapped
+        finally:
+            mapped.close()
+
+def _line_start(mapped: mmap.mmap, offset: int) -> int:
+    """The offset of the first line that starts at or after offset."""
+    if offset <= 0:
+        return 0
+    newline = mapped.find(b"\n", offset - 1, offset - 1 + MAX_LINE_EXTENSION_BYTES)
+    return offset if newline < 0 else newline + 1
+
+def _iter_blocks(mapped: mmap.mmap, start: int, end: int, encoding: str) -> Iterator[str]:
+    """Decode the bytes from start to end in blocks that end at line breaks. Only one block is held in memory."""
+    position = start
+    while position < end:
+        cut = min(position + BLOCK_BYTES, end)
+        if cut < end:
+            newline = mapped.rfind(b"\n", position, cut)
+            if newline > position:
+                cut = newline + 1
+        yield mapped[position:cut].decode(encoding, errors="replace")
+        position = cut
+
+def _is_ascii_compatible(encoding: str) -> bool:
+    # Lines of UTF-16 text can't be found by searching for a newline byte
+    return not encoding.lower().replace("_", "-").startswith(("utf-16", "utf-32"))
+
+def _sample_windows(size: int, strategy: str, sample_tokens: int) -> List[Tuple[int, int]]:
+    """Byte ranges to read for a sampling strategy, before they are aligned to line breaks."""
+    budget = sample_tokens * CHARS_PER_TOKEN
+    if strategy == "full" or budget >= size:
+        return [(0, size)]
+    if strategy == "head":
+        return [(0, budget)]
+    if strategy == "head-tail":
+        return [(0, budget // 2), (size - budget // 2, size)]
+    window_count = max(2, min(STRATIFIED_WINDOWS, sample_tokens // MIN_WINDOW_TOKENS))
+    window_size = budget // window_count
+    stride = (size - window_size) / (window_count - 1)
+    return [(int(index * stride), int(index * stride) + window_size) for index in range(window_count)]
+
+def _format_size(size: int) -> str:
+    for unit in ("bytes", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def describe_sample(file_name: str, strategy: str, windows: List[Tuple[int, int]], size: int) -> str:
+    """A note for the summary on which parts of a sampled file it covers."""
+    sampled = sum(end - start for start, end in windows)
+    positions = ", ".join(f"{start / size:.1%}" for start, _ in windows)
+    return (
+        f"This summary is based on a {strategy} sample of {file_name}: {_format_size(sampled)} of {_format_size(size)} "
+        f"(about {sampled // CHARS_PER_TOKEN:,} of {size // CHARS_PER_TOKEN:,} tokens) in {len(windows)} window(s) starting at {positions} of the file."
+    )
+
+def iter_file_sections(
+    file_path: str,
+    encoding: str,
+    strategy: str = "full",
+    sample_tokens: int = DEFAULT_SAMPLE_TOKENS
+) -> Tuple[Iterator[str], Optional[str]]:
+    """
+    Read a text file for chunking without loading it whole: the file is memory-mapped and decoded in
+    blocks of whole lines, so memory use doesn't grow with its size. With a strategy other than
+    "full", only windows of about sample_tokens tokens in total are read: the start of the file
+    ("head"), its start and end ("head-tail"), or evenly spaced windows across it ("stratified").
+    Each window starts with a '# FILE:' header saying where it is from.
+    Returns the text sections (for iter_chunks) and a note describing the sample, or None if the whole file is read.
+    """
+    size = os.path.getsize(file_path)
+    file_name = os.path.basename(file_path)
+    windows = _sample_windows(size, strategy, sample_tokens)
+    is_sampled = windows != [(0, size)]
+
+    if not _is_ascii_compatible(encoding):
+        # Lines can't be found without decoding, so only the start of the file can be sampled
+        limit = sample_tokens * CHARS_PER_TOKEN if is_sampled else None
+
+        def decoded_sections() -> Iterator[str]:
+            with open(file_path, "r", encoding=encoding, errors="replace", newline="") as f:
+                header = f"# FILE: {file_name} (first {sample_tokens:,} tokens)\n\n" if limit else ""
+                read_chars = 0
+                while limit is None or read_chars < limit:
+                    block = f.read(BLOCK_BYTES if limit is None else min(BLOCK_BYTES, limit - read_chars))
+                    if not block:
+                        return
+                    read_chars += len(block)
+                    yield header + block
+                    header = ""
+
+        return decoded_sections(), describe_sample(file_name, "head", [(0, min(size, limit))], size) if limit else None
+
+    def mapped_sections() -> Iterator[str]:
+        with _mapped(file_path) as mapped:
+            if mapped is None:
+                return
+            previous_end = 0
+            for index, (start, end) in enumerate(windows):
+                # Windows are aligned to whole lines, and never repeat a line of the previous window
+                start = max(previous_end, _line_start(mapped, start))
+                end = min(size, _line_start(mapped, end))
+                if start >= end:
+                    continue
+                previous_end = end
+                header = f"\n\n# FILE: {file_name} (sample {index + 1} of {len(windows)}, starting at {start / size:.1%} of the file)\n\n" if is_sampled else ""
+                for block in _iter_blocks(mapped, start, end, encoding):
+                    yield header + block
+                    header = ""
+
+    return mapped_sections(), describe_sample(file_name, strategy, windows, size) if is_sampled else None
@@ -1,7 +1,8 @@
 import typer
 
 from config import init_config
-from config_commands import set_ai_model, set_api_endpoint, set_api_key, setup
+from config_commands import config_set, set_ai_model, set_api_endpoint, set_api_key, set_concurrency, setup
+from serve_command import serve
 from summary_command import summary
 
 init_config()
@@ -9,10 +10,13 @@ init_config()
 app = typer.Typer()
 
 app.command("summary")(summary)
+app.command("serve")(serve)
 app.command("setup")(setup)
 app.command("set-api-endpoint")(set_api_endpoint)
 app.command("set-api-key")(set_api_key)
 app.command("set-ai-model")(set_ai_model)
+app.command("set-concurrency")(set_concurrency)
+app.command("config-set")(config_set)
 
 @app.command()
 def version():
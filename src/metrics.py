@@ -0,0 +1,184 @@
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+from rich.console import Console
+from rich.table import Table
+
+# Order in which phases are reported
+PHASES = ["scan", "classify", "read", "chunk", "map", "reduce", "format", "update"]
+
+_lock = threading.Lock()
+_local = threading.local()
+
+def _new_run() -> Dict[str, Any]:
+    return {"phase_times": {}, "phase_calls": {}, "requests": [], "started_at": time.perf_counter()}
+
+# Context-local so summaries running side by side attribute their requests to their own phase,
+# and runs served side by side by `sumsnap serve` keep their own metrics.
+# Worker threads inherit both through contextvars.copy_context().
+_current_request_phase: contextvars.ContextVar[str] = contextvars.ContextVar("request_phase", default="map")
+_current_run: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("metrics_run", default=_new_run())
+
+def reset():
+    """Start recording a new run in the current context: clear all metrics and restart the wall clock."""
+    _current_run.set(_new_run())
+
+def _add_time(name: str, seconds: float):
+    run = _current_run.get()
+    with _lock:
+        run["phase_times"][name] = run["phase_times"].get(name, 0.0) + seconds
+        run["phase_calls"][name] = run["phase_calls"].get(name, 0) + 1
+
+@contextmanager
+def timed(name: str):
+    """
+    Add the time spent in the block to the named phase.
+    Timers nest per thread and only count exclusive time, so a step that pulls from
+    another timed step (like chunking pulling from reading) isn't counted twice.
+    """
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        child_time = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        _add_time(name, elapsed - child_time)
+
+def timed_iter(name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+    """Yield from iterable, adding the time spent producing each item to the named phase."""
+    iterator = iter(iterable)
+    while True:
+        with timed(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+@contextmanager
+def phase(name: str):
+    """Time a top-level request phase (map, reduce, format, update); requests made inside are attributed to it."""
+    token = _current_request_phase.set(name)
+    try:
+        with timed(name):
+            yield
+    finally:
+        _current_request_phase.reset(token)
+
+def record_request(
+    latency: float,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    payload_bytes: int = 0,
+    cached: bool = False,
+    retries: int = 0
+):
+    """Record one summarization request (or cache hit)."""
+    run = _current_run.get()
+    with _lock:
+        run["requests"].append({
+            "phase": _current_request_phase.get(),
+            "latency": latency,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "payload_bytes": payload_bytes,
+            "cached": cached,
+            "retries": retries,
+        })
+
+def get_report() -> Dict[str, Any]:
+    """Return all metrics as a JSON-serializable dict."""
+    run = _current_run.get()
+    with _lock:
+        requests = list(run["requests"])
+        phase_times = dict(run["phase_times"])
+        phase_calls = dict(run["phase_calls"])
+        wall_time = time.perf_counter() - run["started_at"]
+
+    ordered_phases = [name for name in PHASES if name in phase_times or any(r["phase"] == name for r in requests)]
+    ordered_phases += sorted(set(phase_times) - set(ordered_phases))
+    phases = {}
+    for name in ordered_phases:
+        phase_requests = [r for r in requests if r["phase"] == name]
+        sent_requests = [r for r in phase_requests if not r["cached"]]
+        latencies = [r["latency"] for r in sent_requests]
+        phases[name] = {
+            "seconds": round(phase_times.get(name, 0.0), 4),
+            "calls": phase_calls.get(name, 0),
+            "requests": len(sent_requests),
+            "cache_hits": len(phase_requests) - len(sent_requests),
+            "latency_avg": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+            "latency_max": round(max(latencies), 4) if latencies else 0.0,
+            "prompt_tokens": sum(r["prompt_tokens"] for r in phase_requests),
+            "completion_tokens": sum(r["completion_tokens"] for r in phase_requests),
+            "payload_bytes": sum(r["payload_bytes"] for r in sent_requests),
+            "retries": sum(r["retries"] for r in phase_requests),
+        }
+    return {
+        "wall_seconds": round(wall_time, 4),
+        "requests": sum(p["requests"] for p in phases.values()),
+        "cache_hits": sum(p["cache_hits"] for p in phases.values()),
+        "prompt_tokens": sum(p["prompt_tokens"] for p in phases.values()),
+        "completion_tokens": sum(p["completion_tokens"] for p in phases.values()),
+        "payload_bytes": sum(p["payload_bytes"] for p in phases.values()),
+        "retries": sum(p["retries"] for p in phases.values()),
+        "phases": phases,
+        "request_log": requests,
+    }
+
+def print_report(console: Console, report: Optional[Dict[str, Any]] = None):
+    """Print the metrics as a Rich table."""
+    report = report or get_report()
+    table = Table(title="sumsnap run statistics", title_justify="left")
+    table.add_column("Phase")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Requests", justify="right")
+    table.add_column("Cache hits", justify="right")
+    table.add_column("Avg / max latency (s)", justify="right")
+    table.add_column("Prompt tokens", justify="right")
+    table.add_column("Completion tokens", justify="right")
+    table.add_column("Payload (KB)", justify="right")
+    table.add_column("Retries", justify="right")
+    for name, stats in report["phases"].items():
+        table.add_row(
+            name,
+            f"{stats['seconds']:.2f}",
+            str(stats["requests"]),
+            str(stats["cache_hits"]),
+            f"{stats['latency_avg']:.2f} / {stats['latency_max']:.2f}" if stats["requests"] else "-",
+            str(stats["prompt_tokens"]),
+            str(stats["completion_tokens"]),
+            f"{stats['payload_bytes'] / 1024:.1f}",
+            str(stats["retries"]),
+        )
+    table.add_row(
+        "[bold]total[/bold]",
+        f"[bold]{report['wall_seconds']:.2f}[/bold]",
+        str(report["requests"]),
+        str(report["cache_hits"]),
+        "",
+        str(report["prompt_tokens"]),
+        str(report["completion_tokens"]),
+        f"{report['payload_bytes'] / 1024:.1f}",
+        str(report["retries"]),
+    )
+    console.print(table)
+    console.print("[dim]Phase times are summed across worker threads and targets; the total is wall-clock time.[/dim]")
+
+def write_report_json(file_path: str, report: Optional[Dict[str, Any]] = None):
+    """Write the metrics to a JSON file."""
+    report = report or get_report()
+    try:
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        raise RuntimeError(f"Failed to write metrics: {e}")
@@ -0,0 +1,113 @@
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+# Headings that start a section; deeper headings stay inside the section they belong to
+SECTION_HEADING_PATTERN = re.compile(r"^ {0,3}(#{1,2})[ \t]+(.+?)[ \t#]*$")
+FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+# Characters of each section shown to the model when it plans which sections to change
+MAX_PLAN_SECTION_CHARS = 6000
+
+def split_sections(markdown: str) -> List[Dict[str, Any]]:
+    """
+    Split a markdown document at its level 1 and 2 headings (outside fenced code blocks).
+    Returns dicts with "title" (the heading text, "" for anything before the first heading),
+    "level" (0 for that preamble) and "text" (the section, heading line included).
+    Joining the texts with join_sections() gives back the document unchanged.
+    """
+    sections: List[Dict[str, Any]] = [{"title": "", "level": 0, "text": ""}]
+    fence = None
+    for line in markdown.splitlines(keepends=True):
+        fence_match = FENCE_PATTERN.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+        heading_match = SECTION_HEADING_PATTERN.match(line.rstrip("\r\n")) if fence is None and not fence_match else None
+        if heading_match:
+            sections.append({"title": heading_match.group(2), "level": len(heading_match.group(1)), "text": line})
+        else:
+            sections[-1]["text"] += line
+    if not sections[0]["text"]:
+        sections.pop(0)
+    return sections
+
+def join_sections(sections: List[Dict[str, Any]]) -> str:
+    return "".join(section["text"] for section in sections)
+
+def format_sections_for_plan(sections: List[Dict[str, Any]]) -> str:
+    """Number the sections of a README for the planning request, shortening very long ones."""
+    parts = []
+    for number, section in enumerate(sections, start=1):
+        text = section["text"].strip()
+        if len(text) > MAX_PLAN_SECTION_CHARS:
+            text = text[:MAX_PLAN_SECTION_CHARS] + "\n[... rest of section omitted ...]"
+        parts.append(f"[SECTION {number}]\n{text}")
+    return "\n\n".join(parts)
+
+def parse_update_plan(response: str, section_count: int) -> Tuple[List[int], List[Dict[str, Any]]]:
+    """
+    Parse the planning response: a JSON object {"update": [section numbers], "add": [{"after": number,
+    "title": heading, "about": description}]}. Returns the 0-based indices of the sections to rewrite and
+    the sections to add, with "after" as a 0-based index (-1 for the start of the document).
+    Raises ValueError if the response isn't a valid plan.
+    """
+    start, end = response.find("{"), response.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("no JSON object in the response")
+    plan = json.loads(response[start:end + 1])
+    if not isinstance(plan, dict):
+        raise ValueError("the plan is not a JSON object")
+    update_indices = []
+    for number in plan.get("update") or []:
+        if not isinstance(number, int) or not 1 <= number <= section_count:
+            raise ValueError(f"unknown section number {number!r}")
+        if number - 1 not in update_indices:
+            update_indices.append(number - 1)
+    new_sections = []
+    for entry in plan.get("add") or []:
+        if not isinstance(entry, dict) or not str(entry.get("title") or "").strip():
+            raise ValueError(f"invalid new section {entry!r}")
+        after = entry.get("after", section_count)
+        if not isinstance(after, int) or not 0 <= after <= section_count:
+            raise ValueError(f"unknown section number {after!r}")
+        new_sections.append({"after": after - 1, "title": str(entry["title"]).strip(), "about": str(entry.get("about") or "")})
+    return sorted(update_indices), new_sections
+
+def replace_section_text(section: Dict[str, Any], new_text: str) -> str:
+    """
+    Normalize a rewritten section: it keeps the original heading line if the model dropped it,
+    and the original trailing blank lines, so the document's spacing doesn't change.
+    """
+    heading_line = section["text"].splitlines()[0] if section["level"] else ""
+    body = new_text.strip("\n")
+    if heading_line and not body.lstrip().startswith("#"):
+        body = f"{heading_line}\n\n{body}"
+    trailing = section["text"][len(section["text"].rstrip("\r\n")):] or "\n"
+    return body + trailing
+
+def splice_sections(
+    sections: List[Dict[str, Any]],
+    updated_texts: Dict[int, str],
+    added: List[Tuple[int, str]]
+) -> str:
+    """
+    Rebuild the document from its sections, with updated_texts (section index -> new text) replacing
+    sections and added ((index of the section to insert after, -1 for the start), text) inserted.
+    Unchanged sections are kept byte for byte.
+    """
+    inserted: Dict[int, List[str]] = {}
+    for after, text in added:
+        inserted.setdefault(after, []).append(text.strip("\n") + "\n\n")
+    parts = inserted.get(-1, [])
+    for index, section in enumerate(sections):
+        text = updated_texts.get(index, section["text"])
+        if index in inserted and not text.endswith("\n\n"):
+            # Keep a blank line between this section and the one inserted after it
+            text = text.rstrip("\r\n") + "\n\n"
+        parts.append(text)
+        parts.extend(inserted.get(index, []))
+    document = "".join(parts)
+    return document.rstrip("\n") + "\n" if document.strip() else document
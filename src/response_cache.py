@@ -0,0 +1,171 @@
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import config
+
+CACHE_DIR_PATH = config.CONFIG_DIR_PATH / "cache"
+DEFAULT_CACHE_MAX_MB = 200
+# Estimated cache size and time of the last full scan, so runs only scan the cache when it may be over its cap
+PRUNE_STATE_PATH = CACHE_DIR_PATH / "prune_state.json"
+# Entries written or removed by other means are picked up by a full scan at least this often
+PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+
+def _new_mode(read_enabled: bool = True, write_enabled: bool = True) -> Dict[str, Any]:
+    return {"read": read_enabled, "write": write_enabled, "stats": {"hits": 0, "misses": 0, "writes": 0}}
+
+# Context-local, so runs served side by side by `sumsnap serve` keep their own mode and counters
+_mode: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("cache_mode", default=_new_mode())
+_stats_lock = threading.Lock()
+# Bytes of cache entries written by this process since the prune state was last updated
+_written_bytes = 0
+
+def set_cache_mode(use_cache: bool = True, refresh: bool = False):
+    """
+    Configure the cache for this run.
+    use_cache=False disables both lookups and writes; refresh=True skips lookups but stores fresh responses.
+    """
+    _mode.set(_new_mode(use_cache and not refresh, use_cache))
+
+def make_cache_key(
+    api_endpoint: str,
+    model: str,
+    system_prompt: str,
+    text: str,
+    images: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    """
+    Build a content hash from everything that determines the model's response. The endpoint is
+    included because providers and proxies may serve different models under the same name.
+    """
+    digest = hashlib.sha256()
+    for part in ((api_endpoint or "").rstrip("/"), model, system_prompt, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    for image_data in images or []:
+        digest.update(hashlib.sha256(image_data["base64"].encode("ascii")).digest())
+    return digest.hexdigest()
+
+def _cache_file(key: str, namespace: Optional[str] = None):
+    return CACHE_DIR_PATH / (namespace or key[:2]) / f"{key}.json"
+
+def load_cache_entry(key: str, namespace: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Load a raw cache entry, or None if it is missing or lookups are disabled. Doesn't count towards the stats."""
+    if not _mode.get()["read"]:
+        return None
+    cache_file = _cache_file(key, namespace)
+    try:
+        with cache_file.open("r", encoding="utf-8") as f:
+            entry = json.load(f)
+        # Touch the entry so eviction drops the least recently used entries first
+        os.utime(cache_file)
+    except (OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+def save_cache_entry(key: str, entry: Dict[str, Any], namespace: Optional[str] = None) -> bool:
+    """Atomically write a raw cache entry. Returns False if writes are disabled or failed."""
+    if not _mode.get()["write"]:
+        return False
+    global _written_bytes
+    cache_file = _cache_file(key, namespace)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_file.open("w", encoding="utf-8") as f:
+            json.dump(entry, f)
+            written = f.tell()
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        return False
+    with _stats_lock:
+        _written_bytes += written
+    return True
+
+def get_cached_response(key: str) -> Optional[str]:
+    """Return the cached response for key, or None on a miss."""
+    mode = _mode.get()
+    if not mode["read"]:
+        return None
+    entry = load_cache_entry(key)
+    content = entry.get("content") if entry else None
+    with _stats_lock:
+        mode["stats"]["hits" if isinstance(content, str) else "misses"] += 1
+    return content if isinstance(content, str) else None
+
+def store_response(key: str, content: str):
+    """Store a response in the cache. Write failures are ignored."""
+    if save_cache_entry(key, {"content": content}):
+        with _stats_lock:
+            _mode.get()["stats"]["writes"] += 1
+
+def _load_prune_state() -> Optional[Dict[str, float]]:
+    try:
+        with PRUNE_STATE_PATH.open("r", encoding="utf-8") as f:
+            state = json.load(f)
+        return {"size": float(state["size"]), "scanned_at": float(state["scanned_at"])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _save_prune_state(size: float, scanned_at: float):
+    tmp_path = PRUNE_STATE_PATH.with_name(f"{PRUNE_STATE_PATH.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump({"size": size, "scanned_at": scanned_at}, f)
+        os.replace(tmp_path, PRUNE_STATE_PATH)
+    except OSError:
+        pass
+
+def prune_cache(max_bytes: Optional[int] = None, force: bool = False) -> int:
+    """
+    Evict least recently used entries until the cache fits its size cap. Returns the number of evicted entries.
+    The cache directory is only scanned when the estimated size (from the last scan plus the entries
+    written since) exceeds the cap, the last scan is more than PRUNE_INTERVAL_SECONDS old, or force is set.
+    """
+    global _written_bytes
+    if max_bytes is None:
+        max_bytes = int(config.resolve_float_setting("CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB) * 1024 * 1024)
+    if not CACHE_DIR_PATH.is_dir():
+        return 0
+
+    with _stats_lock:
+        written, _written_bytes = _written_bytes, 0
+    state = _load_prune_state()
+    now = time.time()
+    if state and not force:
+        estimated_size = state["size"] + written
+        if estimated_size <= max_bytes and now - state["scanned_at"] < PRUNE_INTERVAL_SECONDS:
+            if written:
+                _save_prune_state(estimated_size, state["scanned_at"])
+            return 0
+
+    entries = []
+    total_size = 0
+    for cache_file in CACHE_DIR_PATH.glob("*/*.json"):
+        try:
+            stat = cache_file.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, cache_file))
+        total_size += stat.st_size
+
+    evicted = 0
+    for _, size, cache_file in sorted(entries, key=lambda entry: entry[0]):
+        if total_size <= max_bytes:
+            break
+        try:
+            cache_file.unlink()
+        except OSError:
+            continue
+        total_size -= size
+        evicted += 1
+    _save_prune_state(total_size, now)
+    return evicted
+
+def get_cache_stats() -> Dict[str, int]:
+    """Return hit/miss/write counters for this run."""
+    with _stats_lock:
+        return dict(_mode.get()["stats"])
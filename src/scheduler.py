@@ -0,0 +1,207 @@
+import email.utils
+import random
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+DEFAULT_MAX_RETRIES = 6
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+MAX_RETRY_AFTER_SECONDS = 300.0
+# Budgets refill continuously and hold at most this many seconds' worth: providers enforce per-minute
+# limits over much shorter intervals, so a minute's requests sent in one burst would still be throttled
+BUDGET_BURST_SECONDS = 1.0
+# Several requests throttled at once count as one signal to lower concurrency
+THROTTLE_COOLDOWN_SECONDS = 2.0
+# Status codes worth retrying besides 5xx: timeout, conflict and rate limit (the same set the OpenAI SDK retries)
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+
+T = TypeVar("T")
+
+class _Budget:
+    """A continuously refilling per-minute budget of requests or tokens."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * BUDGET_BURST_SECONDS)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float, now: float) -> float:
+        """Seconds until cost can be spent. Costs above the capacity only wait for a full budget and go into debt."""
+        self._refill(now)
+        needed = min(cost, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def spend(self, cost: float):
+        self.level -= cost
+
+_condition = threading.Condition()
+_max_concurrency = 4
+_concurrency = 4.0
+_in_flight = 0
+_paused_until = 0.0
+_last_throttle = 0.0
+_max_retries = DEFAULT_MAX_RETRIES
+_request_budget: Optional[_Budget] = None
+_token_budget: Optional[_Budget] = None
+_throttled_count = 0
+
+def _updated_budget(budget: Optional[_Budget], per_minute: float) -> Optional[_Budget]:
+    if per_minute <= 0:
+        return None
+    if budget is not None and budget.rate == per_minute / 60.0:
+        return budget
+    return _Budget(per_minute)
+
+def configure(
+    concurrency: int,
+    requests_per_minute: float = 0,
+    tokens_per_minute: float = 0,
+    max_retries: int = DEFAULT_MAX_RETRIES
+):
+    """
+    Set up request scheduling for this run. concurrency is the ceiling for requests in flight across
+    everything summarized in this process; the scheduler lowers it when the endpoint throttles and
+    raises it back as requests succeed. Per-minute budgets of 0 are unlimited.
+    Runs started while others are in flight (under `sumsnap serve`) share the same limits: requests
+    in flight, any Retry-After pause and budgets that didn't change are kept.
+    """
+    global _max_concurrency, _concurrency, _max_retries, _request_budget, _token_budget, _throttled_count
+    with _condition:
+        _max_concurrency = max(1, concurrency)
+        _concurrency = float(_max_concurrency) if not _in_flight else min(_concurrency, float(_max_concurrency))
+        _max_retries = max(0, max_retries)
+        _request_budget = _updated_budget(_request_budget, requests_per_minute)
+        _token_budget = _updated_budget(_token_budget, tokens_per_minute)
+        _throttled_count = 0
+        _condition.notify_all()
+
+def get_state() -> dict:
+    """Return the current concurrency limit and how often the endpoint throttled this run."""
+    with _condition:
+        return {"concurrency": int(_concurrency), "max_concurrency": _max_concurrency, "throttled": _throttled_count}
+
+def _acquire(estimated_tokens: int):
+    """Wait for a free request slot, the end of any Retry-After pause, and enough request and token budget."""
+    global _in_flight
+    with _condition:
+        while True:
+            now = time.monotonic()
+            wait = max(0.0, _paused_until - now)
+            if not wait and _in_flight >= max(1, int(_concurrency)):
+                _condition.wait()
+                continue
+            if not wait:
+                for budget, cost in ((_request_budget, 1), (_token_budget, estimated_tokens)):
+                    if budget is not None:
+                        wait = max(wait, budget.wait_time(cost, now))
+            if not wait:
+                break
+            _condition.wait(timeout=wait)
+        _in_flight += 1
+        if _request_budget is not None:
+            _request_budget.spend(1)
+        if _token_budget is not None:
+            _token_budget.spend(estimated_tokens)
+
+def _release():
+    global _in_flight
+    with _condition:
+        _in_flight -= 1
+        _condition.notify_all()
+
+def _on_success():
+    """Raise the concurrency limit by about one for every full round of successful requests."""
+    global _concurrency
+    with _condition:
+        if _concurrency < _max_concurrency:
+            _concurrency = min(float(_max_concurrency), _concurrency + 1.0 / _concurrency)
+            _condition.notify_all()
+
+def _on_throttled(retry_after: Optional[float]):
+    """Halve the concurrency limit, and pause all requests for Retry-After seconds if the endpoint asked for it."""
+    global _concurrency, _paused_until, _last_throttle, _throttled_count
+    with _condition:
+        now = time.monotonic()
+        _throttled_count += 1
+        if now - _last_throttle >= THROTTLE_COOLDOWN_SECONDS:
+            _concurrency = max(1.0, _concurrency / 2)
+            _last_throttle = now
+        if retry_after:
+            _paused_until = max(_paused_until, now + retry_after)
+
+def record_token_usage(estimated_tokens: int, actual_tokens: int):
+    """Correct the token budget once a response reports how many tokens the request actually used."""
+    with _condition:
+        if _token_budget is not None and actual_tokens:
+            _token_budget.spend(actual_tokens - estimated_tokens)
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """Read the delay an error response asks for from its retry-after-ms or Retry-After header."""
+    if headers is None:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            return min(MAX_RETRY_AFTER_SECONDS, max(0.0, float(retry_after_ms) / 1000))
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            # Retry-After may also be an HTTP date
+            retry_date = email.utils.parsedate_to_datetime(retry_after)
+            seconds = retry_date.timestamp() - time.time()
+        return min(MAX_RETRY_AFTER_SECONDS, max(0.0, seconds))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+def retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    Return how long to wait before retrying a failed request, or None if the error isn't worth retrying.
+    Rate limits also lower the concurrency limit and honor Retry-After.
+    """
+    import openai
+
+    status_code = getattr(error, "status_code", None)
+    if isinstance(error, openai.APIConnectionError):
+        retry_after = None
+    elif isinstance(error, openai.APIStatusError) and (status_code in RETRYABLE_STATUS_CODES or status_code >= 500):
+        retry_after = parse_retry_after(getattr(error.response, "headers", None))
+        if status_code == 429:
+            _on_throttled(retry_after)
+    else:
+        return None
+    if retry_after is not None:
+        # A little jitter keeps requests paused by the same Retry-After from all retrying at once
+        return retry_after + random.uniform(0, min(1.0, retry_after * 0.1 + 0.1))
+    backoff = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+def run_request(send: Callable[[], T], estimated_tokens: int = 0) -> Tuple[T, int]:
+    """
+    Send a request through the scheduler: wait for a slot and budget, call send(), and retry
+    rate limits, server errors and connection failures with backoff. Returns (result, retries).
+    """
+    attempt = 0
+    while True:
+        _acquire(estimated_tokens)
+        try:
+            result = send()
+        except Exception as e:
+            delay = retry_delay(e, attempt) if attempt < _max_retries else None
+            if delay is None:
+                raise
+        else:
+            _on_success()
+            return result, attempt
+        finally:
+            _release()
+        time.sleep(delay)
+        attempt += 1
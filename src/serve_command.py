@@ -0,0 +1,311 @@
+import hmac
+import io
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import typer
+from rich.console import Console
+import config
+import summary_command
+from ai_client import close_clients, warm_up_client
+
+# http.client and http.server are imported where they are used, so they don't slow down other commands
+if TYPE_CHECKING:
+    import http.client
+
+DEFAULT_SERVE_PORT = 8737
+DEFAULT_MAX_JOBS = 4
+# Seconds a client waits for the connection to the server; the job itself may take as long as it needs
+CONNECT_TIMEOUT = 2.0
+# Summary options holding paths, which the client makes absolute because the server runs in another directory
+PATH_PARAMS = ("manifest", "results_jsonl", "update_readme_path", "metrics_json")
+# Secret every job must carry, so only the user who started the server (who can read this file) can submit jobs
+TOKEN_FILE_PATH = config.CONFIG_DIR_PATH / "serve_token"
+TOKEN_HEADER = "X-Sumsnap-Token"
+# Addresses that listen on every interface; the Host header can't be checked against them
+WILDCARD_HOSTS = ("", "0.0.0.0", "::")
+
+console = Console()
+
+def load_server_token(create: bool = False) -> Optional[str]:
+    """
+    Read the server token from the config folder. With create, a new random token is written
+    (readable only by the current user) if there is none yet. Returns None if there is no token.
+    """
+    try:
+        token = TOKEN_FILE_PATH.read_text(encoding="utf-8").strip()
+    except OSError:
+        token = ""
+    if token or not create:
+        if token and create:
+            os.chmod(TOKEN_FILE_PATH, 0o600)
+        return token or None
+    import secrets
+
+    token = secrets.token_hex(32)
+    config.CONFIG_DIR_PATH.mkdir(parents=True, exist_ok=True)
+    fd = os.open(TOKEN_FILE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+def _connect(address: str) -> "http.client.HTTPConnection":
+    """Open a connection to a server address: HOST:PORT, http://HOST:PORT or unix:/path/to/socket."""
+    import http.client
+    import socket
+
+    if address.startswith("unix:"):
+        socket_path = address[len("unix:"):]
+
+        class UnixHTTPConnection(http.client.HTTPConnection):
+            def connect(self):
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.settimeout(self.timeout)
+                self.sock.connect(socket_path)
+
+        connection: http.client.HTTPConnection = UnixHTTPConnection("localhost", timeout=CONNECT_TIMEOUT)
+    else:
+        host, _, port = address.split("://", 1)[-1].rstrip("/").rpartition(":")
+        connection = http.client.HTTPConnection(host or "127.0.0.1", int(port), timeout=CONNECT_TIMEOUT)
+    connection.connect()
+    connection.sock.settimeout(None)
+    return connection
+
+def run_on_server(address: str, params: Dict[str, Any], width: int) -> Optional[int]:
+    """
+    Run `sumsnap summary` with the given parameters on a `sumsnap serve` server and print its output.
+    Returns the exit code, or None if the server can't be reached. Raises RuntimeError if the server rejects the job.
+    """
+    import http.client
+
+    params = dict(params)
+    params["paths"] = [os.path.abspath(path) for path in params.get("paths") or []]
+    for key in PATH_PARAMS:
+        if params.get(key):
+            params[key] = os.path.abspath(params[key])
+    try:
+        connection = _connect(address)
+    except (OSError, ValueError):
+        return None
+    headers = {"Content-Type": "application/json", TOKEN_HEADER: load_server_token() or ""}
+    try:
+        connection.request("POST", "/summary", json.dumps({"params": params, "width": width}), headers)
+        response = connection.getresponse()
+        payload = json.loads(response.read())
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        raise RuntimeError(f"The sumsnap server at {address} failed: {e}")
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"The sumsnap server at {address} rejected the job: {payload.get('error', response.reason)}")
+    summary_command.console.file.write(payload["output"])
+    summary_command.console.file.flush()
+    return int(payload["exit_code"])
+
+class SummaryServer:
+    """
+    Runs summary jobs for clients in this process, so the SDK import, pooled client, parsed config,
+    compiled .gitignore files and prepared images stay warm between jobs. Up to max_jobs jobs run at
+    once, each with its own console, metrics and cache settings; they share one request scheduler.
+    """
+
+    def __init__(self, max_jobs: int):
+        self.job_slots = threading.BoundedSemaphore(max_jobs)
+        self.active_jobs = 0
+        self.completed_jobs = 0
+        self.lock = threading.Lock()
+        self.config_stamp = self._config_stamp()
+        self.summary_command = typer.main.get_command(self._summary_app())
+
+    @staticmethod
+    def _summary_app() -> typer.Typer:
+        app = typer.Typer()
+        app.command()(summary_command.summary)
+        return app
+
+    @staticmethod
+    def _config_stamp() -> Optional[tuple[int, int]]:
+        try:
+            stat_result = os.stat(config.CONFIG_FILE_PATH)
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def default_params(self) -> Dict[str, Any]:
+        """The summary parameters of a run without any arguments."""
+        with self.summary_command.make_context("summary", [], resilient_parsing=True) as ctx:
+            return dict(ctx.params)
+
+    def run_job(self, params: Dict[str, Any], width: int) -> tuple[int, str]:
+        """Run one summary with the client's parameters and return its exit code and console output."""
+        # Pick up changes made with `sumsnap setup` or `config-set` since the last job
+        stamp = self._config_stamp()
+        if stamp != self.config_stamp:
+            config.reload_config()
+            self.config_stamp = stamp
+
+        defaults = self.default_params()
+        unknown = sorted(set(params) - set(defaults))
+        if unknown:
+            raise ValueError(f"Unknown summary parameter(s): {', '.join(unknown)}")
+        if params.get("watch"):
+            raise ValueError("--watch never finishes, so it can't run on the server")
+        # Never forward to another server, and never render a live view into the captured output
+        job_params = {**defaults, **params, "server": "", "stream": False, "watch": False}
+
+        output = io.StringIO()
+        summary_command.set_run_console(Console(file=output, width=width, force_terminal=False))
+        try:
+            summary_command.summary(**job_params)
+            exit_code = 0
+        except typer.Exit as e:
+            exit_code = e.exit_code
+        except Exception as e:
+            summary_command.console.print(f"[bold red]Error: {e}[/bold red]")
+            exit_code = 1
+        finally:
+            summary_command.set_run_console(None)
+        return exit_code, output.getvalue()
+
+def _make_handler(server: SummaryServer, token: str, allowed_hosts: Optional[set]):
+    """
+    Build the request handler. Jobs must send the server token and a JSON body, so web pages (which can
+    send simple cross-origin POSTs but can't read the token) and other local users can't start them.
+    allowed_hosts (None: any) guards against DNS rebinding.
+    """
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status: int, body: Dict[str, Any]):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _host_allowed(self) -> bool:
+            if allowed_hosts is None or (self.headers.get("Host") or "").lower() in allowed_hosts:
+                return True
+            self._send_json(403, {"error": "Unexpected Host header"})
+            return False
+
+        def do_GET(self):
+            if not self._host_allowed():
+                return
+            if self.path.rstrip("/") != "/health":
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            with server.lock:
+                self._send_json(200, {"status": "ok", "active_jobs": server.active_jobs, "completed_jobs": server.completed_jobs})
+
+        def do_POST(self):
+            if not self._host_allowed():
+                return
+            if self.path.rstrip("/") != "/summary":
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, "").encode("utf-8"), token.encode("utf-8")):
+                self._send_json(401, {"error": f"Missing or invalid server token (see {TOKEN_FILE_PATH})"})
+                return
+            if self.headers.get_content_type() != "application/json":
+                self._send_json(415, {"error": "Jobs must be sent as application/json"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                params = request["params"]
+                width = int(request.get("width") or 100)
+                if not isinstance(params, dict):
+                    raise ValueError("params must be an object")
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": f"Invalid request: {e}"})
+                return
+
+            started = time.perf_counter()
+            with server.job_slots:
+                with server.lock:
+                    server.active_jobs += 1
+                try:
+                    exit_code, output = server.run_job(params, width)
+                except ValueError as e:
+                    self._send_json(400, {"error": str(e)})
+                    return
+                finally:
+                    with server.lock:
+                        server.active_jobs -= 1
+                        server.completed_jobs += 1
+            console.print(
+                f"[dim]{time.strftime('%H:%M:%S')} summary {' '.join(params.get('paths') or [])} "
+                f"-> exit code {exit_code} in {time.perf_counter() - started:.2f}s[/dim]"
+            )
+            self._send_json(200, {"exit_code": exit_code, "output": output})
+
+    return Handler
+
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on. Only expose it to machines you trust: clients can summarize any path the server can read."),
+    port: int = typer.Option(DEFAULT_SERVE_PORT, "--port", help="TCP port to listen on."),
+    socket_path: Optional[str] = typer.Option(None, "--socket", help="Listen on this Unix socket instead of a TCP port."),
+    max_jobs: int = typer.Option(DEFAULT_MAX_JOBS, "--max-jobs", min=1, help="Maximum number of summaries run at the same time; further jobs wait."),
+):
+    """
+    Run a local server that keeps sumsnap warm and runs `sumsnap summary --server ADDRESS` jobs,
+    for low-latency editor and CI integration.
+    """
+    import socketserver
+    from http.server import ThreadingHTTPServer
+
+    class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    summary_server = SummaryServer(max_jobs)
+    token = load_server_token(create=True)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        handler = _make_handler(summary_server, token, {"localhost"})
+        # Only the current user may connect; the socket is created with these permissions, not changed after bind
+        previous_umask = os.umask(0o177)
+        try:
+            httpd: socketserver.BaseServer = UnixHTTPServer(socket_path, handler)
+        finally:
+            os.umask(previous_umask)
+        address = f"unix:{socket_path}"
+    else:
+        allowed_hosts = None if host in WILDCARD_HOSTS else {
+            f"{name}:{port}" for name in ("localhost", "127.0.0.1", "[::1]", host.lower() if ":" not in host else f"[{host.lower()}]")
+        }
+        handler = _make_handler(summary_server, token, allowed_hosts)
+        try:
+            httpd = ThreadingHTTPServer((host, port), handler)
+        except OSError as e:
+            console.print(f"[bold red]Could not listen on {host}:{port}: {e}[/bold red]")
+            raise typer.Exit(code=1)
+        httpd.daemon_threads = True
+        address = f"{host}:{port}"
+
+    # Import the SDK and open a connection now rather than during the first job
+    try:
+        api_key, api_endpoint, _ = summary_command.load_api_config()
+        warm_up_client(api_key, api_endpoint)
+    except RuntimeError as e:
+        console.print(f"[yellow]Warning: {e}[/yellow]")
+
+    console.print(f"[green]sumsnap server listening on {address}[/green]")
+    console.print(f"Run [bold]sumsnap summary --server {address} PATH[/bold], or set it as the SERVER config value.")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        close_clients()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
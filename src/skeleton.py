@@ -0,0 +1,113 @@
+import ast
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+# A skeleton builder turns source code into its outline, or returns None if it can't parse it
+SkeletonBuilder = Callable[[str], Optional[str]]
+
+MAX_DOCSTRING_LINES = 8
+MAX_CONSTANT_CHARS = 80
+CONSTANT_NAME_PATTERN = re.compile(r"^(?:[A-Z][A-Z0-9_]*|__[a-z]+__)$")
+
+_builders: Dict[str, SkeletonBuilder] = {}
+
+def register_skeleton_builder(extensions: Iterable[str], builder: SkeletonBuilder):
+    """Use builder for files with any of the given extensions (e.g. ".py"), replacing an earlier one."""
+    for extension in extensions:
+        _builders[extension.lower()] = builder
+
+def build_skeleton(file_name: str, content: str) -> Optional[str]:
+    """
+    Return the outline of a source file (imports, signatures, docstrings and constants), or None if
+    there is no builder for its extension, it can't be parsed, or the outline wouldn't be shorter.
+    """
+    builder = _builders.get(os.path.splitext(file_name)[1].lower())
+    if builder is None:
+        return None
+    try:
+        skeleton = builder(content)
+    except Exception:
+        return None
+    if not skeleton or len(skeleton) >= len(content):
+        return None
+    return skeleton
+
+def _docstring_lines(node: ast.AST, indent: str) -> List[str]:
+    """The first paragraph of a node's docstring, as a quoted block."""
+    docstring = ast.get_docstring(node, clean=True) if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) else None
+    if not docstring:
+        return []
+    lines = docstring.split("\n\n", 1)[0].splitlines()[:MAX_DOCSTRING_LINES]
+    if len(lines) == 1:
+        return [f'{indent}"""{lines[0]}"""']
+    return [f'{indent}"""'] + [f"{indent}{line}" for line in lines] + [f'{indent}"""']
+
+def _short_source(node: ast.AST) -> str:
+    text = ast.unparse(node)
+    return text if len(text) <= MAX_CONSTANT_CHARS else text[:MAX_CONSTANT_CHARS - 3] + "..."
+
+def _function_lines(node: ast.AST, indent: str) -> List[str]:
+    lines = [f"{indent}@{ast.unparse(decorator)}" for decorator in node.decorator_list]
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    lines.append(f"{indent}{prefix} {node.name}({ast.unparse(node.args)}){returns}:")
+    # The body is left out; a docstring stands in for it where there is one
+    lines.extend(_docstring_lines(node, indent + "    ") or [f"{indent}    ..."])
+    return lines
+
+def _class_lines(node: ast.ClassDef, indent: str) -> List[str]:
+    lines = [f"{indent}@{ast.unparse(decorator)}" for decorator in node.decorator_list]
+    bases = [ast.unparse(base) for base in node.bases] + [ast.unparse(keyword) for keyword in node.keywords]
+    lines.append(f"{indent}class {node.name}({', '.join(bases)}):" if bases else f"{indent}class {node.name}:")
+    body = _docstring_lines(node, indent + "    ")
+    for child in node.body:
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            body.extend(_function_lines(child, indent + "    "))
+        elif isinstance(child, ast.ClassDef):
+            body.extend(_class_lines(child, indent + "    "))
+        elif isinstance(child, ast.AnnAssign) and isinstance(child.target, ast.Name):
+            # Annotated class attributes are the fields of dataclasses, NamedTuples and models
+            value = f" = {_short_source(child.value)}" if child.value else ""
+            body.append(f"{indent}    {child.target.id}: {ast.unparse(child.annotation)}{value}")
+        elif isinstance(child, ast.Assign) and all(isinstance(target, ast.Name) and CONSTANT_NAME_PATTERN.match(target.id) for target in child.targets):
+            body.append(f"{indent}    {' = '.join(target.id for target in child.targets)} = {_short_source(child.value)}")
+    lines.extend(body or [f"{indent}    ..."])
+    return lines
+
+def _is_main_guard(node: ast.AST) -> bool:
+    return isinstance(node, ast.If) and "__name__" in ast.unparse(node.test) and "__main__" in ast.unparse(node.test)
+
+def _module_lines(nodes: List[ast.stmt]) -> List[str]:
+    lines: List[str] = []
+    for node in nodes:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            lines.append(ast.unparse(node))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            lines.extend(["", *_function_lines(node, "")])
+        elif isinstance(node, ast.ClassDef):
+            lines.extend(["", *_class_lines(node, "")])
+        elif isinstance(node, ast.Assign) and all(isinstance(target, ast.Name) and CONSTANT_NAME_PATTERN.match(target.id) for target in node.targets):
+            lines.append(f"{' = '.join(target.id for target in node.targets)} = {_short_source(node.value)}")
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and CONSTANT_NAME_PATTERN.match(node.target.id):
+            value = f" = {_short_source(node.value)}" if node.value else ""
+            lines.append(f"{node.target.id}: {ast.unparse(node.annotation)}{value}")
+        elif _is_main_guard(node):
+            lines.extend(["", f"if {ast.unparse(node.test)}:", "    ..."])
+        elif isinstance(node, ast.If):
+            # Conditional imports and definitions, e.g. under TYPE_CHECKING or a version check
+            lines.extend(_module_lines(node.body + node.orelse))
+        elif isinstance(node, ast.Try):
+            lines.extend(_module_lines(node.body + [stmt for handler in node.handlers for stmt in handler.body] + node.orelse + node.finalbody))
+    return lines
+
+def python_skeleton(source: str) -> Optional[str]:
+    """Outline a Python module with the ast module: imports, constants, classes and function signatures with docstrings."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    lines = _docstring_lines(tree, "") + _module_lines(tree.body)
+    return "\n".join(lines).strip() + "\n"
+
+register_skeleton_builder([".py", ".pyi", ".pyw"], python_skeleton)
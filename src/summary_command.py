@@ -1,119 +1,126 @@
 import os
 import re
 import base64
-from typing import Optional, List, Dict, Any
+import contextvars
+import hashlib
+from contextlib import contextmanager
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Callable, Iterable, Iterator
 import typer
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
-import openai
-from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
-import chardet
-import pathspec # Assume pathspec is always available
-from PIL import Image
-import fitz  # PyMuPDF
 import config
+import metrics
+import scheduler
+from chunking import DEFAULT_CHUNK_TOKENS, chunk_text, estimate_tokens, get_chunk_token_budget, iter_chunks
+from config import resolve_float_setting, resolve_int_setting
+from ai_client import get_client, warm_up_client
+from file_selection import (
+    MIN_DUPLICATE_CHARS, describe_omitted_file, detect_generated_content, estimate_file_tokens, select_files, truncate_to_tokens
+)
+from file_types import classify_file, detect_image_mime_type, read_header
+from image_prep import prepare_image, prepare_pil_image, set_image_settings
+from incremental import (
+    group_key, hash_file, hash_summaries, load_summary_store, save_summary_store, settings_fingerprint
+)
+from large_files import DEFAULT_SAMPLE_TOKENS, LARGE_FILE_TOKENS, SAMPLE_STRATEGIES, iter_file_sections
+from readme_sections import format_sections_for_plan, parse_update_plan, replace_section_text, splice_sections, split_sections
+from skeleton import build_skeleton
+from response_cache import get_cache_stats, get_cached_response, make_cache_key, prune_cache, set_cache_mode, store_response
 
-console = Console()
+# PIL, PyMuPDF (fitz), pathspec, openai and Rich's Markdown renderer are imported where they are first
+# needed, so that commands which don't summarize anything (and shell completion) start quickly.
+if TYPE_CHECKING:
+    from PIL import Image
+
+class RunConsole:
+    """
+    Forwards to the console set with set_run_console() in the current context, or to the terminal.
+    `sumsnap serve` gives each job its own console so the output of jobs running side by side stays apart.
+    """
+
+    def __init__(self, default: Console):
+        self._default = default
+
+    def current(self) -> Console:
+        """The console of the current context, for Rich renderables (Live, Progress) that need a real Console."""
+        return _run_console.get() or self._default
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.current(), name)
+
+_run_console: contextvars.ContextVar[Optional[Console]] = contextvars.ContextVar("run_console", default=None)
+console = RunConsole(Console())
+
+def set_run_console(run_console: Optional[Console]):
+    """Send the output of runs in the current context (and the worker threads they start) to run_console."""
+    _run_console.set(run_console)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REDUCE_FAN_IN = 8
+DEFAULT_MAX_IMAGES_PER_REQUEST = 8
+DEFAULT_MAX_IMAGE_REQUEST_MB = 16
+# Rough token cost of one image, used to charge the tokens-per-minute budget before the response reports usage
+IMAGE_TOKEN_ESTIMATE = 765
+# Marks a '# FILE:' section that holds only the outline of a source file
+SKELETON_HEADER_SUFFIX = " (outline: imports, signatures, docstrings and constants only)"
+# Pages with fewer non-whitespace characters than this are treated as scanned and rasterized
+MIN_PDF_PAGE_TEXT_CHARS = 20
 
 def load_api_config():
     api_endpoint = config.get_config("AI_API_ENDPOINT")
     api_key = config.get_config("AI_API_KEY")
     model = config.get_config("AI_MODEL")
     if not api_key or not api_endpoint or not model:
-        raise RuntimeError("AI_API_KEY, AI_API_ENDPOINT, and AI_MODEL must be set in environment or .env file.")
+        raise RuntimeError("AI_API_KEY, AI_API_ENDPOINT, and AI_MODEL must be set with `sumsnap setup` or in the environment.")
     return api_key, api_endpoint, model
 
-def is_text_file(file_path: str, blocksize: int = 512) -> bool:
-    try:
-        with open(file_path, "rb") as f:
-            raw = f.read(blocksize)
-        result = chardet.detect(raw)
-        # Accept any encoding detected, or fallback to extension check
-        if result["encoding"]:
-            return True
-        # Fallback: treat common text file extensions as text
-        text_exts = (".md", ".txt", ".py", ".js", ".json", ".yaml", ".yml", ".ini", ".cfg", ".toml", ".csv", ".rst")
-        return file_path.lower().endswith(text_exts)
-    except Exception:
-        return False
+def resolve_concurrency(concurrency: Optional[int]) -> int:
+    """Resolve the number of parallel map requests from the CLI option, the config file or the default."""
+    return resolve_int_setting(concurrency, "CONCURRENCY", DEFAULT_CONCURRENCY)
 
-def read_text_file(file_path: str) -> str:
+def read_text_file(file_path: str, encoding: str = "utf-8") -> str:
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
+        with open(file_path, "r", encoding=encoding) as f:
             return f.read()
     except Exception:
         return ""
 
-def chunk_text(text: str, max_tokens: int = 2000) -> List[str]:
-    lines = text.splitlines()
-    chunks = []
-    chunk = []
-    count = 0
-    for line in lines:
-        count += len(line.split())
-        chunk.append(line)
-        if count >= max_tokens:
-            chunks.append("\n".join(chunk))
-            chunk = []
-            count = 0
-    if chunk:
-        chunks.append("\n".join(chunk))
-    return chunks
+def iter_parallel_map(fn: Callable[[Any], Any], items: Iterable[Any], workers: int) -> Iterator[Any]:
+    """
+    Yield fn(item) for every item in order, running up to `workers` calls in a thread pool.
+    Items are consumed lazily with a bounded read-ahead, so this works on generators.
+    """
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = []
+    try:
+        for item in items:
+            pending.append(executor.submit(contextvars.copy_context().run, fn, item))
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+        while pending:
+            yield pending.pop(0).result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
 
 def save_summary_to_file(summary_text: str, file_path: str):
+    """Write a summary atomically: readers (and an interrupted run) see either the old file or the complete new one."""
+    tmp_path = f"{file_path}.tmp"
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
+        with open(tmp_path, "w", encoding="utf-8") as f:
             f.write(summary_text)
+        os.replace(tmp_path, file_path)
     except Exception as e:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         raise RuntimeError(f"Failed to save summary: {e}")
 
-def _get_adjusted_gitignore_patterns(gitignore_abs_path: str, project_root_abs_path: str) -> List[str]:
-    """
-    Reads patterns from a .gitignore file and adjusts them to be relative to the project_root_abs_path.
-    """
-    adjusted_patterns = []
-    gitignore_dir_abs = os.path.dirname(gitignore_abs_path)
-
-    # Determine the prefix for patterns based on the .gitignore file's location
-    if gitignore_dir_abs == project_root_abs_path:
-        current_dir_prefix_for_patterns = ""
-    else:
-        current_dir_prefix_for_patterns = os.path.relpath(gitignore_dir_abs, project_root_abs_path).replace(os.sep, '/')
-        if current_dir_prefix_for_patterns == ".": # Should be covered by the equality check above
-            current_dir_prefix_for_patterns = ""
-
-    with open(gitignore_abs_path, "r", encoding="utf-8") as f_gi:
-        for line in f_gi:
-            pattern_text = line.strip()
-            if not pattern_text or pattern_text.startswith('#'):
-                continue
-
-            negation_prefix = "!" if pattern_text.startswith("!") else ""
-            if negation_prefix:
-                pattern_text = pattern_text[1:]
-            
-            # If pattern starts with '/', it's anchored to its .gitignore file's directory.
-            # Otherwise, it can match anywhere in or below that directory.
-            # Pathspec handles this if the pattern is correctly formed relative to the spec's root.
-            
-            if pattern_text.startswith('/'):
-                pattern_text = pattern_text[1:] # Remove leading slash, as prefix will anchor it
-
-            if current_dir_prefix_for_patterns:
-                # Prepend the directory prefix. Ensure no double slashes if pattern_text was empty.
-                # Pathspec expects forward slashes.
-                if pattern_text:
-                    full_pattern = f"{current_dir_prefix_for_patterns}/{pattern_text}"
-                else: # Pattern was just '/' or ' / '
-                    full_pattern = current_dir_prefix_for_patterns
-            else: # Pattern from .gitignore in project root
-                full_pattern = pattern_text
-
-            adjusted_patterns.append(negation_prefix + full_pattern)
-    return adjusted_patterns
-
 def summarize_chunk(
     chunk: str,
     api_key: str,
@@ -122,8 +129,13 @@ def summarize_chunk(
     detailed: bool,
     format_readme: bool, # Kept for consistency, as is_update=True implies README format
     is_update: bool = False,
-    images: Optional[List[Dict[str, Any]]] = None
+    images: Optional[List[Dict[str, Any]]] = None,
+    on_text: Optional[Callable[[str], None]] = None
 ) -> str:
+    """
+    Summarize a chunk of text (and images) with one request.
+    If on_text is given, the response is streamed and on_text is called with the text received so far after every update.
+    """
     if is_update:
         prompt = (
             "You are tasked with updating an existing README.md file. "
@@ -171,6 +183,21 @@ def summarize_chunk(
             prompt += " Also describe any provided images and their relevance."
         prompt += " Format as markdown. Do not wrap the entire response in a markdown code block unless the content itself is a code block."
 
+    return complete_prompt(prompt, chunk, api_key, api_endpoint, model, images, on_text)
+
+def complete_prompt(
+    prompt: str,
+    chunk: str,
+    api_key: str,
+    api_endpoint: str,
+    model: str,
+    images: Optional[List[Dict[str, Any]]] = None,
+    on_text: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Send one request with prompt as the system message and chunk (and images) as the user message,
+    through the response cache and the request scheduler. Streams to on_text if it is given.
+    """
     # Prepare the message content
     message_content = []
     
@@ -192,95 +219,684 @@ def summarize_chunk(
             })
 
     messages = [
-        ChatCompletionSystemMessageParam(role="system", content=prompt),
-        ChatCompletionUserMessageParam(role="user", content=message_content)
+        {"role": "system", "content": prompt},
+        {"role": "user", "content": message_content}
     ]
     
-    client = openai.OpenAI(api_key=api_key, base_url=api_endpoint)
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages
-    )
-    content = response.choices[0].message.content
-    if content is not None:
-        stripped_content = content.strip()
-        lines = stripped_content.splitlines()
-        
-        # Mitigate common issue: AI wrapping the entire response in a markdown code block.
-        if len(lines) >= 2:
-            first_line_trimmed = lines[0].strip()
-            last_line_trimmed = lines[-1].strip()
-
-            is_common_wrapper_start = (
-                first_line_trimmed == "```markdown" or 
-                first_line_trimmed == "```"
-            )
-            is_common_wrapper_end = (last_line_trimmed == "```")
+    cache_key = make_cache_key(api_endpoint, model, prompt, chunk, images)
+    cached_content = get_cached_response(cache_key)
+    if cached_content is not None:
+        metrics.record_request(0.0, cached=True)
+        return cached_content
 
-            if is_common_wrapper_start and is_common_wrapper_end:
-                if len(lines) > 2:
-                    return "\n".join(lines[1:-1]).strip()
-                else:
-                    # Handles cases like "```markdown\n```" (empty wrapped block).
-                    return "" 
-        
-        return stripped_content
+    client = get_client(api_key, api_endpoint)
+    # Base64 is ASCII, so its length is its size in bytes
+    payload_bytes = len(prompt.encode("utf-8")) + len(chunk.encode("utf-8")) + sum(len(image_data['base64']) for image_data in images or [])
+    estimated_tokens = estimate_tokens(prompt) + estimate_tokens(chunk) + IMAGE_TOKEN_ESTIMATE * len(images or [])
+    if on_text is not None:
+        content = stream_completion(client, model, messages, on_text, payload_bytes, estimated_tokens)
     else:
+        def send():
+            request_started = time.perf_counter()
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages
+            )
+            return response, time.perf_counter() - request_started
+
+        (response, latency), retries = scheduler.run_request(send, estimated_tokens)
+        prompt_tokens = response.usage.prompt_tokens if response.usage else 0
+        completion_tokens = response.usage.completion_tokens if response.usage else 0
+        scheduler.record_token_usage(estimated_tokens, prompt_tokens + completion_tokens)
+        metrics.record_request(
+            latency,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            payload_bytes=payload_bytes,
+            retries=retries
+        )
+        content = response.choices[0].message.content
+    if content is None:
         return ""
+    result = strip_markdown_wrapper(content)
+    store_response(cache_key, result)
+    return result
 
-def scan_project_files(project_path: str, exclude: Optional[List[str]] = None) -> tuple[List[str], List[str]]:
+def stream_completion(
+    client,
+    model: str,
+    messages: list,
+    on_text: Callable[[str], None],
+    payload_bytes: int,
+    estimated_tokens: int = 0
+) -> str:
+    """Send a streaming chat completion request, calling on_text with the text received so far, and return the full text."""
+    def send():
+        parts: List[str] = []
+        usage = None
+        request_started = time.perf_counter()
+        stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True
+        )
+        try:
+            for event in stream:
+                # Endpoints that report usage for streams send it on the last event
+                if getattr(event, "usage", None):
+                    usage = event.usage
+                if event.choices and event.choices[0].delta.content:
+                    parts.append(event.choices[0].delta.content)
+                    on_text("".join(parts))
+        except Exception as e:
+            # A retry would start over, so once text has been shown the failure is final
+            if parts:
+                raise RuntimeError(f"The response stream broke off after {len(''.join(parts))} characters: {e}") from e
+            raise
+        finally:
+            stream.close()
+        return "".join(parts), usage, time.perf_counter() - request_started
+
+    (content, usage, latency), retries = scheduler.run_request(send, estimated_tokens)
+    prompt_tokens = usage.prompt_tokens if usage else estimate_tokens(" ".join(str(message["content"]) for message in messages))
+    completion_tokens = usage.completion_tokens if usage else estimate_tokens(content)
+    scheduler.record_token_usage(estimated_tokens, prompt_tokens + completion_tokens)
+    metrics.record_request(
+        latency,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        payload_bytes=payload_bytes,
+        retries=retries
+    )
+    return content
+
+def visible_streamed_text(content: str) -> str:
     """
-    Scan project directory for text files and image files, excluding specified files/folders
-    and respecting .gitignore rules.
-    Returns tuple of (text_file_paths, image_file_paths)
+    Return the part of a partially received response that is safe to show, so it stays a prefix of
+    strip_markdown_wrapper(full response): a wrapping code fence is dropped as soon as it's recognized,
+    and a trailing line that may be the closing fence is held back until more text arrives.
     """
-    if exclude is None:
-        exclude_set = set()
-    else:
-        exclude_set = set(exclude)
+    first_newline = content.find("\n")
+    first_line = content if first_newline == -1 else content[:first_newline]
+    if first_line.strip().startswith("`"):
+        if first_newline == -1:
+            return ""
+        if first_line.strip() in ("```markdown", "```"):
+            content = content[first_newline + 1:]
+    content = content.rstrip()
+    last_newline = content.rfind("\n")
+    if content[last_newline + 1:].strip().startswith("`"):
+        content = content[:last_newline + 1]
+    return content.strip()
+
+@contextmanager
+def live_summary_view(progress: Progress, title: str, partial_file_path: Optional[str] = None) -> Iterator[Callable[[str], None]]:
+    """
+    Pause the progress display and render a streamed summary as it arrives.
+    If partial_file_path is given, the text is also appended to that file as it arrives.
+    Yields the on_text callback to pass to summarize_chunk.
+    """
+    from rich.live import Live
+    from rich.markdown import Markdown
+
+    partial_file = None
+    if partial_file_path:
+        try:
+            partial_file = open(partial_file_path, "w", encoding="utf-8")
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not write {partial_file_path}: {e}[/yellow]")
+    written = 0
+
+    def render(text: str) -> Panel:
+        # Only the most recent lines that fit on the screen are shown while streaming
+        lines = text.splitlines()[-max(5, console.size.height - 6):]
+        return Panel(Markdown("\n".join(lines)), title=title, border_style="none", padding=(1, 2))
+
+    progress.stop()
+    try:
+        with Live(render(""), console=console.current(), transient=True, refresh_per_second=8) as live:
+            def on_text(content: str):
+                nonlocal written
+                text = visible_streamed_text(content)
+                live.update(render(text))
+                if partial_file and len(text) > written:
+                    partial_file.write(text[written:])
+                    partial_file.flush()
+                    written = len(text)
+            yield on_text
+    finally:
+        if partial_file:
+            partial_file.close()
+        progress.start()
+
+def remove_partial_file(file_path: str):
+    """Remove the .partial file a streamed summary was written to, once the final output is saved."""
+    try:
+        os.remove(f"{file_path}.partial")
+    except OSError:
+        pass
+
+def strip_markdown_wrapper(content: str) -> str:
+    """Strip surrounding whitespace and a code fence wrapping the entire response, if present."""
+    stripped_content = content.strip()
+    lines = stripped_content.splitlines()
     
-    text_file_paths = []
-    image_file_paths = []
-    master_spec = None
+    # Mitigate common issue: AI wrapping the entire response in a markdown code block.
+    if len(lines) >= 2:
+        first_line_trimmed = lines[0].strip()
+        last_line_trimmed = lines[-1].strip()
+
+        is_common_wrapper_start = (
+            first_line_trimmed == "```markdown" or 
+            first_line_trimmed == "```"
+        )
+        is_common_wrapper_end = (last_line_trimmed == "```")
+
+        if is_common_wrapper_start and is_common_wrapper_end:
+            if len(lines) > 2:
+                return "\n".join(lines[1:-1]).strip()
+            else:
+                # Handles cases like "```markdown\n```" (empty wrapped block).
+                return "" 
     
-    all_patterns = []
-    # First pass: collect all patterns from all .gitignore files
-    for current_root, _, current_files in os.walk(project_path, topdown=True):
-        if ".gitignore" in current_files:
-            gitignore_file_abs = os.path.join(current_root, ".gitignore")
+    return stripped_content
+
+def summarize_chunks_concurrently(
+    chunks: Iterable[Any],
+    summarize_fn: Callable[[int, Any], str],
+    concurrency: int,
+    progress: Progress,
+    task_id,
+    description: str
+) -> List[str]:
+    """
+    Run summarize_fn(index, chunk) for every chunk using up to `concurrency` parallel requests.
+    Chunks may be a lazy iterator: requests start as soon as chunks are produced, and at most
+    2 * concurrency chunks are held in memory ahead of the running requests.
+    Results are returned in chunk order; progress is advanced as each chunk completes.
+    """
+    total = len(chunks) if isinstance(chunks, list) else None
+    results: List[str] = []
+    completed = 0
+    pending: Dict[Any, int] = {}
+
+    def collect(done_futures):
+        nonlocal completed
+        for future in done_futures:
+            results[pending.pop(future)] = future.result()
+            completed += 1
+            progress.update(task_id, description=f"{description} {completed}/{total if total is not None else len(results)}")
+            progress.advance(task_id)
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        for idx, chunk_item in enumerate(chunks):
+            results.append("")
+            # Requests are attributed to the caller's metrics phase
+            pending[executor.submit(contextvars.copy_context().run, summarize_fn, idx, chunk_item)] = idx
+            if total is None:
+                progress.update(task_id, total=len(results), description=f"{description} {completed}/{len(results)}")
+            if len(pending) >= concurrency * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    finally:
+        # On failure, don't start requests that are still queued
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
+
+def iter_image_batches(images: Iterable[Dict[str, Any]], max_images: int, max_bytes: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Group prepared images into request-sized batches of at most max_images images and max_bytes of base64 payload.
+    An image larger than max_bytes on its own is sent in a batch by itself.
+    """
+    batch: List[Dict[str, Any]] = []
+    batch_bytes = 0
+    for image in images:
+        image_bytes = len(image['base64'])
+        if batch and (len(batch) >= max_images or batch_bytes + image_bytes > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(image)
+        batch_bytes += image_bytes
+    if batch:
+        yield batch
+
+def group_for_reduce(summaries: List[str], fan_in: int, max_tokens: int) -> List[List[str]]:
+    """
+    Split summaries into consecutive groups of at most fan_in items whose combined size stays within max_tokens.
+    Every group except possibly the last holds at least two summaries, so each reduce level shrinks the list.
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for summary_text in summaries:
+        tokens = estimate_tokens(summary_text)
+        if current and (len(current) >= fan_in or (current_tokens + tokens > max_tokens and len(current) >= 2)):
+            groups.append(current)
+            current = []
+            current_tokens = 0
+        current.append(summary_text)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+def reduce_summaries(
+    summaries: List[str],
+    combine_fn: Callable[[str], str],
+    fan_in: int,
+    concurrency: int,
+    progress: Progress,
+    description: str = "[cyan]Combining summaries",
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    final_combine_fn: Optional[Callable[[str], str]] = None
+) -> str:
+    """
+    Combine summaries with a multi-level tree reduce instead of one request over all of them.
+    Each level combines groups of up to fan_in summaries in parallel, until a single summary remains.
+    The last combine uses final_combine_fn if given (e.g. to stream the final summary).
+    """
+    level_summaries = [summary_text for summary_text in summaries if summary_text.strip()]
+    if not level_summaries:
+        return ""
+    level = 1
+    with metrics.phase("reduce"):
+        while len(level_summaries) > 1:
+            groups = group_for_reduce(level_summaries, max(2, fan_in), max_tokens)
+            if len(groups) == 1 and final_combine_fn is not None:
+                level_summaries = [final_combine_fn("\n\n".join(groups[0]))]
+                break
+            reduce_task = progress.add_task(f"{description} (level {level}, {len(groups)} group(s))...", total=len(groups))
+            level_summaries = summarize_chunks_concurrently(
+                ["\n\n".join(group) for group in groups],
+                # A trailing single-item group needs no request; it is carried to the next level as is
+                lambda idx, combined_text: groups[idx][0] if len(groups[idx]) == 1 else combine_fn(combined_text),
+                concurrency, progress, reduce_task, f"{description} (level {level})"
+            )
+            progress.remove_task(reduce_task)
+            level += 1
+    return level_summaries[0]
+
+def update_readme_sections(
+    existing_readme: str,
+    new_content: str,
+    api_key: str,
+    api_endpoint: str,
+    model: str,
+    detailed: bool,
+    concurrency: int,
+    progress: Progress
+) -> Optional[str]:
+    """
+    Update a README section by section: one request plans which sections the new content affects,
+    only those are rewritten (in parallel, along with any new sections), and the result is spliced
+    together locally, so unchanged sections are kept byte for byte and aren't generated again.
+    Returns None if the README has no headings or the plan can't be used; the caller then updates the whole document.
+    """
+    sections = split_sections(existing_readme)
+    if not any(section["level"] for section in sections):
+        return None
+    outline = "\n".join(f"{'#' * section['level']} {section['title']}" for section in sections if section["level"])
+    new_content_text = f"NEW_CONTENT_TO_INTEGRATE_BEGINS:\n{new_content}\nNEW_CONTENT_TO_INTEGRATE_ENDS."
+
+    plan_prompt = (
+        "You maintain a project's README.md. You are given its sections, numbered, followed by new information about the project. "
+        "Decide which existing sections must change so the README reflects the new information, and which new sections are needed. "
+        "Only list a section if it is outdated, wrong or missing something important; sections that are still accurate must not be listed. "
+        "Respond with a JSON object only, and no other text: "
+        '{"update": [numbers of the sections to rewrite], "add": [{"after": number of the section to insert it after (0 for the top), '
+        '"title": "heading of the new section", "about": "what the new section should cover"}]}. '
+        "Use empty lists if nothing needs to change."
+    )
+    plan_task = progress.add_task("[cyan]Planning README update...", total=None)
+    with metrics.phase("update"):
+        plan_response = complete_prompt(
+            plan_prompt,
+            f"README_SECTIONS_BEGIN:\n{format_sections_for_plan(sections)}\nREADME_SECTIONS_END.\n\n{new_content_text}",
+            api_key, api_endpoint, model
+        )
+    progress.remove_task(plan_task)
+    try:
+        update_indices, new_sections = parse_update_plan(plan_response, len(sections))
+    except ValueError as e:
+        console.print(f"[yellow]Warning: Could not read the README update plan ({e}); updating the whole README instead.[/yellow]")
+        return None
+    if not update_indices and not new_sections:
+        console.print("[dim]Section update: the README is already up to date; no sections were changed.[/dim]")
+        return existing_readme
+
+    detail_instruction = " Be thorough and give in-depth explanations for a technical audience." if detailed else ""
+    rewrite_prompt = (
+        "You are updating one section of an existing README.md with new information about the project. "
+        f"The README has these sections:\n{outline}\n\n"
+        "Rewrite only the given section so it reflects the new information. Keep its heading line and structure, "
+        "and keep the wording of everything that is still accurate. Don't add content that belongs in the other sections."
+        f"{detail_instruction} Output only the updated section as raw markdown. Do not wrap the response in a markdown code block."
+    )
+
+    def add_prompt(title: str) -> str:
+        return (
+            "You are adding a new section to an existing README.md with new information about the project. "
+            f"The README has these sections:\n{outline}\n\n"
+            f"Write the section described below, starting with the heading line '## {title}'. "
+            "Don't repeat content that belongs in the other sections."
+            f"{detail_instruction} Output only the section as raw markdown. Do not wrap the response in a markdown code block."
+        )
+
+    tasks: List[tuple[str, Any]] = [("update", index) for index in update_indices] + [("add", entry) for entry in new_sections]
+
+    def write_section(idx: int, task: tuple[str, Any]) -> str:
+        kind, item = task
+        if kind == "update":
+            section_text = f"SECTION_BEGINS:\n{sections[item]['text'].strip()}\nSECTION_ENDS."
+            return complete_prompt(rewrite_prompt, f"{section_text}\n\n{new_content_text}", api_key, api_endpoint, model)
+        section_text = f"NEW_SECTION_TITLE: {item['title']}\nNEW_SECTION_COVERS: {item['about']}"
+        return complete_prompt(add_prompt(item["title"]), f"{section_text}\n\n{new_content_text}", api_key, api_endpoint, model)
+
+    section_task = progress.add_task("[cyan]Updating README sections...", total=len(tasks))
+    with metrics.phase("update"):
+        texts = summarize_chunks_concurrently(tasks, write_section, concurrency, progress, section_task, "[cyan]Updating README section")
+    progress.remove_task(section_task)
+
+    updated_texts: Dict[int, str] = {}
+    added: List[tuple[int, str]] = []
+    for (kind, item), text in zip(tasks, texts):
+        # An empty response keeps the section as it was
+        if not text.strip():
+            continue
+        if kind == "update":
+            updated_texts[item] = replace_section_text(sections[item], text)
+        else:
+            added.append((item["after"], text if text.lstrip().startswith("#") else f"## {item['title']}\n\n{text}"))
+    console.print(
+        f"[dim]Section update: rewrote {len(updated_texts)} of {len(sections)} section(s) and added {len(added)}; "
+        f"the rest were kept verbatim.[/dim]"
+    )
+    return splice_sections(sections, updated_texts, added)
+
+def summarize_project_incrementally(
+    project_path: str,
+    text_file_paths: List[str],
+    image_file_paths: List[str],
+    api_key: str,
+    api_endpoint: str,
+    model: str,
+    detailed: bool,
+    concurrency: int,
+    fan_in: int,
+    progress: Progress,
+    final_combine_fn: Optional[Callable[[str], str]] = None,
+    token_limits: Optional[Dict[str, Optional[int]]] = None,
+    omit_generated: bool = False,
+    skeleton: bool = False,
+    encodings: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Summarize a project from per-file summaries kept in the project's summary store.
+    Only added or changed files are re-summarized, and only top-level directories whose
+    file summaries changed are re-combined before the final combine.
+    Files with a limit in token_limits are truncated to that many tokens before summarizing.
+    With omit_generated, duplicates of another file and minified or generated files get a one-line
+    summary without a request. With skeleton, source files are summarized from their outline.
+    Text files are read with their encoding in encodings (as detected by classify_file), or as UTF-8.
+    """
+    token_limits = token_limits or {}
+    encodings = encodings or {}
+    def summarize(text: str, images: Optional[List[Dict[str, Any]]] = None) -> str:
+        return summarize_chunk(text, api_key, api_endpoint, model, detailed, False, is_update=False, images=images)
+
+    def relative(file_path: str) -> str:
+        return os.path.relpath(file_path, project_path).replace(os.sep, '/')
+
+    chunk_tokens = get_chunk_token_budget(model)
+
+    store = load_summary_store(project_path, settings_fingerprint(model, detailed, skeleton, omit_generated))
+    previous_files = store["files"]
+    current_files: Dict[str, Dict[str, str]] = {}
+    changed_file_paths: List[str] = []
+
+    file_paths = text_file_paths + image_file_paths
+    first_path_by_hash: Dict[str, str] = {}
+    duplicate_count = 0
+    hash_task = progress.add_task("[cyan]Checking for changed files...", total=len(file_paths))
+    for file_path_item in file_paths:
+        relative_path = relative(file_path_item)
+        previous_entry = previous_files.get(relative_path)
+        try:
+            stat_result = os.stat(file_path_item)
+            file_stat = [stat_result.st_mtime_ns, stat_result.st_size]
+            # Files whose modification time and size are unchanged aren't read again
+            if previous_entry and previous_entry.get("stat") == file_stat and previous_entry.get("sha256"):
+                file_hash = previous_entry["sha256"]
+            else:
+                file_hash = hash_file(file_path_item)
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not read {relative_path}: {e}[/yellow]")
+            progress.advance(hash_task)
+            continue
+        is_duplicate_candidate = omit_generated and stat_result.st_size >= MIN_DUPLICATE_CHARS
+        original_path = first_path_by_hash.setdefault(file_hash, relative_path) if is_duplicate_candidate else relative_path
+        # A file truncated to a different length, or a duplicate of a different file, needs a new summary
+        content_hash = file_hash
+        if token_limits.get(file_path_item):
+            content_hash += f":{token_limits[file_path_item]}"
+        if original_path != relative_path:
+            content_hash += f"|duplicate:{original_path}"
+            duplicate_count += 1
+        if previous_entry and previous_entry.get("hash") == content_hash:
+            current_files[relative_path] = dict(previous_entry, stat=file_stat, sha256=file_hash)
+        elif original_path != relative_path:
+            current_files[relative_path] = {"hash": content_hash, "summary": f"[Identical to {original_path}]", "stat": file_stat, "sha256": file_hash}
+        else:
+            current_files[relative_path] = {"hash": content_hash, "summary": "", "stat": file_stat, "sha256": file_hash}
+            changed_file_paths.append(file_path_item)
+        progress.advance(hash_task)
+    progress.remove_task(hash_task)
+    removed_count = len([p for p in previous_files if p not in current_files])
+
+    image_path_set = set(image_file_paths)
+    # Files that couldn't be processed are left out of the store, so they are tried again next run
+    failed_paths: List[str] = []
+
+    def summarize_file(idx: int, file_path_item: str) -> str:
+        relative_path = relative(file_path_item)
+        if file_path_item in image_path_set:
             try:
-                all_patterns.extend(_get_adjusted_gitignore_patterns(gitignore_file_abs, project_path))
+                image = prepare_image(file_path_item, relative_path, get_image_mime_type(file_path_item))
             except Exception as e:
-                console.print(f"[yellow]Warning: Could not parse .gitignore file at {gitignore_file_abs}: {e}[/yellow]")
+                console.print(f"[yellow]Warning: Could not process image {file_path_item}: {e}[/yellow]")
+                failed_paths.append(file_path_item)
+                return ""
+            return summarize(f"# IMAGE: {relative_path}\n\nAnalyze and describe this image.", images=[image])
+        with metrics.timed("read"):
+            content = read_text_file(file_path_item, encodings.get(file_path_item, "utf-8"))
+        if not content and os.path.getsize(file_path_item):
+            console.print(f"[yellow]Warning: Could not read {relative_path}[/yellow]")
+            failed_paths.append(file_path_item)
+            return ""
+        if omit_generated and content.strip():
+            reason = detect_generated_content(os.path.basename(file_path_item), content)
+            if reason:
+                return describe_omitted_file(reason, content)
+        header = f"# FILE: {relative_path}"
+        outline = build_skeleton(file_path_item, content) if skeleton else None
+        if outline:
+            content = outline
+            header += SKELETON_HEADER_SUFFIX
+        if token_limits.get(file_path_item):
+            content = truncate_to_tokens(content, token_limits[file_path_item])
+        if not content.strip():
+            return ""
+        chunks = chunk_text(f"{header}\n\n{content}", chunk_tokens)
+        if len(chunks) <= 1:
+            return summarize(chunks[0]) if chunks else ""
+        # A large file's chunks share the scheduler's concurrency limit with the other files
+        chunks_task = progress.add_task(f"[cyan]Summarizing {relative_path}...", total=len(chunks))
+        file_summaries = summarize_chunks_concurrently(
+            chunks, lambda chunk_idx, chunk_item: summarize(chunk_item), concurrency, progress, chunks_task, f"[cyan]Summarizing {relative_path} chunk"
+        )
+        progress.remove_task(chunks_task)
+        return reduce_summaries(
+            file_summaries, summarize, fan_in, concurrency, progress, f"[cyan]Combining {relative_path} summaries", chunk_tokens
+        )
+
+    if changed_file_paths:
+        files_task = progress.add_task(f"[cyan]Summarizing {len(changed_file_paths)} changed file(s)...", total=len(changed_file_paths))
+        with metrics.phase("map"):
+            changed_summaries = summarize_chunks_concurrently(
+                changed_file_paths, summarize_file, concurrency, progress, files_task, "[cyan]Summarizing changed file"
+            )
+        progress.remove_task(files_task)
+        for file_path_item, file_summary in zip(changed_file_paths, changed_summaries):
+            current_files[relative(file_path_item)]["summary"] = file_summary
+        for file_path_item in failed_paths:
+            current_files.pop(relative(file_path_item), None)
+    store["files"] = current_files
+
+    # Re-combine only the directories whose file summaries changed
+    groups: Dict[str, List[str]] = {}
+    for relative_path in sorted(current_files):
+        if current_files[relative_path]["summary"].strip():
+            groups.setdefault(group_key(relative_path), []).append(
+                f"## {relative_path}\n\n{current_files[relative_path]['summary']}"
+            )
+    previous_directories = store["directories"]
+    current_directories: Dict[str, Dict[str, str]] = {}
+    stale_groups: List[str] = []
+    for group, group_summaries in groups.items():
+        inputs_hash = hash_summaries(group_summaries)
+        previous_entry = previous_directories.get(group)
+        if previous_entry and previous_entry.get("hash") == inputs_hash:
+            current_directories[group] = previous_entry
+        else:
+            current_directories[group] = {"hash": inputs_hash, "summary": ""}
+            stale_groups.append(group)
+
+    # Directories are combined one after another; each combine runs its own levels in parallel
+    for group in stale_groups:
+        current_directories[group]["summary"] = reduce_summaries(
+            groups[group], summarize, fan_in, concurrency, progress, f"[cyan]Combining {group} summaries", chunk_tokens
+        )
+    store["directories"] = current_directories
 
-    if all_patterns:
-        # Pathspec's from_lines handles the order of patterns for negation correctly.
-        master_spec = pathspec.PathSpec.from_lines('gitwildmatch', all_patterns)
+    try:
+        save_summary_store(project_path, store)
+    except RuntimeError as e:
+        console.print(f"[yellow]Warning: {e}[/yellow]")
+    console.print(
+        f"[dim]Incremental: {len(changed_file_paths)} changed, {len(current_files) + len(failed_paths) - len(changed_file_paths)} unchanged, "
+        f"{removed_count} removed file(s), {duplicate_count} duplicate(s); "
+        f"{len(stale_groups)}/{len(groups)} directory summaries recomputed.[/dim]"
+    )
+
+    directory_summaries = [current_directories[group]["summary"] for group in sorted(groups)]
+    return reduce_summaries(
+        directory_summaries, summarize, fan_in, concurrency, progress, "[cyan]Combining directory summaries", chunk_tokens, final_combine_fn
+    )
+
+# Compiled .gitignore patterns by path, with the (mtime, size) they were compiled from
+_gitignore_cache: Dict[str, tuple[tuple[int, int], List[Any]]] = {}
+_gitignore_lock = threading.Lock()
 
-    for root, dirs, files in os.walk(project_path, topdown=True):
-        if master_spec:
+def _is_gitignored(matchers: List[tuple[str, List[Any]]], relative_path: str, is_dir: bool) -> bool:
+    """
+    Check a project-relative path against the .gitignore files of its ancestor directories.
+    Deeper .gitignore files take precedence, and within one file the last matching pattern wins.
+    """
+    for base_prefix, patterns in reversed(matchers):
+        path_in_base = relative_path[len(base_prefix):]
+        if is_dir:
             # To match directories, pathspec expects them to end with a slash
-            dirs[:] = [
-                d for d in dirs 
-                if not master_spec.match_file(
-                    os.path.relpath(os.path.join(root, d), project_path).replace(os.sep, '/') + '/'
-                )
-            ]
-
-        dirs[:] = [
-            d for d in dirs
-            if not d.startswith('.') and 
-               not (d.startswith('__') and d.endswith('__')) and
-               d not in exclude_set
-        ]
-        
-        for file in files:
-            file_abs_path = os.path.join(root, file)
-            
-            if master_spec:
-                path_to_check_for_gitignore = os.path.relpath(file_abs_path, project_path).replace(os.sep, '/')
-                if master_spec.match_file(path_to_check_for_gitignore):
+            path_in_base += "/"
+        for pattern in reversed(patterns):
+            if pattern.include is not None and pattern.match_file(path_in_base) is not None:
+                return bool(pattern.include)
+    return False
+
+def load_gitignore_patterns(gitignore_path: str, stat_result: os.stat_result) -> List[Any]:
+    """
+    Compile a .gitignore file, reusing the patterns compiled earlier in this process while the file is unchanged.
+    Raises OSError or the pathspec error if the file can't be read or parsed.
+    """
+    import pathspec
+
+    stamp = (stat_result.st_mtime_ns, stat_result.st_size)
+    with _gitignore_lock:
+        cached = _gitignore_cache.get(gitignore_path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with open(gitignore_path, "r", encoding="utf-8") as f_gi:
+        patterns = list(pathspec.PathSpec.from_lines('gitwildmatch', f_gi).patterns)
+    with _gitignore_lock:
+        _gitignore_cache[gitignore_path] = (stamp, patterns)
+    return patterns
+
+def iter_candidate_files(
+    project_path: str,
+    exclude: Optional[List[str]] = None,
+    directories: Optional[List[str]] = None
+) -> Iterator[str]:
+    """
+    Walk a project directory and yield every file that isn't excluded by name, --exclude or .gitignore rules.
+    The tree is walked once: each directory's .gitignore is compiled when the directory is entered
+    and applies to everything below it, and ignored directories are never entered.
+    If directories is given, every directory that is entered is appended to it.
+    """
+    if exclude is None:
+        exclude_set = set()
+    else:
+        exclude_set = set(exclude)
+
+    # Each entry: (directory path, its path relative to the project root with a trailing slash, active matchers)
+    pending_dirs: List[tuple[str, str, List[tuple[str, List[Any]]]]] = [(project_path, "", [])]
+    while pending_dirs:
+        dir_path, relative_prefix, matchers = pending_dirs.pop()
+        try:
+            with os.scandir(dir_path) as scanned:
+                entries = sorted(scanned, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        if directories is not None:
+            directories.append(dir_path)
+
+        for entry in entries:
+            if entry.name == ".gitignore" and entry.is_file():
+                try:
+                    matchers = matchers + [(relative_prefix, load_gitignore_patterns(entry.path, entry.stat()))]
+                except Exception as e:
+                    console.print(f"[yellow]Warning: Could not parse .gitignore file at {entry.path}: {e}[/yellow]")
+                break
+
+        sub_dirs = []
+        for entry in entries:
+            file = entry.name
+            relative_path = relative_prefix + file
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir:
+                if (
+                    file.startswith('.') or
+                    (file.startswith('__') and file.endswith('__')) or
+                    file in exclude_set or
+                    relative_path in exclude_set or
+                    (matchers and _is_gitignored(matchers, relative_path, True))
+                ):
                     continue
+                sub_dirs.append((entry.path, relative_path + "/", matchers))
+                continue
+
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
 
             lower_file = file.lower()
             if (
@@ -292,38 +908,92 @@ def scan_project_files(project_path: str, exclude: Optional[List[str]] = None) -
                 lower_file.startswith('licence') or
                 lower_file.startswith('copying') or
                 lower_file.startswith('readme') or 
-                file in exclude_set
+                file in exclude_set or
+                relative_path in exclude_set
             ):
                 continue
-            
-            # First check if it's a valid image file using PIL detection
-            if is_image_file(file_abs_path) and validate_image_file(file_abs_path):
-                image_file_paths.append(file_abs_path)
-            elif is_text_file(file_abs_path):
-                text_file_paths.append(file_abs_path)
-                
+            if matchers and _is_gitignored(matchers, relative_path, False):
+                continue
+            yield entry.path
+
+        # Depth-first, in name order
+        pending_dirs.extend(reversed(sub_dirs))
+
+def iter_project_files(project_path: str, exclude: Optional[List[str]] = None, workers: int = 8) -> Iterator[tuple[str, str, str]]:
+    """
+    Yield ("text", file_path, encoding) or ("image", file_path, mime_type) for every supported project file.
+    Each file's header is read once, on a thread pool, to classify it by magic bytes.
+    Files are yielded in walk order as soon as they are classified, so reading can start before the walk finishes.
+    """
+    def classify(file_path: str):
+        with metrics.timed("classify"):
+            return file_path, classify_file(file_path)
+
+    candidates = metrics.timed_iter("scan", iter_candidate_files(project_path, exclude))
+    for file_path, classification in iter_parallel_map(classify, candidates, workers):
+        if classification is None:
+            continue
+        kind, detail = classification
+        # PDFs are only supported as single-file input
+        if kind in ("text", "image"):
+            yield kind, file_path, detail
+
+def scan_project_files(project_path: str, exclude: Optional[List[str]] = None) -> tuple[List[str], List[str]]:
+    """
+    Scan project directory for text files and image files, excluding specified files/folders
+    and respecting .gitignore rules.
+    Returns tuple of (text_file_paths, image_file_paths)
+    """
+    text_file_paths = []
+    image_file_paths = []
+    for kind, file_path, _ in iter_project_files(project_path, exclude):
+        if kind == "image":
+            image_file_paths.append(file_path)
+        else:
+            text_file_paths.append(file_path)
     return text_file_paths, image_file_paths
 
-def is_image_file(file_path: str) -> bool:
-    """Check if a file is a supported image format by attempting to open it with PIL."""
-    try:
-        with Image.open(file_path) as img:
-            # Just check if PIL can identify the format
-            return img.format is not None
-    except Exception:
-        return False
+def select_project_files_within_budget(
+    project_path: str,
+    file_entries: List[tuple[str, str, str]],
+    token_budget: int,
+    include_images: bool,
+    show_all: bool = False
+) -> tuple[List[tuple[str, str, str]], Dict[str, Optional[int]]]:
+    """
+    Apply --token-budget to scanned project files: keep the most valuable files that fit, in walk order,
+    and report what was truncated or dropped. Returns the kept entries and the per-file token limits.
+    """
+    budgeted = [(kind, file_path) for kind, file_path, _ in file_entries if kind == "text" or include_images]
+    selection = select_files(project_path, budgeted, token_budget, IMAGE_TOKEN_ESTIMATE)
+    limits = selection["limits"]
+    # Images that won't be analyzed cost nothing and are kept for the "image processing is disabled" note
+    kept_entries = [entry for entry in file_entries if entry[1] in limits or (entry[0] == "image" and not include_images)]
 
-def encode_image_to_base64(image_path: str) -> str:
-    """Encode an image file to base64 string."""
-    try:
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
-    except Exception as e:
-        raise RuntimeError(f"Failed to encode image {image_path}: {e}")
+    truncated, dropped = selection["truncated"], selection["dropped"]
+    color = "yellow" if truncated or dropped else "dim"
+    console.print(
+        f"[{color}]Token budget: {len(limits)} of {len(budgeted)} file(s) selected, ~{selection['selected_tokens']} of "
+        f"~{selection['total_tokens']} tokens; {len(truncated)} truncated, {len(dropped)} dropped.[/{color}]"
+    )
+    for label, entries in (("Truncated", truncated), ("Dropped", dropped)):
+        if not entries:
+            continue
+        shown = entries if show_all else entries[:10]
+        console.print(f"[dim]{label}: " + ", ".join(f"{relative_path} (~{tokens} tokens)" for relative_path, tokens in shown)
+                      + (f" and {len(entries) - len(shown)} more" if len(entries) > len(shown) else "") + "[/dim]")
+    return kept_entries, limits
 
 def get_image_mime_type(file_path: str) -> str:
     """Get the MIME type for an image file by detecting its format."""
     try:
+        mime_type = detect_image_mime_type(read_header(file_path, 16))
+        if mime_type:
+            return mime_type
+    except OSError:
+        pass
+    try:
+        from PIL import Image
         with Image.open(file_path) as img:
             format_name = img.format
             if format_name:
@@ -352,6 +1022,7 @@ def get_image_mime_type(file_path: str) -> str:
 def validate_image_file(file_path: str) -> bool:
     """Validate that an image file can be opened and processed."""
     try:
+        from PIL import Image
         with Image.open(file_path) as img:
             img.verify()
             # Re-open to get format info since verify() can corrupt the image object
@@ -360,45 +1031,208 @@ def validate_image_file(file_path: str) -> bool:
     except Exception:
         return False
 
-def is_pdf_file(file_path: str) -> bool:
-    """Check if a file is a PDF by extension and magic bytes."""
-    if not file_path.lower().endswith('.pdf'):
-        return False
-    try:
-        with open(file_path, 'rb') as f:
-            header = f.read(5)
-        return header == b'%PDF-'
-    except Exception:
-        return False
+def parse_page_range(page_range: Optional[str], page_count: int) -> List[int]:
+    """
+    Parse a 1-based page range like "1-5,8,10-" into sorted 0-based page indices.
+    None or an empty string selects all pages. Pages past the end of the document are ignored.
+    """
+    if not page_range or not page_range.strip():
+        return list(range(page_count))
+    selected = set()
+    for part in page_range.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start = int(start_text) if start_text.strip() else 1
+                end = int(end_text) if end_text.strip() else page_count
+            else:
+                start = end = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid page range '{part}'")
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range '{part}'")
+        selected.update(range(start - 1, min(end, page_count)))
+    return sorted(selected)
 
+def extract_pdf_text(pdf_path: str, page_range: Optional[str] = None) -> tuple[str, List[int]]:
+    """
+    Extract the text layer of a PDF as '# PDF:' sections, one per page.
+    Returns (text, page_indices_without_text) so that only pages without a usable text layer need to be rasterized.
+    """
+    name = os.path.basename(pdf_path)
+    sections = []
+    pages_without_text = []
+    try:
+        import fitz  # PyMuPDF
+        with fitz.open(pdf_path) as doc:
+            for page_index in parse_page_range(page_range, doc.page_count):
+                page_text = doc[page_index].get_text()
+                if len("".join(page_text.split())) >= MIN_PDF_PAGE_TEXT_CHARS:
+                    sections.append(f"\n\n# PDF: {name} (page {page_index + 1})\n\n{page_text.strip()}")
+                else:
+                    pages_without_text.append(page_index)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to read PDF: {e}")
+    return "".join(sections), pages_without_text
 
-def pdf_to_images(pdf_path: str) -> List[Image.Image]:
-    """Convert a PDF file to a list of PIL Images (one per page) using PyMuPDF (fitz)."""
-    images = []
+def iter_pdf_page_images(pdf_path: str, page_indices: Optional[List[int]] = None) -> Iterator[tuple[int, "Image.Image"]]:
+    """Rasterize PDF pages one at a time using PyMuPDF (fitz), yielding (page_index, PIL Image)."""
+    from PIL import Image
     try:
+        import fitz  # PyMuPDF
         doc = fitz.open(pdf_path)
-        for page in doc:
+    except Exception as e:
+        raise RuntimeError(f"Failed to convert PDF to images: {e}")
+    try:
+        for page_index in (page_indices if page_indices is not None else range(doc.page_count)):
             # PyMuPDF Page object: get_pixmap() is correct for recent versions
-            pix = page.get_pixmap()
+            pix = doc[page_index].get_pixmap()
             mode = "RGBA" if pix.alpha else "RGB"
-            img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
-            images.append(img)
+            yield page_index, Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    finally:
         doc.close()
-        return images
-    except Exception as e:
-        raise RuntimeError(f"Failed to convert PDF to images: {e}")
 
+def get_output_file_path(path: str) -> str:
+    """Return the file a summary of path is saved to: project_summary.md inside a directory, or <name>_summary.md next to a file."""
+    if os.path.isdir(path):
+        return os.path.join(path, "project_summary.md")
+    return os.path.splitext(path)[0] + "_summary.md"
+
+def read_manifest(manifest_path: str) -> List[str]:
+    """Read the paths listed in a manifest file, resolving relative paths against the manifest's folder."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        raise RuntimeError(f"Failed to read manifest {manifest_path}: {e}")
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    target_paths = []
+    for line in lines:
+        entry = line.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        target_paths.append(os.path.normpath(os.path.join(base_dir, os.path.expanduser(entry))))
+    return target_paths
+
+def summarize_batch(
+    targets: List[str],
+    summarize_target: Callable[[str, Progress], tuple[str, List[str]]],
+    jobs: int,
+    results_jsonl: Optional[str] = None
+) -> int:
+    """
+    Summarize several targets side by side and save each summary to its own file.
+    Up to `jobs` targets are scanned and read at once; their requests share the process-wide request limit.
+    Results are appended to results_jsonl as targets finish. Returns the number of targets that failed.
+    """
+    results_file = None
+    if results_jsonl:
+        try:
+            results_file = open(results_jsonl, "a", encoding="utf-8")
+        except OSError as e:
+            console.print(f"[bold red]Failed to open results file {results_jsonl}: {e}[/bold red]")
+            raise typer.Exit(code=1)
+
+    def run_target(target: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"path": target, "status": "ok", "output_file": None, "files": 0, "summary": "", "error": None}
+        try:
+            # Per-target progress is hidden; the batch shows one overall progress bar
+            with Progress(disable=True) as target_progress:
+                final_summary, processed_files = summarize_target(target, target_progress)
+            result["files"] = len(processed_files)
+            result["summary"] = final_summary
+            if not final_summary.strip():
+                result["status"] = "empty"
+            else:
+                output_file = get_output_file_path(target)
+                save_summary_to_file(final_summary, output_file)
+                result["output_file"] = output_file
+        except typer.Exit as e:
+            result["status"] = "ok" if e.exit_code == 0 else "failed"
+            result["error"] = None if e.exit_code == 0 else f"exit code {e.exit_code}"
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        return result
+
+    failed_count = 0
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True,
+            console=console.current(),
+        ) as progress:
+            batch_task = progress.add_task(f"[cyan]Summarizing {len(targets)} target(s)...", total=len(targets))
+            with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(targets)))) as executor:
+                futures = [executor.submit(contextvars.copy_context().run, run_target, target) for target in targets]
+                for done_count, future in enumerate(as_completed(futures), start=1):
+                    result = future.result()
+                    if result["status"] == "ok":
+                        console.print(f"[green]{result['path']} -> {result['output_file']}[/green]")
+                    elif result["status"] == "empty":
+                        console.print(f"[bold yellow]{result['path']}: No summary was generated.[/bold yellow]")
+                    else:
+                        failed_count += 1
+                        console.print(f"[bold red]{result['path']}: Failed to summarize: {result['error']}[/bold red]")
+                    if results_file:
+                        results_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                        results_file.flush()
+                    progress.update(batch_task, completed=done_count, description=f"[cyan]Summarized {done_count}/{len(targets)} target(s)...")
+    finally:
+        if results_file:
+            results_file.close()
+
+    console.print(f"Summarized {len(targets) - failed_count} of {len(targets)} target(s).")
+    return failed_count
+
+def print_run_statistics(use_cache: bool, stats: bool, metrics_json: Optional[str]):
+    """Print the response cache counts and the --stats table, and write --metrics-json."""
+    if use_cache:
+        cache_stats = get_cache_stats()
+        if cache_stats["hits"] or cache_stats["misses"]:
+            console.print(f"[dim]Response cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es).[/dim]")
+        prune_cache()
+
+    scheduler_state = scheduler.get_state()
+    if scheduler_state["throttled"]:
+        console.print(
+            f"[dim]The endpoint rate-limited {scheduler_state['throttled']} request(s); "
+            f"concurrency ended at {scheduler_state['concurrency']} of {scheduler_state['max_concurrency']}.[/dim]"
+        )
 
-def encode_pil_image_to_base64(img: Image.Image, fmt: str = 'PNG') -> str:
-    import io
-    buf = io.BytesIO()
-    img.save(buf, format=fmt)
-    return base64.b64encode(buf.getvalue()).decode('utf-8')
+    if stats or metrics_json:
+        metrics_report = metrics.get_report()
+        metrics_report["scheduler"] = scheduler_state
+        if stats:
+            metrics.print_report(console, metrics_report)
+        if metrics_json:
+            try:
+                metrics.write_report_json(metrics_json, metrics_report)
+            except RuntimeError as e:
+                console.print(f"[bold red]{e}[/bold red]")
 
 def summary(
-    path: str = typer.Argument(
-        ...,
-        help="Path to a file or project directory to summarize. Supports text files and images."
+    paths: Optional[List[str]] = typer.Argument(
+        None,
+        help="Paths to files or project directories to summarize. Supports text files, PDFs and images. With several paths, each summary is saved to its own file."
+    ),
+    manifest: Optional[str] = typer.Option(
+        None,
+        "--manifest",
+        help="File listing paths to summarize, one per line. Relative paths are resolved against the manifest's folder; blank lines and lines starting with '#' are ignored."
+    ),
+    results_jsonl: Optional[str] = typer.Option(
+        None,
+        "--results-jsonl",
+        help="In batch mode, append one JSON line per target (path, status, output file and summary) to this file as targets finish."
     ),
     save_to_file: bool = typer.Option(
         False,
@@ -423,19 +1257,137 @@ def summary(
     exclude: Optional[List[str]] = typer.Option(
         None,
         "--exclude",
-        help="Comma-separated list of files or folders to exclude from the summary.",
-        callback=lambda v: v.split(",") if v else []
+        help="Comma-separated list of files or folders to exclude from the summary. May be given more than once.",
+        callback=lambda v: [p for item in v or [] for p in item.split(",") if p]
     ),
     update_readme_path: Optional[str] = typer.Option(
         None,
         "--update-readme",
         help="Path to an existing README.md file to update. If provided, --format-readme is implied and the output will be saved to this file."
     ),
+    section_update: bool = typer.Option(
+        False,
+        "--section-update",
+        help="With --update-readme, only rewrite the README sections affected by the new content (planned in one request, rewritten in parallel) and keep the rest verbatim."
+    ),
     include_images: bool = typer.Option(
         True,
         "--include-images/--no-images",
         help="Include image files in the analysis (requires vision-capable AI model)."
     ),
+    concurrency: Optional[int] = typer.Option(
+        None,
+        "--concurrency",
+        min=1,
+        help="Maximum number of chunk summarization requests sent in parallel. Overrides the CONCURRENCY config value (default: 4)."
+    ),
+    fan_in: Optional[int] = typer.Option(
+        None,
+        "--fan-in",
+        min=2,
+        help="Maximum number of summaries combined per request when reducing chunk summaries. Overrides the REDUCE_FAN_IN config value (default: 8)."
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="For project directories, keep per-file summaries in a .sumsnap folder inside the project and only re-summarize changed files."
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        help="For a project directory, keep running and re-summarize (and re-save) whenever its files change. Implies --incremental, so only changed files are sent again."
+    ),
+    use_cache: bool = typer.Option(
+        True,
+        "--cache/--no-cache",
+        help="Reuse cached AI responses for unchanged content and store new ones."
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Ignore cached AI responses for this run, but store the fresh responses in the cache."
+    ),
+    pages: Optional[str] = typer.Option(
+        None,
+        "--pages",
+        help="Pages of a PDF to summarize, e.g. '1-5,8,10-'. Defaults to all pages."
+    ),
+    sample: str = typer.Option(
+        "full",
+        "--sample",
+        help="How much of a single text file to summarize: 'full', or a sample of --sample-tokens tokens: 'head' (the start), 'head-tail' (the start and end) or 'stratified' (evenly spaced windows). Bounds the requests for huge logs and datasets."
+    ),
+    sample_tokens: Optional[int] = typer.Option(
+        None,
+        "--sample-tokens",
+        help=f"Token budget of a --sample other than 'full'. Overrides the SAMPLE_TOKENS config value (default {DEFAULT_SAMPLE_TOKENS})."
+    ),
+    max_images: Optional[int] = typer.Option(
+        None,
+        "--max-images-per-request",
+        min=1,
+        help="Maximum number of images (or PDF pages) sent in one request; larger sets are split into parallel batches. Overrides the MAX_IMAGES_PER_REQUEST config value (default: 8)."
+    ),
+    image_max_edge: Optional[int] = typer.Option(
+        None,
+        "--image-max-edge",
+        min=0,
+        help="Downscale images so their longest edge is at most this many pixels before upload (0 keeps the original size). Overrides the IMAGE_MAX_EDGE config value (default: 1568)."
+    ),
+    requests_per_minute: Optional[int] = typer.Option(
+        None,
+        "--requests-per-minute",
+        min=0,
+        help="Send at most this many requests per minute (0 means no limit). Overrides the REQUESTS_PER_MINUTE config value."
+    ),
+    tokens_per_minute: Optional[int] = typer.Option(
+        None,
+        "--tokens-per-minute",
+        min=0,
+        help="Send at most about this many prompt and completion tokens per minute (0 means no limit). Overrides the TOKENS_PER_MINUTE config value."
+    ),
+    skeleton: bool = typer.Option(
+        False,
+        "--skeleton",
+        help="For project directories, send only the outline of source files (imports, class and function signatures, docstrings and constants) instead of their full text. Files that can't be parsed are sent in full."
+    ),
+    include_generated: bool = typer.Option(
+        False,
+        "--include-generated",
+        help="Send duplicate, minified, generated and encoded files as-is instead of replacing them with one-line stubs."
+    ),
+    token_budget: Optional[int] = typer.Option(
+        None,
+        "--token-budget",
+        min=0,
+        help="For project directories, send at most about this many tokens of file content: the most important files are kept, large ones truncated and the rest dropped (0 means no limit). Overrides the TOKEN_BUDGET config value."
+    ),
+    max_retries: Optional[int] = typer.Option(
+        None,
+        "--max-retries",
+        min=0,
+        help="Retry rate-limited, failed and timed-out requests up to this many times. Overrides the MAX_RETRIES config value (default: 6)."
+    ),
+    stream: Optional[bool] = typer.Option(
+        None,
+        "--stream/--no-stream",
+        help="Stream the final summary to the screen (and to <output>.partial when saving) as it is generated. Defaults to on when the output is a terminal."
+    ),
+    stats: bool = typer.Option(
+        False,
+        "--stats",
+        help="Print timing, request and token statistics for each phase after the summary."
+    ),
+    metrics_json: Optional[str] = typer.Option(
+        None,
+        "--metrics-json",
+        help="Write timing, request and token statistics as JSON to this file."
+    ),
+    server: Optional[str] = typer.Option(
+        None,
+        "--server",
+        help="Run the summary on a `sumsnap serve` server at this address (HOST:PORT or unix:/path/to/socket) instead of in this process. Overrides the SERVER config value; an empty value runs locally."
+    ),
     debug: bool = typer.Option(
         False,
         "--debug",
@@ -448,14 +1400,75 @@ def summary(
     
     Supports both text files and images. Image analysis requires a vision-capable AI model (like GPT-4 Vision).
     """
+    server_address = server if server is not None else config.get_config("SERVER")
+    # A watch never finishes, so it always runs in this process
+    if server_address and not watch:
+        from serve_command import run_on_server
+
+        params = {name: value for name, value in locals().items() if name not in ("server_address", "run_on_server")}
+        try:
+            exit_code = run_on_server(server_address, params, console.width)
+        except RuntimeError as e:
+            console.print(f"[bold red]{e}[/bold red]")
+            raise typer.Exit(code=1)
+        if exit_code is not None:
+            raise typer.Exit(code=exit_code)
+        console.print(f"[yellow]Warning: Could not reach the sumsnap server at {server_address}; summarizing in this process.[/yellow]")
+
+    metrics.reset()
+    targets = list(paths or [])
+    if manifest:
+        try:
+            targets.extend(read_manifest(manifest))
+        except RuntimeError as e:
+            console.print(f"[bold red]{e}[/bold red]")
+            raise typer.Exit(code=1)
+    # The same target listed twice (e.g. relative and absolute) is summarized once
+    unique_targets: Dict[str, str] = {}
+    for target in targets:
+        unique_targets.setdefault(os.path.abspath(target), target)
+    targets = list(unique_targets.values())
+    if not targets:
+        console.print("[bold red]Provide at least one PATH or a --manifest file.[/bold red]")
+        raise typer.Exit(code=1)
+    batch_mode = len(targets) > 1 or bool(manifest) or bool(results_jsonl)
+    if batch_mode and update_readme_path:
+        console.print("[bold red]--update-readme can only be used with a single PATH.[/bold red]")
+        raise typer.Exit(code=1)
+    if watch and (batch_mode or not os.path.isdir(targets[0])):
+        console.print("[bold red]--watch can only be used with a single project directory as PATH.[/bold red]")
+        raise typer.Exit(code=1)
+    # Watching keeps per-file summaries between runs, so a change only resends the changed files
+    incremental = incremental or watch
+
     api_key, api_endpoint, default_model = load_api_config()
     use_model = model or default_model
+    use_concurrency = resolve_concurrency(concurrency)
+    chunk_tokens = get_chunk_token_budget(use_model)
+    max_images_per_request = resolve_int_setting(max_images, "MAX_IMAGES_PER_REQUEST", DEFAULT_MAX_IMAGES_PER_REQUEST)
+    max_image_request_bytes = resolve_int_setting(None, "MAX_IMAGE_REQUEST_MB", DEFAULT_MAX_IMAGE_REQUEST_MB) * 1024 * 1024
+    use_fan_in = resolve_int_setting(fan_in, "REDUCE_FAN_IN", DEFAULT_REDUCE_FAN_IN, minimum=2)
+    use_token_budget = resolve_int_setting(token_budget, "TOKEN_BUDGET", 0, minimum=0)
+    use_sample_tokens = resolve_int_setting(sample_tokens, "SAMPLE_TOKENS", DEFAULT_SAMPLE_TOKENS, minimum=100)
+    if sample not in SAMPLE_STRATEGIES:
+        console.print(f"[bold red]Unknown --sample '{sample}'. Use one of: {', '.join(SAMPLE_STRATEGIES)}.[/bold red]")
+        raise typer.Exit(code=1)
+    set_cache_mode(use_cache, refresh)
+    set_image_settings(image_max_edge)
+    # All targets share one client, and together never have more than use_concurrency requests in flight.
+    # The scheduler also paces them against the per-minute budgets and backs off when the endpoint throttles.
+    scheduler.configure(
+        use_concurrency,
+        requests_per_minute=resolve_int_setting(requests_per_minute, "REQUESTS_PER_MINUTE", 0, minimum=0),
+        tokens_per_minute=resolve_int_setting(tokens_per_minute, "TOKENS_PER_MINUTE", 0, minimum=0),
+        max_retries=resolve_int_setting(max_retries, "MAX_RETRIES", scheduler.DEFAULT_MAX_RETRIES, minimum=0)
+    )
+    # Open the connection while files are being scanned and read
+    warm_up_client(api_key, api_endpoint)
 
     existing_readme_content: Optional[str] = None
     is_updating_readme = False
     effective_format_readme = format_readme
-    
-    processed_content_files: List[str] = []
 
     if update_readme_path:
         is_updating_readme = True
@@ -469,13 +1482,39 @@ def summary(
             console.print(f"[bold yellow]Warning: Existing README '{update_readme_path}' is empty. A new README will be generated based on project/file content and saved to this path.[/bold yellow]")
 
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        transient=True,
-        console=console,
-    ) as progress:
+    def summarize_target(path: str, progress: Progress, stream_final: bool = False) -> tuple[str, List[str]]:
+        """
+        Summarize one file or project directory. Returns the summary and the files its content came from.
+        With stream_final, the request that produces the final summary is streamed into a live view.
+        """
+        processed_content_files: List[str] = []
         final_summary = ""
+
+        def final_request(text: str, final_format_readme: bool, is_update: bool = False, images: Optional[List[Dict[str, Any]]] = None) -> str:
+            if not stream_final:
+                return summarize_chunk(text, api_key, api_endpoint, use_model, detailed, final_format_readme, is_update=is_update, images=images)
+            output_file = update_readme_path if is_updating_readme else get_output_file_path(path) if save_to_file else None
+            title = f"[bold]{'Updated README' if is_updating_readme else 'Summary'} of {os.path.basename(os.path.abspath(path))}[/bold] [dim](streaming)[/dim]"
+            with live_summary_view(progress, title, f"{output_file}.partial" if output_file else None) as on_text:
+                return summarize_chunk(text, api_key, api_endpoint, use_model, detailed, final_format_readme, is_update=is_update, images=images, on_text=on_text)
+
+        def update_readme(new_content: str, images: Optional[List[Dict[str, Any]]] = None) -> str:
+            """Integrate new content into the existing README, section by section with --section-update."""
+            if section_update and not images and existing_readme_content and existing_readme_content.strip():
+                updated = update_readme_sections(
+                    existing_readme_content, new_content, api_key, api_endpoint, use_model, detailed, use_concurrency, progress
+                )
+                if updated is not None:
+                    return updated
+            text_for_update = (
+                f"EXISTING_README_CONTENT_BEGINS:\n{existing_readme_content}\nEXISTING_README_CONTENT_ENDS.\n\n"
+                f"NEW_CONTENT_TO_INTEGRATE_BEGINS:\n{new_content}\nNEW_CONTENT_TO_INTEGRATE_ENDS."
+            )
+            with metrics.phase("update"):
+                return final_request(text_for_update, True, is_update=True, images=images)
+
+        # Without README formatting, the last combine of the reduce produces the final summary
+        final_combine = None if effective_format_readme else (lambda combined_text: final_request(combined_text, False))
         # These will store the actual text read from files/project to determine if content was processed
         project_text_content_processed = ""
         file_text_content_processed = ""
@@ -483,75 +1522,174 @@ def summary(
 
 
         if os.path.isdir(path):
-            scan_task = progress.add_task("[cyan]Scanning for files...", total=None)
-            text_file_paths, image_file_paths = scan_project_files(path, exclude)
-            # These are the files whose content will be attempted to be read and summarized
-            processed_content_files = text_file_paths + image_file_paths
-            progress.update(scan_task, completed=1); progress.remove_task(scan_task)
-
-            if not text_file_paths and not image_file_paths and not (is_updating_readme and existing_readme_content and existing_readme_content.strip()):
-                console.print(f"[bold red]No supported text or image files found in {path} to summarize, and no existing README to update (or it's empty).[/bold red]")
-                raise typer.Exit(code=1)
-            
-            concat_task = progress.add_task(f"[cyan]Reading and processing files...", total=len(text_file_paths + image_file_paths) if (text_file_paths or image_file_paths) else None)
-            project_text = ""
-            project_images = []
-            
-            # Process text files
-            if text_file_paths:
-                for file_path_item in text_file_paths:
-                    progress.update(concat_task, description=f"[cyan]Reading {os.path.relpath(file_path_item, path)}")
-                    content = read_text_file(file_path_item)
-                    if content.strip():
-                        project_text += f"\n\n# FILE: {os.path.relpath(file_path_item, path)}\n\n{content}"
-                    progress.advance(concat_task)
-            
-            # Process image files  
-            if image_file_paths and include_images:
-                for image_path in image_file_paths:
-                    progress.update(concat_task, description=f"[cyan]Processing {os.path.relpath(image_path, path)}")
-                    try:
-                        base64_image = encode_image_to_base64(image_path)
-                        mime_type = get_image_mime_type(image_path)
-                        project_images.append({
-                            'path': os.path.relpath(image_path, path),
-                            'base64': base64_image,
-                            'mime_type': mime_type
-                        })
-                        project_text += f"\n\n# IMAGE: {os.path.relpath(image_path, path)}\n\n[Image file - content will be analyzed by AI]\n"
-                    except Exception as e:
-                        console.print(f"[yellow]Warning: Could not process image {image_path}: {e}[/yellow]")
-                    progress.advance(concat_task)
-            elif image_file_paths and not include_images:
-                console.print(f"[yellow]Note: Found {len(image_file_paths)} image file(s) but image processing is disabled. Use --include-images to analyze them.[/yellow]")
-                    
-            progress.remove_task(concat_task)
-            project_text_content_processed = project_text # Store the concatenated text
-
-            new_content_summary = ""
-            if project_text_content_processed.strip() or project_images:
-                chunk_task_new = progress.add_task("[cyan]Chunking new project text...", total=None)
-                new_content_chunks = chunk_text(project_text) if project_text else [""]
-                progress.update(chunk_task_new, completed=1); progress.remove_task(chunk_task_new)
-
-                summarize_task_new = progress.add_task(f"[cyan]Summarizing {len(new_content_chunks)} new content chunk(s)...", total=len(new_content_chunks))
-                new_content_summaries = []
-                for idx, chunk_item in enumerate(new_content_chunks):
-                    progress.update(summarize_task_new, description=f"[cyan]Summarizing new content chunk {idx+1}/{len(new_content_chunks)}")
-                    # Include images only with the first chunk to avoid duplication
-                    chunk_images = project_images if idx == 0 else None
+            has_existing_readme = bool(is_updating_readme and existing_readme_content and existing_readme_content.strip())
+            if incremental:
+                scan_task = progress.add_task("[cyan]Scanning for files...", total=None)
+                file_entries = list(iter_project_files(path, exclude))
+                token_limits: Dict[str, Optional[int]] = {}
+                if use_token_budget:
+                    file_entries, token_limits = select_project_files_within_budget(
+                        path, file_entries, use_token_budget, include_images, debug
+                    )
+                text_file_paths = [p for kind, p, _ in file_entries if kind == "text"]
+                image_file_paths = [p for kind, p, _ in file_entries if kind == "image"]
+                text_encodings = {p: encoding for kind, p, encoding in file_entries if kind == "text"}
+                # These are the files whose content will be attempted to be read and summarized
+                processed_content_files = text_file_paths + image_file_paths
+                progress.update(scan_task, completed=1); progress.remove_task(scan_task)
+
+                if not text_file_paths and not image_file_paths and not has_existing_readme:
+                    console.print(f"[bold red]No supported text or image files found in {path} to summarize, and no existing README to update (or it's empty).[/bold red]")
+                    raise typer.Exit(code=1)
+                if image_file_paths and not include_images:
+                    console.print(f"[yellow]Note: Found {len(image_file_paths)} image file(s) but image processing is disabled. Use --include-images to analyze them.[/yellow]")
+
+                new_content_summary = summarize_project_incrementally(
+                    path, text_file_paths, image_file_paths if include_images else [],
+                    api_key, api_endpoint, use_model, detailed, use_concurrency, use_fan_in, progress, final_combine, token_limits,
+                    omit_generated=not include_generated, skeleton=skeleton, encodings=text_encodings
+                )
+                project_text_content_processed = new_content_summary
+            else:
+                # Scan, read, chunk and summarize as one stream: requests start while the
+                # tree is still being walked, and only the chunks in flight are held in memory.
+                image_file_paths: List[str] = []
+                image_mime_types: Dict[str, str] = {}
+                read_task = progress.add_task("[cyan]Scanning and reading files...", total=None)
+                token_limits: Dict[str, Optional[int]] = {}
+                file_entries: Iterable[tuple[str, str, str]]
+                if use_token_budget:
+                    # Ranking needs the whole file list, so with a budget the walk finishes before reading starts
+                    file_entries, token_limits = select_project_files_within_budget(
+                        path, list(iter_project_files(path, exclude)), use_token_budget, include_images, debug
+                    )
+                else:
+                    file_entries = iter_project_files(path, exclude)
+
+                def project_files() -> Iterator[tuple[str, str, str]]:
+                    for kind, file_path_item, detail in file_entries:
+                        # These are the files whose content will be attempted to be read and summarized
+                        processed_content_files.append(file_path_item)
+                        if kind == "image":
+                            image_file_paths.append(file_path_item)
+                            image_mime_types[file_path_item] = detail
+                            continue
+                        yield kind, file_path_item, detail
+
+                # Files left out of the summary as one-line stubs, as (relative path, reason)
+                omitted_files: List[tuple[str, str]] = []
+
+                def read_section(file_entry: tuple[str, str, str]) -> tuple[str, str, Optional[str]]:
+                    """Read a file into a '# FILE:' section. Returns (relative path, section, content hash for duplicate detection)."""
+                    _, file_path_item, encoding = file_entry
+                    relative_path = os.path.relpath(file_path_item, path)
+                    with metrics.timed("read"):
+                        content = read_text_file(file_path_item, encoding)
+                    if not content.strip():
+                        return relative_path, "", None
+                    content_hash = None
+                    if not include_generated:
+                        reason = detect_generated_content(os.path.basename(file_path_item), content)
+                        if reason:
+                            omitted_files.append((relative_path, reason))
+                            return relative_path, f"\n\n# FILE: {relative_path}\n\n{describe_omitted_file(reason, content)}\n", None
+                        if len(content) >= MIN_DUPLICATE_CHARS:
+                            content_hash = hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+                    header = f"# FILE: {relative_path}"
+                    outline = build_skeleton(file_path_item, content) if skeleton else None
+                    if outline:
+                        content = outline
+                        header += SKELETON_HEADER_SUFFIX
+                    if token_limits.get(file_path_item):
+                        content = truncate_to_tokens(content, token_limits[file_path_item])
+                    return relative_path, f"\n\n{header}\n\n{content}", content_hash
+
+                def project_sections() -> Iterator[str]:
+                    first_path_by_hash: Dict[str, str] = {}
+                    # Text files are read on a thread pool, in walk order, so the first copy of a duplicate is always the same
+                    for relative_path, section, content_hash in iter_parallel_map(read_section, project_files(), 8):
+                        progress.update(read_task, description=f"[cyan]Read {len(processed_content_files)} file(s)...")
+                        if content_hash:
+                            original_path = first_path_by_hash.setdefault(content_hash, relative_path)
+                            if original_path != relative_path:
+                                omitted_files.append((relative_path, "duplicate"))
+                                section = f"\n\n# FILE: {relative_path}\n\n[Identical to {original_path}]\n"
+                        yield section
+
+                def summarize_new_content_chunk(idx: int, chunk_item: str) -> str:
                     # Summarize new content: detailed if requested, but don't apply README formatting or update logic at this stage
-                    new_content_summaries.append(summarize_chunk(chunk_item, api_key, api_endpoint, use_model, detailed, False, is_update=False, images=chunk_images))
-                    progress.advance(summarize_task_new)
+                    return summarize_chunk(chunk_item, api_key, api_endpoint, use_model, detailed, False, is_update=False)
+
+                summarize_task_new = progress.add_task("[cyan]Summarizing new content chunks...", total=None)
+                with metrics.phase("map"):
+                    new_content_summaries = summarize_chunks_concurrently(
+                        metrics.timed_iter("chunk", iter_chunks(project_sections(), chunk_tokens)), summarize_new_content_chunk, use_concurrency,
+                        progress, summarize_task_new, "[cyan]Summarizing new content chunk"
+                    )
                 progress.remove_task(summarize_task_new)
+                progress.remove_task(read_task)
+                if omitted_files:
+                    reason_counts: Dict[str, int] = {}
+                    for _, reason in omitted_files:
+                        reason_counts[reason] = reason_counts.get(reason, 0) + 1
+                    console.print(
+                        f"[dim]Replaced {len(omitted_files)} file(s) with one-line stubs: "
+                        + ", ".join(f"{count} {reason}" for reason, count in sorted(reason_counts.items()))
+                        + ". Use --include-generated to send them as-is.[/dim]"
+                    )
+                    if debug:
+                        for relative_path, reason in sorted(omitted_files):
+                            console.print(f"[dim]- {relative_path} ({reason})[/dim]")
+
+                if not processed_content_files and not has_existing_readme:
+                    console.print(f"[bold red]No supported text or image files found in {path} to summarize, and no existing README to update (or it's empty).[/bold red]")
+                    raise typer.Exit(code=1)
+
+                # Images are found during the walk, so they are analyzed after the text, in size-capped batches
+                if image_file_paths and include_images:
+                    # Identical images are sent once
+                    first_path_by_hash: Dict[str, str] = {}
+                    duplicate_notes: List[str] = []
+
+                    def prepared_project_images() -> Iterator[Dict[str, Any]]:
+                        for image_path in image_file_paths:
+                            relative_image_path = os.path.relpath(image_path, path)
+                            try:
+                                image = prepare_image(image_path, relative_image_path, image_mime_types[image_path])
+                            except Exception as e:
+                                console.print(f"[yellow]Warning: Could not process image {image_path}: {e}[/yellow]")
+                                continue
+                            if image['sha256'] in first_path_by_hash:
+                                duplicate_notes.append(f"- {relative_image_path} is identical to {first_path_by_hash[image['sha256']]}")
+                                continue
+                            first_path_by_hash[image['sha256']] = relative_image_path
+                            project_images.append(relative_image_path)
+                            yield image
+
+                    def describe_image_batch(idx: int, batch: List[Dict[str, Any]]) -> str:
+                        images_text = "".join(
+                            f"\n\n# IMAGE: {image['path']}\n\n[Image file - content will be analyzed by AI]\n" for image in batch
+                        )
+                        return summarize_chunk(images_text, api_key, api_endpoint, use_model, detailed, False, is_update=False, images=batch)
 
-                if len(new_content_summaries) > 1:
-                    combine_task_new = progress.add_task("[cyan]Combining new content summaries...", total=None)
-                    combined_new_summary_text = "\n\n".join(new_content_summaries)
-                    new_content_summary = summarize_chunk(combined_new_summary_text, api_key, api_endpoint, use_model, detailed, False, is_update=False)
-                    progress.update(combine_task_new, completed=1); progress.remove_task(combine_task_new)
-                elif new_content_summaries:
-                    new_content_summary = new_content_summaries[0]
+                    images_task = progress.add_task(f"[cyan]Analyzing {len(image_file_paths)} image(s)...", total=None)
+                    with metrics.phase("map"):
+                        new_content_summaries.extend(summarize_chunks_concurrently(
+                            iter_image_batches(prepared_project_images(), max_images_per_request, max_image_request_bytes),
+                            describe_image_batch, use_concurrency, progress, images_task, "[cyan]Analyzing image batch"
+                        ))
+                    progress.remove_task(images_task)
+                    if duplicate_notes:
+                        new_content_summaries.append("Duplicate images:\n" + "\n".join(duplicate_notes))
+                elif image_file_paths and not include_images:
+                    console.print(f"[yellow]Note: Found {len(image_file_paths)} image file(s) but image processing is disabled. Use --include-images to analyze them.[/yellow]")
+
+                project_text_content_processed = "\n".join(new_content_summaries)
+                new_content_summary = reduce_summaries(
+                    new_content_summaries,
+                    lambda combined_text: summarize_chunk(combined_text, api_key, api_endpoint, use_model, detailed, False, is_update=False),
+                    use_fan_in, use_concurrency, progress, "[cyan]Combining new content summaries", chunk_tokens, final_combine
+                )
             
             if is_updating_readme:
                 if not new_content_summary.strip() and (not existing_readme_content or not existing_readme_content.strip()):
@@ -561,11 +1699,7 @@ def summary(
                      console.print(f"[bold yellow]Warning: No new content summarized from the project. The README at '{update_readme_path}' will be processed based on its existing content.[/bold yellow]")
 
                 update_task = progress.add_task("[cyan]Updating README...", total=None)
-                text_for_update = (
-                    f"EXISTING_README_CONTENT_BEGINS:\n{existing_readme_content}\nEXISTING_README_CONTENT_ENDS.\n\n"
-                    f"NEW_CONTENT_TO_INTEGRATE_BEGINS:\n{new_content_summary}\nNEW_CONTENT_TO_INTEGRATE_ENDS."
-                )
-                final_summary = summarize_chunk(text_for_update, api_key, api_endpoint, use_model, detailed, True, is_update=True)
+                final_summary = update_readme(new_content_summary)
                 progress.update(update_task, completed=1); progress.remove_task(update_task)
             else: # Standard project summary (not updating an existing README)
                 # This check might be redundant if the earlier check covers it
@@ -575,12 +1709,14 @@ def summary(
                 final_summary = new_content_summary
                 if effective_format_readme: # User explicitly asked for --format-readme (and not --update-readme)
                     readme_format_task = progress.add_task("[cyan]Formatting summary as README...", total=None)
-                    final_summary = summarize_chunk(final_summary, api_key, api_endpoint, use_model, detailed, True, is_update=False)
+                    with metrics.phase("format"):
+                        final_summary = final_request(final_summary, True)
                     progress.update(readme_format_task, completed=1); progress.remove_task(readme_format_task)
 
         elif os.path.isfile(path):
+            file_kind, file_detail = classify_file(path) or ("binary", "")
             # Check if it's an image file
-            if is_image_file(path):
+            if file_kind == "image":
                 if not include_images:
                     console.print(f"[bold red]Image file {path} provided but image processing is disabled. Use --include-images to analyze it.[/bold red]")
                     raise typer.Exit(code=1)
@@ -594,13 +1730,7 @@ def summary(
                 # Process the single image
                 single_image = None
                 try:
-                    base64_image = encode_image_to_base64(path)
-                    mime_type = get_image_mime_type(path)
-                    single_image = [{
-                        'path': os.path.basename(path),
-                        'base64': base64_image,
-                        'mime_type': mime_type
-                    }]
+                    single_image = [prepare_image(path, os.path.basename(path), file_detail)]
                     file_text_content_processed = f"# IMAGE: {os.path.basename(path)}\n\n[Image file - content will be analyzed by AI]\n"
                 except Exception as e:
                     console.print(f"[bold red]Failed to process image {path}: {e}[/bold red]")
@@ -612,105 +1742,161 @@ def summary(
                         raise typer.Exit(code=1)
 
                     update_task = progress.add_task("[cyan]Updating README with image...", total=None)
-                    text_for_update = (
-                        f"EXISTING_README_CONTENT_BEGINS:\n{existing_readme_content}\nEXISTING_README_CONTENT_ENDS.\n\n"
-                        f"NEW_CONTENT_TO_INTEGRATE_BEGINS:\nAnalyze the provided image.\nNEW_CONTENT_TO_INTEGRATE_ENDS."
-                    )
-                    final_summary = summarize_chunk(text_for_update, api_key, api_endpoint, use_model, detailed, True, is_update=True, images=single_image)
+                    final_summary = update_readme("Analyze the provided image.", images=single_image)
                     progress.update(update_task, completed=1); progress.remove_task(update_task)
                 else:
                     # Standard image analysis
                     analyze_task = progress.add_task("[cyan]Analyzing image...", total=None)
-                    single_file_summary_content = summarize_chunk("Analyze and describe this image in detail.", api_key, api_endpoint, use_model, detailed, False, is_update=False, images=single_image)
+                    with metrics.phase("map"):
+                        image_prompt = "Analyze and describe this image in detail."
+                        if effective_format_readme:
+                            single_file_summary_content = summarize_chunk(image_prompt, api_key, api_endpoint, use_model, detailed, False, is_update=False, images=single_image)
+                        else:
+                            single_file_summary_content = final_request(image_prompt, False, images=single_image)
                     progress.update(analyze_task, completed=1); progress.remove_task(analyze_task)
                     
                     final_summary = single_file_summary_content
                     if effective_format_readme:
                         readme_format_task = progress.add_task("[cyan]Formatting image analysis as README...", total=None)
-                        final_summary = summarize_chunk(final_summary, api_key, api_endpoint, use_model, detailed, True, is_update=False)
+                        with metrics.phase("format"):
+                            final_summary = final_request(final_summary, True)
                         progress.update(readme_format_task, completed=1); progress.remove_task(readme_format_task)
                         
             # Check if it's a PDF file
-            elif is_pdf_file(path):
+            elif file_kind == "pdf":
                 processed_content_files = [path]
+                pdf_name = os.path.basename(path)
                 try:
-                    pdf_images = pdf_to_images(path)
-                except Exception as e:
-                    console.print(f"[bold red]Failed to convert PDF to images: {e}[/bold red]")
+                    with metrics.timed("read"):
+                        pdf_text, scanned_pages = extract_pdf_text(path, pages)
+                except (ValueError, RuntimeError) as e:
+                    console.print(f"[bold red]{e}[/bold red]")
                     raise typer.Exit(code=1)
-                if not pdf_images:
-                    console.print(f"[bold red]No images could be extracted from PDF {path}.[/bold red]")
+                if not pdf_text.strip() and not scanned_pages:
+                    console.print(f"[bold red]No content could be extracted from PDF {path}.[/bold red]")
                     raise typer.Exit(code=1)
-                pdf_image_data = []
-                for idx, img in enumerate(pdf_images):
-                    try:
-                        base64_img = encode_pil_image_to_base64(img)
-                        pdf_image_data.append({
-                            'path': f"{os.path.basename(path)}_page_{idx+1}.png",
-                            'base64': base64_img,
-                            'mime_type': 'image/png'
-                        })
-                    except Exception as e:
-                        console.print(f"[yellow]Warning: Could not encode page {idx+1} of PDF: {e}[/yellow]")
-                if not pdf_image_data:
-                    console.print(f"[bold red]No valid images could be encoded from PDF {path}.[/bold red]")
+                file_text_content_processed = pdf_text
+
+                pdf_summaries = []
+                if pdf_text.strip():
+                    # Text layer first: it costs a fraction of the tokens of page images
+                    with metrics.timed("chunk"):
+                        pdf_chunks = chunk_text(pdf_text, chunk_tokens)
+                    summarize_task = progress.add_task(f"[cyan]Summarizing {len(pdf_chunks)} PDF text chunk(s)...", total=len(pdf_chunks))
+                    with metrics.phase("map"):
+                        pdf_summaries = summarize_chunks_concurrently(
+                            pdf_chunks,
+                            lambda idx, chunk_item: summarize_chunk(chunk_item, api_key, api_endpoint, use_model, detailed, False, is_update=False),
+                            use_concurrency, progress, summarize_task, "[cyan]Summarizing PDF text chunk"
+                        )
+                    progress.remove_task(summarize_task)
+
+                if scanned_pages and not include_images:
+                    console.print(f"[yellow]Note: {len(scanned_pages)} PDF page(s) have no text layer and were skipped because image processing is disabled.[/yellow]")
+                elif scanned_pages:
+                    raster_task = progress.add_task(f"[cyan]Rasterizing {len(scanned_pages)} PDF page(s) without text...", total=len(scanned_pages))
+
+                    def prepared_pdf_pages() -> Iterator[Dict[str, Any]]:
+                        # Pages are rendered one at a time and only the prepared (downscaled) image is kept
+                        try:
+                            for page_index, img in iter_pdf_page_images(path, scanned_pages):
+                                try:
+                                    page_data, page_mime_type = prepare_pil_image(img)
+                                    yield {
+                                        'path': f"{pdf_name}_page_{page_index+1}",
+                                        'page': page_index + 1,
+                                        'base64': base64.b64encode(page_data).decode('utf-8'),
+                                        'mime_type': page_mime_type
+                                    }
+                                except Exception as e:
+                                    console.print(f"[yellow]Warning: Could not encode page {page_index+1} of PDF: {e}[/yellow]")
+                                finally:
+                                    img.close()
+                                progress.advance(raster_task)
+                        except RuntimeError as e:
+                            console.print(f"[yellow]Warning: {e}[/yellow]")
+
+                    def describe_page_batch(idx: int, batch: List[Dict[str, Any]]) -> str:
+                        page_list = ", ".join(str(page['page']) for page in batch)
+                        return summarize_chunk(
+                            f"# PDF: {pdf_name} (pages {page_list})\n\nAnalyze and describe these PDF pages (provided as images) in detail.",
+                            api_key, api_endpoint, use_model, detailed, False, is_update=False, images=batch
+                        )
+
+                    # Page batches are analyzed in parallel while later pages are still being rendered
+                    analyze_task = progress.add_task("[cyan]Analyzing PDF pages as images...", total=None)
+                    with metrics.phase("map"):
+                        pdf_summaries.extend(summarize_chunks_concurrently(
+                            iter_image_batches(prepared_pdf_pages(), max_images_per_request, max_image_request_bytes),
+                            describe_page_batch, use_concurrency, progress, analyze_task, "[cyan]Analyzing PDF page batch"
+                        ))
+                    progress.remove_task(analyze_task)
+                    progress.remove_task(raster_task)
+
+                single_file_summary_content = reduce_summaries(
+                    pdf_summaries,
+                    lambda combined_text: summarize_chunk(combined_text, api_key, api_endpoint, use_model, detailed, False, is_update=False),
+                    use_fan_in, use_concurrency, progress, "[cyan]Combining PDF summaries", chunk_tokens, final_combine
+                )
+                if not single_file_summary_content.strip() and not (is_updating_readme and existing_readme_content and existing_readme_content.strip()):
+                    console.print(f"[bold red]No content could be summarized from PDF {path}.[/bold red]")
                     raise typer.Exit(code=1)
-                file_text_content_processed = f"# PDF: {os.path.basename(path)}\n\n[PDF file - each page will be analyzed as an image by AI]\n"
+
                 if is_updating_readme:
-                    update_task = progress.add_task("[cyan]Updating README with PDF images...", total=None)
-                    text_for_update = (
-                        f"EXISTING_README_CONTENT_BEGINS:\n{existing_readme_content}\nEXISTING_README_CONTENT_ENDS.\n\n"
-                        f"NEW_CONTENT_TO_INTEGRATE_BEGINS:\nAnalyze the provided PDF (pages as images).\nNEW_CONTENT_TO_INTEGRATE_ENDS."
-                    )
-                    final_summary = summarize_chunk(text_for_update, api_key, api_endpoint, use_model, detailed, True, is_update=True, images=pdf_image_data)
+                    update_task = progress.add_task("[cyan]Updating README with PDF content...", total=None)
+                    final_summary = update_readme(single_file_summary_content)
                     progress.update(update_task, completed=1); progress.remove_task(update_task)
                 else:
-                    analyze_task = progress.add_task("[cyan]Analyzing PDF pages as images...", total=None)
-                    single_file_summary_content = summarize_chunk("Analyze and describe this PDF (pages as images) in detail.", api_key, api_endpoint, use_model, detailed, False, is_update=False, images=pdf_image_data)
-                    progress.update(analyze_task, completed=1); progress.remove_task(analyze_task)
                     final_summary = single_file_summary_content
                     if effective_format_readme:
                         readme_format_task = progress.add_task("[cyan]Formatting PDF analysis as README...", total=None)
-                        final_summary = summarize_chunk(final_summary, api_key, api_endpoint, use_model, detailed, True, is_update=False)
+                        with metrics.phase("format"):
+                            final_summary = final_request(final_summary, True)
                         progress.update(readme_format_task, completed=1); progress.remove_task(readme_format_task)
                         
             # Check if it's a text file
-            elif not is_text_file(path):
+            elif file_kind != "text":
                 console.print(f"[bold red]File {path} does not appear to be a text or image file.[/bold red]")
                 raise typer.Exit(code=1)
             else:
                 # This is a text file - existing logic
                 processed_content_files = [path]
 
-                file_text = read_text_file(path)
-                file_text_content_processed = file_text # Store the read file text
+                # The file is memory-mapped and chunked as it is read, so even huge files are never held in memory whole
+                try:
+                    file_sections, sample_note = iter_file_sections(path, file_detail, sample, use_sample_tokens)
+                except OSError as e:
+                    console.print(f"[bold red]Could not read {path}: {e}[/bold red]")
+                    raise typer.Exit(code=1)
+                if sample_note:
+                    console.print(f"[dim]{sample_note}[/dim]")
+                else:
+                    file_tokens = estimate_file_tokens(path)
+                    if file_tokens > LARGE_FILE_TOKENS:
+                        console.print(f"[dim]{path} has about {file_tokens:,} tokens; use --sample to summarize a bounded part of it.[/dim]")
+
+                summarize_task = progress.add_task("[cyan]Summarizing chunks...", total=None)
+                # Summarize file content: detailed if requested, but don't apply README formatting or update logic at this stage
+                with metrics.phase("map"):
+                    summaries = summarize_chunks_concurrently(
+                        metrics.timed_iter("chunk", iter_chunks(metrics.timed_iter("read", file_sections), chunk_tokens)),
+                        lambda idx, chunk_item: summarize_chunk(chunk_item, api_key, api_endpoint, use_model, detailed, False, is_update=False),
+                        use_concurrency, progress, summarize_task, "[cyan]Summarizing chunk"
+                    )
+                progress.remove_task(summarize_task)
+                file_text_content_processed = "\n".join(summaries)
 
                 if not file_text_content_processed.strip() and not (is_updating_readme and existing_readme_content and existing_readme_content.strip()):
                     console.print(f"[bold red]File {path} is empty or unreadable, and no existing README to update (or it's empty).[/bold red]")
                     raise typer.Exit(code=1)
 
                 single_file_summary_content = ""
-                if file_text_content_processed.strip():
-                    chunk_task = progress.add_task("[cyan]Chunking file text...", total=None)
-                    chunks = chunk_text(file_text)
-                    progress.update(chunk_task, completed=1); progress.remove_task(chunk_task)
-
-                    summarize_task = progress.add_task(f"[cyan]Summarizing {len(chunks)} chunk(s)...", total=len(chunks))
-                    summaries = []
-                    for idx, chunk_item in enumerate(chunks):
-                        progress.update(summarize_task, description=f"[cyan]Summarizing chunk {idx+1}/{len(chunks)}")
-                        # Summarize file content: detailed if requested, but don't apply README formatting or update logic at this stage
-                        summaries.append(summarize_chunk(chunk_item, api_key, api_endpoint, use_model, detailed, False, is_update=False))
-                        progress.advance(summarize_task)
-                    progress.remove_task(summarize_task)
-
-                    if len(summaries) > 1:
-                        combine_task = progress.add_task("[cyan]Combining chunk summaries...", total=None)
-                        combined_summary_text = "\n\n".join(summaries)
-                        single_file_summary_content = summarize_chunk(combined_summary_text, api_key, api_endpoint, use_model, detailed, False, is_update=False)
-                        progress.update(combine_task, completed=1); progress.remove_task(combine_task)
-                    elif summaries:
-                        single_file_summary_content = summaries[0]
+                if summaries:
+                    single_file_summary_content = reduce_summaries(
+                        summaries,
+                        lambda combined_text: summarize_chunk(combined_text, api_key, api_endpoint, use_model, detailed, False, is_update=False),
+                        use_fan_in, use_concurrency, progress, "[cyan]Combining chunk summaries", chunk_tokens, final_combine
+                    )
                 
                 if is_updating_readme:
                     if not single_file_summary_content.strip() and (not existing_readme_content or not existing_readme_content.strip()):
@@ -720,94 +1906,163 @@ def summary(
                          console.print(f"[bold yellow]Warning: No content summarized from file '{os.path.basename(path)}'. The README at '{update_readme_path}' will be processed based on its existing content.[/bold yellow]")
 
                     update_task = progress.add_task("[cyan]Updating README...", total=None)
-                    text_for_update = (
-                        f"EXISTING_README_CONTENT_BEGINS:\n{existing_readme_content}\nEXISTING_README_CONTENT_ENDS.\n\n"
-                        f"NEW_CONTENT_TO_INTEGRATE_BEGINS:\n{single_file_summary_content}\nNEW_CONTENT_TO_INTEGRATE_ENDS."
-                    )
-                    final_summary = summarize_chunk(text_for_update, api_key, api_endpoint, use_model, detailed, True, is_update=True)
+                    final_summary = update_readme(single_file_summary_content)
                     progress.update(update_task, completed=1); progress.remove_task(update_task)
                 else: # Standard file summary (not updating an existing README)
-                    # This check might be redundant if the earlier `if not file_text.strip()` covers it
-                    if not file_text.strip(): 
+                    # This check might be redundant if the earlier `if not file_text_content_processed.strip()` covers it
+                    if not file_text_content_processed.strip(): 
                         console.print(f"[bold red]File {path} is empty or unreadable.[/bold red]")
                         raise typer.Exit(code=1)
                     final_summary = single_file_summary_content
                     if effective_format_readme: # User explicitly asked for --format-readme (and not --update-readme)
                         readme_format_task = progress.add_task("[cyan]Formatting summary as README...", total=None)
-                        final_summary = summarize_chunk(final_summary, api_key, api_endpoint, use_model, detailed, True, is_update=False)
+                        with metrics.phase("format"):
+                            final_summary = final_request(final_summary, True)
                         progress.update(readme_format_task, completed=1); progress.remove_task(readme_format_task)
+                    if sample_note:
+                        # Readers of the summary (and the saved file) should know it doesn't cover the whole file
+                        final_summary = f"> **Note:** {sample_note}\n\n{final_summary}"
 
         else:
             console.print(f"[bold red]{path} is not a valid file or directory.[/bold red]")
             raise typer.Exit(code=1)
+        return final_summary, processed_content_files
+
+    if batch_mode:
+        failed_count = summarize_batch(targets, summarize_target, use_concurrency, results_jsonl)
+        print_run_statistics(use_cache, stats, metrics_json)
+        if failed_count:
+            raise typer.Exit(code=1)
+        return
 
-        summary_generated = bool(final_summary.strip())
+    def summarize_single_target(path: str) -> bool:
+        """Summarize one target, show the summary and save it. Returns whether a summary was generated."""
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True,
+            console=console.current(),
+        ) as progress:
+            final_summary, processed_content_files = summarize_target(path, progress, console.is_terminal if stream is None else stream)
 
-        if not summary_generated:
-            console.print(f"[bold yellow]No summary was generated.[/bold yellow]")
-            # Continue to print files if any were processed, then exit
+            summary_generated = bool(final_summary.strip())
 
-        # Attempt to derive a sensible name for the panel title from the input path or the summary's first heading
-        detected_name = os.path.basename(os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path) if os.path.isfile(path) else path))
-        if os.path.isfile(path):
-            detected_name = os.path.basename(path)
+            if not summary_generated:
+                console.print(f"[bold yellow]No summary was generated.[/bold yellow]")
+                # Continue to print files if any were processed, then exit
 
-        match = re.search(r"^#\s+(.+)", final_summary, re.MULTILINE)
-        if match:
-            heading = match.group(1).strip()
-            # Heuristic: if the first markdown heading is multi-word and not like a filename, use it as the detected name.
-            if len(heading) > 2 and (' ' in heading or not re.match(r"^[a-zA-Z0-9_.-]+$", heading)):
-                detected_name = heading
+            # Attempt to derive a sensible name for the panel title from the input path or the summary's first heading
+            detected_name = os.path.basename(os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path) if os.path.isfile(path) else path))
+            if os.path.isfile(path):
+                detected_name = os.path.basename(path)
+
+            match = re.search(r"^#\s+(.+)", final_summary, re.MULTILINE)
+            if match:
+                heading = match.group(1).strip()
+                # Heuristic: if the first markdown heading is multi-word and not like a filename, use it as the detected name.
+                if len(heading) > 2 and (' ' in heading or not re.match(r"^[a-zA-Z0-9_.-]+$", heading)):
+                    detected_name = heading
         
-        title_prefix = "Updated README" if is_updating_readme else "Summary"
-        panel_title = f"[bold]{title_prefix} of {detected_name}[/bold]"
-        if is_updating_readme and update_readme_path: # Ensure update_readme_path is not None
-            panel_title = f"[bold]Updated README: {update_readme_path}[/bold]"
-
-
-        summary_markdown = Markdown(final_summary)
-        summary_panel = Panel(
-            summary_markdown,
-            title=panel_title,
-            border_style="none",
-            padding=(1, 2),
-        )
-        console.print(summary_panel)
+            title_prefix = "Updated README" if is_updating_readme else "Summary"
+            panel_title = f"[bold]{title_prefix} of {detected_name}[/bold]"
+            if is_updating_readme and update_readme_path: # Ensure update_readme_path is not None
+                panel_title = f"[bold]Updated README: {update_readme_path}[/bold]"
 
-        if is_updating_readme:
-            output_file = update_readme_path
-            assert output_file is not None, "Output file path for README update must not be None"
-            try:
-                save_summary_to_file(final_summary, output_file)
-                console.print(f"[green]README updated and saved to {output_file}[/green]")
-            except Exception as e:
-                console.print(f"[bold red]Failed to save updated README: {e}[/bold red]")
-        elif save_to_file:
-            if os.path.isdir(path):
-                output_file = os.path.join(path, "project_summary.md")
-            else: # path is a file
-                output_file = os.path.splitext(path)[0] + "_summary.md"
+
+            from rich.markdown import Markdown
+            summary_markdown = Markdown(final_summary)
+            summary_panel = Panel(
+                summary_markdown,
+                title=panel_title,
+                border_style="none",
+                padding=(1, 2),
+            )
+            console.print(summary_panel)
+
+            if is_updating_readme:
+                output_file = update_readme_path
+                assert output_file is not None, "Output file path for README update must not be None"
+                try:
+                    save_summary_to_file(final_summary, output_file)
+                    remove_partial_file(output_file)
+                    console.print(f"[green]README updated and saved to {output_file}[/green]")
+                except Exception as e:
+                    console.print(f"[bold red]Failed to save updated README: {e}[/bold red]")
+            elif save_to_file:
+                output_file = get_output_file_path(path)
+                try:
+                    save_summary_to_file(final_summary, output_file)
+                    remove_partial_file(output_file)
+                    console.print(f"[green]Summary saved to {output_file}[/green]")
+                except Exception as e:
+                    console.print(f"[bold red]Failed to save summary: {e}[/bold red]")
+
+            print_run_statistics(use_cache, stats, metrics_json)
+
+            # Print the list of files that were considered for summarization content if debug is enabled
+            if debug and processed_content_files:
+                console.print("\n[bold cyan]Content source files considered for summarization (debug):[/bold cyan]")
+                abs_input_path = os.path.abspath(path)
+                # Determine base path for making displayed paths relative and cleaner
+                base_for_relpath = os.path.dirname(abs_input_path) if os.path.isfile(abs_input_path) else abs_input_path
             
+                for f_path in processed_content_files:
+                    abs_f_path = os.path.abspath(f_path)
+                    try:
+                        relative_path = os.path.relpath(abs_f_path, base_for_relpath)
+                    except ValueError: # Handles paths on different drives (Windows)
+                        relative_path = abs_f_path # Fallback to absolute path
+                    console.print(f"- {relative_path}")
+        return summary_generated
+
+    path = targets[0]
+    if not watch:
+        if not summarize_single_target(path):
+            raise typer.Exit(code=0) # Exit gracefully if no summary was generated
+        return
+
+    from watcher import DEFAULT_DEBOUNCE_SECONDS, DEFAULT_POLL_SECONDS, ProjectWatcher
+
+    # The files the summary is written to are neither summarized nor treated as changes
+    output_files = [update_readme_path] if update_readme_path else [get_output_file_path(path)] if save_to_file else []
+    exclude = (exclude or []) + [
+        os.path.relpath(output_file, path).replace(os.sep, "/") for output_file in output_files
+        if not os.path.relpath(output_file, path).startswith("..")
+    ]
+    poll_seconds = resolve_float_setting("WATCH_POLL_SECONDS", 0.0)
+    watcher = ProjectWatcher(
+        path,
+        lambda directories: iter_candidate_files(path, exclude, directories),
+        ignore_paths=output_files + [f"{output_file}.partial" for output_file in output_files],
+        debounce_seconds=resolve_float_setting("WATCH_DEBOUNCE_SECONDS", DEFAULT_DEBOUNCE_SECONDS),
+        poll_seconds=poll_seconds or DEFAULT_POLL_SECONDS,
+        use_inotify=not poll_seconds
+    )
+    if not watcher.inotify and not poll_seconds:
+        console.print(f"[yellow]Warning: Polling for changes every {watcher.poll_seconds:g}s ({watcher.fallback_reason}).[/yellow]")
+    try:
+        while True:
             try:
-                save_summary_to_file(final_summary, output_file)
-                console.print(f"[green]Summary saved to {output_file}[/green]")
-            except Exception as e:
-                console.print(f"[bold red]Failed to save summary: {e}[/bold red]")
-
-        # Print the list of files that were considered for summarization content if debug is enabled
-        if debug and processed_content_files:
-            console.print("\n[bold cyan]Content source files considered for summarization (debug):[/bold cyan]")
-            abs_input_path = os.path.abspath(path)
-            # Determine base path for making displayed paths relative and cleaner
-            base_for_relpath = os.path.dirname(abs_input_path) if os.path.isfile(abs_input_path) else abs_input_path
-            
-            for f_path in processed_content_files:
-                abs_f_path = os.path.abspath(f_path)
-                try:
-                    relative_path = os.path.relpath(abs_f_path, base_for_relpath)
-                except ValueError: # Handles paths on different drives (Windows)
-                    relative_path = abs_f_path # Fallback to absolute path
-                console.print(f"- {relative_path}")
-        
-        if not summary_generated:
-            raise typer.Exit(code=0) # Exit gracefully if no summary was generated
\ No newline at end of file
+                summarize_single_target(path)
+            except typer.Exit:
+                # The reason was printed; keep watching for a change that fixes it
+                pass
+            except RuntimeError as e:
+                console.print(f"[bold red]Error: {e}[/bold red]")
+            console.print(f"[dim]Watching {path} for changes ({watcher.mode}). Press Ctrl+C to stop.[/dim]")
+            changes = watcher.wait_for_changes()
+            changed_paths = changes["added"] + changes["changed"] + changes["removed"]
+            console.print(
+                f"[cyan]{len(changes['added'])} added, {len(changes['changed'])} changed, {len(changes['removed'])} removed file(s): "
+                + ", ".join(os.path.relpath(changed_path, path) for changed_path in changed_paths[:5])
+                + (f" and {len(changed_paths) - 5} more" if len(changed_paths) > 5 else "") + "[/cyan]"
+            )
+            metrics.reset()
+            set_cache_mode(use_cache, refresh)
+            if is_updating_readme:
+                # Integrate the changes into the README as it is now, including the previous update
+                existing_readme_content = read_text_file(update_readme_path)
+    except KeyboardInterrupt:
+        console.print("[dim]Stopped watching.[/dim]")
+    finally:
+        watcher.close()
@@ -0,0 +1,188 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DEBOUNCE_SECONDS = 1.0
+DEFAULT_POLL_SECONDS = 2.0
+# A tree that never goes quiet for the debounce interval is rescanned at least this often
+MAX_DEBOUNCE_SECONDS = 10.0
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+# Path -> (mtime in nanoseconds, size) of every file that is part of a summary
+FileSnapshot = Dict[str, Tuple[int, int]]
+
+class _Inotify:
+    """Watches on a set of directories through the Linux inotify API, called with ctypes."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        # Directory -> watch descriptor
+        self.watches: Dict[str, int] = {}
+
+    def watch(self, directories: Iterable[str]):
+        """
+        Watch exactly the given directories. Raises OSError if the system's watch limit is reached
+        (see /proc/sys/fs/inotify/max_user_watches); directories that disappeared are skipped.
+        """
+        wanted = set(directories)
+        for directory in set(self.watches) - wanted:
+            self._rm_watch(self.fd, self.watches.pop(directory))
+        for directory in wanted - set(self.watches):
+            descriptor = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if descriptor < 0:
+                error = ctypes.get_errno()
+                if error in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                    continue
+                raise OSError(error, f"Could not watch {directory}: {os.strerror(error)}")
+            self.watches[directory] = descriptor
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Wait up to timeout seconds (None: forever) for events and discard them. Returns whether any arrived."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        while True:
+            try:
+                if not os.read(self.fd, 64 * 1024):
+                    break
+            except BlockingIOError:
+                break
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+class ProjectWatcher:
+    """
+    Waits for files of a project to change. list_files(directories) yields the files that are part
+    of a summary and appends every directory it walks to directories, so the same .gitignore and
+    --exclude rules decide both what is watched and what counts as a change.
+
+    On Linux the walked directories are watched with inotify, and events only wake the watcher up;
+    elsewhere, or if inotify is unavailable or out of watches, the tree is polled every poll_seconds.
+    Either way, changes are reported once the tree has been quiet for debounce_seconds, by comparing
+    the modification times and sizes of the files against the previous snapshot.
+    """
+
+    def __init__(
+        self,
+        project_path: str,
+        list_files: Callable[[List[str]], Iterable[str]],
+        ignore_paths: Iterable[str] = (),
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        use_inotify: bool = True
+    ):
+        self.project_path = project_path
+        self.list_files = list_files
+        # Files written by the summary itself, e.g. the saved summary or the updated README
+        self.ignore_paths = {os.path.abspath(path) for path in ignore_paths}
+        self.debounce_seconds = max(0.0, debounce_seconds)
+        self.poll_seconds = max(0.1, poll_seconds)
+        self.inotify: Optional[_Inotify] = None
+        self.fallback_reason: Optional[str] = None
+        if not use_inotify:
+            self.fallback_reason = "inotify disabled"
+        elif not sys.platform.startswith("linux"):
+            self.fallback_reason = "inotify is only available on Linux"
+        else:
+            try:
+                self.inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                self.fallback_reason = str(e)
+        self.snapshot = self._scan()
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self.inotify else "polling"
+
+    def _scan(self) -> FileSnapshot:
+        """Snapshot the project's files and update the inotify watches to the directories walked."""
+        directories: List[str] = []
+        snapshot: FileSnapshot = {}
+        for file_path in self.list_files(directories):
+            if os.path.abspath(file_path) in self.ignore_paths:
+                continue
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                continue
+            snapshot[file_path] = (stat_result.st_mtime_ns, stat_result.st_size)
+        if self.inotify:
+            try:
+                self.inotify.watch(directories)
+            except OSError as e:
+                self.inotify.close()
+                self.inotify = None
+                self.fallback_reason = str(e)
+        return snapshot
+
+    def _settle(self) -> FileSnapshot:
+        """Wait until the tree has been quiet for the debounce interval (or MAX_DEBOUNCE_SECONDS passed) and snapshot it."""
+        deadline = time.monotonic() + MAX_DEBOUNCE_SECONDS
+        if self.inotify:
+            while time.monotonic() < deadline and self.inotify.wait(self.debounce_seconds):
+                pass
+            return self._scan()
+        snapshot = self._scan()
+        while time.monotonic() < deadline:
+            time.sleep(self.debounce_seconds)
+            settled = self._scan()
+            if settled == snapshot:
+                break
+            snapshot = settled
+        return snapshot
+
+    def wait_for_changes(self) -> Dict[str, List[str]]:
+        """
+        Block until project files were added, changed or removed since the last snapshot.
+        Returns {"added": [...], "changed": [...], "removed": [...]} with paths in walk order.
+        """
+        while True:
+            if self.inotify:
+                self.inotify.wait(None)
+            else:
+                time.sleep(self.poll_seconds)
+                if self._scan() == self.snapshot:
+                    continue
+            snapshot = self._settle()
+            previous = self.snapshot
+            self.snapshot = snapshot
+            changes = {
+                "added": [path for path in snapshot if path not in previous],
+                "changed": [path for path in snapshot if path in previous and snapshot[path] != previous[path]],
+                "removed": [path for path in previous if path not in snapshot],
+            }
+            if any(changes.values()):
+                return changes
+
+    def close(self):
+        if self.inotify:
+            self.inotify.close()
+            self.inotify = None